@@ -0,0 +1,66 @@
+"""
+Compare JSONRenderer with ORJSONRenderer on a ticket detail payload with 500 comments.
+
+The payload is TicketDetailSerializer output for in-memory rows, so only rendering
+is measured:
+
+    cd backend && DJANGO_SETTINGS_MODULE=config.settings.test python -m benchmarks.renderers
+"""
+import os
+import timeit
+from datetime import datetime, timedelta, timezone
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.test")
+django.setup()
+
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+
+from hirethon_template.tickets.api.serializers import TicketCommentSerializer, TicketDetailSerializer  # noqa: E402
+from hirethon_template.tickets.models import Ticket, TicketComment  # noqa: E402
+from hirethon_template.users.models import User  # noqa: E402
+from hirethon_template.utils.fast_json import ORJSONRenderer  # noqa: E402
+
+COMMENTS = 500
+NUMBER = 20
+
+
+def build_payload():
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    requester = User(id=1, email="requester@example.com", name="Requester")
+    staff = User(id=2, email="staff@example.com", name="Støff Mémber", is_staff=True)
+    ticket = Ticket(
+        id=1, title="Printer on the third floor is jammed", description="It jams on every duplex job. " * 20,
+        category="hardware", priority="high", status="in_progress", user=requester, assigned_to=staff,
+        admin_feedback="", created_at=start, updated_at=start, resolved_at=None,
+    )
+    comments = [
+        TicketComment(
+            id=index + 1, ticket=ticket, author=staff if index % 2 else requester,
+            content=f"Update #{index}: tried another tray, still failing — see attached log. " * 3,
+            is_internal=False, created_at=start + timedelta(minutes=index, microseconds=index),
+            updated_at=start + timedelta(minutes=index),
+        )
+        for index in range(COMMENTS)
+    ]
+    # Detail embeds only the newest comments; render the full history as the worst case
+    ticket.recent_comments = []
+    data = TicketDetailSerializer(ticket).data
+    data["comments"] = TicketCommentSerializer(comments, many=True).data
+    return data
+
+
+def main():
+    data = build_payload()
+    stdlib, fast = JSONRenderer(), ORJSONRenderer()
+    assert fast.render(data) == stdlib.render(data)
+
+    print(f"payload: {len(stdlib.render(data)) / 1024:.0f} KiB")
+    for name, renderer in (("JSONRenderer", stdlib), ("ORJSONRenderer", fast)):
+        seconds = min(timeit.repeat(lambda: renderer.render(data), number=NUMBER, repeat=5)) / NUMBER
+        print(f"{name + ':':16} {seconds * 1000:7.2f} ms per render")
+
+
+if __name__ == "__main__":
+    main()
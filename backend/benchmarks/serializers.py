@@ -0,0 +1,76 @@
+"""
+Compare TicketListSerializer with the values() fast path on a 1,000-row page.
+
+Both paths render the same in-memory rows, so only serialization is measured:
+
+    cd backend && DJANGO_SETTINGS_MODULE=config.settings.test python -m benchmarks.serializers
+"""
+import os
+import timeit
+from datetime import datetime, timedelta, timezone
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.test")
+django.setup()
+
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+
+from hirethon_template.tickets.api.serializers import TicketListSerializer, TicketListValuesSerializer  # noqa: E402
+from hirethon_template.tickets.models import Ticket  # noqa: E402
+from hirethon_template.users.models import User  # noqa: E402
+
+ROWS = 1000
+REPEAT = 5
+
+
+def build_page():
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    requester = User(id=1, email="requester@example.com", name="Requester")
+    staff = User(id=2, email="staff@example.com", name="Staff")
+
+    instances, rows = [], []
+    for index in range(ROWS):
+        created_at = start + timedelta(minutes=index)
+        assigned = staff if index % 2 else None
+        ticket = Ticket(
+            id=index + 1, title=f"Ticket {index}", category="technical", priority="medium",
+            status="open", user=requester, assigned_to=assigned, created_at=created_at,
+            updated_at=created_at, resolved_at=None,
+        )
+        summary = {
+            "public_comment_count": index % 7,
+            "latest_comment_excerpt": f"Latest reply on ticket {index}" if index % 7 else None,
+            "latest_comment_author": "Staff" if index % 7 else None,
+            "latest_comment_created_at": created_at if index % 7 else None,
+        }
+        for name, value in summary.items():
+            setattr(ticket, name, value)
+        instances.append(ticket)
+
+        rows.append({
+            "id": ticket.id, "title": ticket.title, "category": ticket.category, "priority": ticket.priority,
+            "status": ticket.status, "user__id": requester.id, "user__email": requester.email,
+            "user__name": requester.name, "assigned_to__id": assigned and staff.id,
+            "assigned_to__email": assigned and staff.email, "assigned_to__name": assigned and staff.name,
+            "created_at": created_at, "updated_at": created_at, "resolved_at": None, **summary,
+        })
+    return instances, rows
+
+
+def main():
+    instances, rows = build_page()
+    fast = TicketListValuesSerializer()
+    renderer = JSONRenderer()
+
+    assert renderer.render(fast.serialize(rows)) == renderer.render(TicketListSerializer(instances, many=True).data)
+
+    drf = min(timeit.repeat(lambda: TicketListSerializer(instances, many=True).data, number=1, repeat=REPEAT))
+    values = min(timeit.repeat(lambda: fast.serialize(rows), number=1, repeat=REPEAT))
+    print(f"TicketListSerializer: {drf * 1000:8.1f} ms / {ROWS} rows")
+    print(f"values() fast path:   {values * 1000:8.1f} ms / {ROWS} rows")
+    print(f"speedup:              {drf / values:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Load 5M synthetic tickets into TicketColumns and run the resolution report on them.
+
+Rows are produced chunk by chunk in the numeric shape load_columns() fetches,
+standing in for the server-side cursor, so the peak traced memory shows what
+a load costs beyond the arrays themselves (tracing also slows the load down):
+
+    cd backend && DJANGO_SETTINGS_MODULE=config.settings.test python -m benchmarks.ticket_analytics
+"""
+import os
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import django
+import numpy as np
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.test")
+django.setup()
+
+from hirethon_template.tickets.analytics import (  # noqa: E402
+    FETCH_CHUNK_SIZE,
+    TicketColumns,
+    agent_throughput,
+    resolution_histogram,
+    resolution_percentiles,
+    weekly_cohorts,
+)
+
+SIZES = (1_000_000, 5_000_000)
+NOW = datetime(2026, 10, 17, tzinfo=timezone.utc)
+YEAR = 365 * 86_400
+
+
+def synthetic_rows(count, seed=0):
+    """Yield ``count`` ticket rows created over the last year, a fifth of them still unresolved."""
+    rng = np.random.default_rng(seed)
+    end = NOW.timestamp()
+    for offset in range(0, count, FETCH_CHUNK_SIZE):
+        size = min(FETCH_CHUNK_SIZE, count - offset)
+        created = rng.uniform(end - YEAR, end, size)
+        resolved = created + rng.lognormal(np.log(8 * 3600), 1.2, size)
+        resolved[(rng.random(size) < 0.2) | (resolved > end)] = np.nan
+        block = np.column_stack([
+            created, resolved, rng.integers(0, 4, size), rng.integers(0, 5, size), rng.integers(0, 200, size),
+        ])
+        yield from block.tolist()
+
+
+def measure(count):
+    tracemalloc.start()
+    started = time.perf_counter()
+    columns = TicketColumns.from_rows(synthetic_rows(count), capacity=count)
+    load = time.perf_counter() - started
+    _current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    arrays = sum(getattr(columns, name).nbytes for name in ("created", "resolved", "priority", "category", "assignee"))
+    started = time.perf_counter()
+    resolution_percentiles(columns)
+    resolution_histogram(columns)
+    weekly_cohorts(columns, 12, NOW)
+    agent_throughput(columns, 365)
+    report = time.perf_counter() - started
+    return load, report, arrays, peak
+
+
+def main():
+    for count in SIZES:
+        load, report, arrays, peak = measure(count)
+        print(
+            f"{count:>9,} tickets: load {load:6.1f} s, report {report * 1000:7.1f} ms, "
+            f"arrays {arrays / 2 ** 20:6.1f} MiB, peak {peak / 2 ** 20:6.1f} MiB "
+            f"(+{(peak - arrays) / 2 ** 20:5.1f} MiB over the arrays)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""
+Comment listing latency and insert throughput on a plain versus a monthly partitioned comment table.
+
+Loads two years of synthetic comments (each ticket's comments fall within
+two weeks of its creation) into a throwaway database, once into monthly
+partitions as the table looks after the conversion has run for a while and
+once into a plain copy with the indexes and foreign keys it had before.
+Both layouts are measured through the real TicketCommentViewSet, renaming
+each in turn to the table the model reads:
+
+    cd backend && DJANGO_SETTINGS_MODULE=config.settings.test python -m benchmarks.ticket_comment_partitions
+"""
+import os
+import time
+from datetime import timedelta
+
+import django
+import numpy as np
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.test")
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.test.utils import setup_test_environment  # noqa: E402
+from django.utils import timezone  # noqa: E402
+from rest_framework.test import APIClient  # noqa: E402
+
+from hirethon_template.tickets.models import Ticket, TicketComment  # noqa: E402
+from hirethon_template.tickets.partitions import (  # noqa: E402
+    COMMENT_TABLE,
+    add_months,
+    create_partitions,
+    month_start,
+)
+from hirethon_template.users.models import User  # noqa: E402
+
+TICKETS = 20_000
+COMMENTS_PER_TICKET = 50
+MONTHS = 24
+REQUESTS = 300
+BULK_ROWS = 50_000
+SINGLE_ROWS = 2_000
+PLAIN_TABLE = "benchmark_ticketcomment_plain"
+
+
+def load(now):
+    users = User.objects.bulk_create(
+        [User(email=f"user{index}@example.com") for index in range(200)]
+    )
+    Ticket.objects.bulk_create(
+        [Ticket(title=f"Ticket {index}", description="Synthetic", user=users[index % len(users)])
+         for index in range(TICKETS)],
+        batch_size=5_000,
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "UPDATE tickets_ticket SET created_at = %s - random() * %s", [now, timedelta(days=MONTHS * 30 - 14)]
+        )
+        # A young database only has the legacy partition; lay out the months it would have by now
+        cursor.execute(f"DROP TABLE {COMMENT_TABLE}_legacy")
+        create_partitions(add_months(month_start(now), -MONTHS), add_months(month_start(now), 3))
+        cursor.execute(
+            f"""
+            INSERT INTO {COMMENT_TABLE} (content, is_internal, created_at, updated_at, author_id, ticket_id)
+            SELECT 'Synthetic comment ' || n, n %% 5 = 0, at, at, user_id, id
+            FROM (
+                SELECT n, ticket.id, ticket.user_id,
+                       LEAST(ticket.created_at + random() * interval '14 days', %s) AS at
+                FROM tickets_ticket ticket, generate_series(1, {COMMENTS_PER_TICKET}) n
+            ) comment
+            """,
+            [now],
+        )
+        cursor.execute(f"CREATE TABLE {PLAIN_TABLE} (LIKE {COMMENT_TABLE} INCLUDING ALL)")
+        cursor.execute(f"INSERT INTO {PLAIN_TABLE} SELECT * FROM {COMMENT_TABLE}")
+        cursor.execute(f"ALTER TABLE {PLAIN_TABLE} DROP CONSTRAINT {PLAIN_TABLE}_pkey, ADD PRIMARY KEY (id)")
+        for column, target in (("ticket_id", "tickets_ticket"), ("author_id", "users_user")):
+            cursor.execute(
+                f"ALTER TABLE {PLAIN_TABLE} ADD FOREIGN KEY ({column}) REFERENCES {target} "
+                "DEFERRABLE INITIALLY DEFERRED"
+            )
+        cursor.execute(f"ANALYZE {COMMENT_TABLE}")
+        cursor.execute(f"ANALYZE {PLAIN_TABLE}")
+    return users
+
+
+def percentiles(latencies):
+    latencies = np.array(latencies) * 1000
+    return f"p50 {np.percentile(latencies, 50):6.2f} ms, p99 {np.percentile(latencies, 99):6.2f} ms"
+
+
+def measure_listing(client, ticket_ids, params):
+    latencies = []
+    for ticket_id in ticket_ids:
+        started = time.perf_counter()
+        response = client.get(f"/api/tickets/{ticket_id}/comments/", params)
+        latencies.append(time.perf_counter() - started)
+        assert response.status_code == 200
+    return percentiles(latencies)
+
+
+def measure_inserts(users, ticket_ids):
+    rng = np.random.default_rng(1)
+    ticket_ids = np.array(ticket_ids)
+
+    def comment():
+        ticket_id = int(rng.choice(ticket_ids))
+        return TicketComment(ticket_id=ticket_id, author=users[ticket_id % len(users)], content="New comment")
+
+    started = time.perf_counter()
+    for _batch in range(BULK_ROWS // 1_000):
+        TicketComment.objects.bulk_create([comment() for _row in range(1_000)])
+    bulk = BULK_ROWS / (time.perf_counter() - started)
+
+    started = time.perf_counter()
+    for _row in range(SINGLE_ROWS):
+        TicketComment.objects.bulk_create([comment()])
+    single = SINGLE_ROWS / (time.perf_counter() - started)
+    return bulk, single
+
+
+def swap(first, second):
+    with connection.cursor() as cursor:
+        cursor.execute(f"ALTER TABLE {first} RENAME TO benchmark_ticketcomment_swap")
+        cursor.execute(f"ALTER TABLE {second} RENAME TO {first}")
+        cursor.execute(f"ALTER TABLE benchmark_ticketcomment_swap RENAME TO {second}")
+
+
+def main():
+    setup_test_environment()
+    settings.DATABASES["default"]["TEST"]["NAME"] = "benchmark_ticket_comments"
+    old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        now = timezone.now()
+        users = load(now)
+        ticket_ids = list(Ticket.objects.values_list("id", flat=True))
+        sample = np.random.default_rng(0).choice(ticket_ids, REQUESTS, replace=False).tolist()
+        client = APIClient()
+        client.force_authenticate(User.objects.create(email="admin@example.com", is_staff=True))
+        recent = {"created_after": (now - timedelta(days=30)).isoformat()}
+
+        print(f"{TICKETS * COMMENTS_PER_TICKET:,} comments over {MONTHS} months, {REQUESTS} requests per case")
+        for label in ("plain", "partitioned"):
+            # The model's table holds the layout being measured
+            swap(COMMENT_TABLE, PLAIN_TABLE)
+            print(f"{label}:")
+            print(f"  list all           {measure_listing(client, sample, {})}")
+            print(f"  list first 20      {measure_listing(client, sample, {'page_size': 20})}")
+            print(f"  list last 30 days  {measure_listing(client, sample, recent)}")
+            bulk, single = measure_inserts(users, ticket_ids)
+            print(f"  insert             {bulk:,.0f} rows/s in batches of 1,000, {single:,.0f} rows/s one by one")
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == "__main__":
+    main()
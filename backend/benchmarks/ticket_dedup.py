@@ -0,0 +1,104 @@
+"""
+Precision, recall and latency of the MinHash/LSH duplicate lookup on synthetic tickets.
+
+Builds the same band index the fingerprint table holds, in memory, over 20k
+random tickets. It then looks up edited copies of some of them (from light
+rewording to heavy rewrites) and unrelated texts. A copy counts as a true
+duplicate when the exact shingle Jaccard similarity to its source reaches
+DUPLICATE_THRESHOLD:
+
+    cd backend && DJANGO_SETTINGS_MODULE=config.settings.test python -m benchmarks.ticket_dedup
+"""
+import os
+import random
+import time
+from collections import defaultdict
+
+import django
+import numpy as np
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.test")
+django.setup()
+
+from hirethon_template.tickets.dedup import (  # noqa: E402
+    DUPLICATE_THRESHOLD,
+    band_keys,
+    shingles,
+    signature,
+    similarity,
+    ticket_text,
+)
+
+TICKETS = 20_000
+QUERIES = 2_000
+VOCABULARY = [f"w{index:04d}{'x' * (index % 5)}" for index in range(3_000)]
+
+
+def random_ticket(rng):
+    title = " ".join(rng.choices(VOCABULARY, k=6))
+    description = " ".join(rng.choices(VOCABULARY, k=rng.randint(20, 80)))
+    return title, description
+
+
+def edit(text, rate, rng):
+    """Replace a share ``rate`` of the words of ``text``."""
+    words = text.split()
+    for index in rng.sample(range(len(words)), int(len(words) * rate)):
+        words[index] = rng.choice(VOCABULARY)
+    return " ".join(words)
+
+
+def jaccard(first, second):
+    first, second = set(shingles(first).tolist()), set(shingles(second).tolist())
+    return len(first & second) / len(first | second)
+
+
+def main():
+    rng = random.Random(7)
+    corpus = [random_ticket(rng) for _ in range(TICKETS)]
+
+    started = time.perf_counter()
+    signatures = np.empty((TICKETS, 128), dtype=np.uint32)
+    buckets = defaultdict(list)
+    for ticket_id, (title, description) in enumerate(corpus):
+        signatures[ticket_id] = signature(ticket_text(title, description))
+        for key in band_keys(signatures[ticket_id]):
+            buckets[key].append(ticket_id)
+    indexing = time.perf_counter() - started
+
+    true_positives = false_positives = false_negatives = 0
+    latencies = []
+    for query in range(QUERIES):
+        if query % 4 == 3:
+            source, text = None, ticket_text(*random_ticket(rng))
+        else:
+            source = rng.randrange(TICKETS)
+            text = edit(ticket_text(*corpus[source]), rng.choice([0.05, 0.1, 0.2, 0.3, 0.5]), rng)
+
+        started = time.perf_counter()
+        query_signature = signature(text)
+        candidates = {ticket_id for key in band_keys(query_signature) for ticket_id in buckets.get(key, ())}
+        found = {
+            ticket_id for ticket_id in candidates
+            if similarity(query_signature, signatures[ticket_id]) >= DUPLICATE_THRESHOLD
+        }
+        latencies.append(time.perf_counter() - started)
+
+        for ticket_id in found:
+            if jaccard(text, ticket_text(*corpus[ticket_id])) >= DUPLICATE_THRESHOLD:
+                true_positives += 1
+            else:
+                false_positives += 1
+        if source is not None and source not in found:
+            false_negatives += jaccard(text, ticket_text(*corpus[source])) >= DUPLICATE_THRESHOLD
+
+    latencies = np.array(latencies) * 1000
+    print(f"indexed {TICKETS} tickets in {indexing:.1f} s ({TICKETS / indexing:,.0f}/s)")
+    print(f"precision {true_positives / max(true_positives + false_positives, 1):.3f}, "
+          f"recall {true_positives / max(true_positives + false_negatives, 1):.3f} "
+          f"at similarity >= {DUPLICATE_THRESHOLD}")
+    print(f"lookup latency p50 {np.percentile(latencies, 50):.2f} ms, p99 {np.percentile(latencies, 99):.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Build time, size and lookup latency of the related tickets index on synthetic tickets.
+
+Documents draw their words from a Zipf-distributed vocabulary, so common
+words have the long postings lists real ticket text produces. Segments are
+written to a temporary directory and searched through memory maps, as the
+web workers do:
+
+    cd backend && DJANGO_SETTINGS_MODULE=config.settings.test python -m benchmarks.ticket_related
+"""
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import django
+import numpy as np
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.test")
+django.setup()
+
+from hirethon_template.tickets.related import (  # noqa: E402
+    MAX_DELTA_DOCUMENTS,
+    RelatedIndex,
+    Segment,
+    _write_segment,
+    build_segment,
+)
+
+TICKETS = 200_000
+QUERIES = 2_000
+VOCABULARY = np.array([f"w{index}" for index in range(50_000)])
+
+
+def synthetic_documents(count, rng, first_id=0):
+    for ticket_id in range(first_id, first_id + count):
+        words = VOCABULARY[np.minimum(rng.zipf(1.3, rng.integers(30, 150)), len(VOCABULARY)) - 1]
+        yield ticket_id, " ".join(words)
+
+
+def main():
+    rng = np.random.default_rng(3)
+    directory = Path(tempfile.mkdtemp())
+
+    started = time.perf_counter()
+    base = build_segment(synthetic_documents(TICKETS, rng))
+    base_name = _write_segment(directory, base)
+    building = time.perf_counter() - started
+
+    started = time.perf_counter()
+    delta = build_segment(synthetic_documents(MAX_DELTA_DOCUMENTS, rng, TICKETS), base["df"], TICKETS)
+    delta_name = _write_segment(directory, delta)
+    updating = time.perf_counter() - started
+
+    size = sum(path.stat().st_size for path in directory.rglob("*.npy"))
+    index = RelatedIndex(Segment(directory / base_name), Segment(directory / delta_name))
+    queries = [text for _ticket_id, text in synthetic_documents(QUERIES, rng)]
+    latencies = []
+    for text in queries:
+        started = time.perf_counter()
+        index.search(text, limit=20)
+        latencies.append(time.perf_counter() - started)
+
+    latencies = np.array(latencies) * 1000
+    print(f"built {TICKETS:,} tickets in {building:.1f} s, {size / 2 ** 20:.1f} MiB on disk")
+    print(f"rewrote a {MAX_DELTA_DOCUMENTS:,} ticket delta in {updating * 1000:.0f} ms")
+    print(f"lookup latency p50 {np.percentile(latencies, 50):.2f} ms, p99 {np.percentile(latencies, 99):.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
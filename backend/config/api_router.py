@@ -4,6 +4,7 @@ from rest_framework.routers import DefaultRouter, SimpleRouter
 from rest_framework_simplejwt.views import TokenRefreshView
 
 from hirethon_template.users.api.views import UserViewSet, register_view, login_view, logout_view
+from hirethon_template.tickets.api.streams import TicketEventStreamView, UserEventStreamView
 from hirethon_template.tickets.api.views import TicketViewSet, TicketCommentViewSet
 
 if settings.DEBUG:
@@ -14,8 +15,8 @@ else:
 router.register("users", UserViewSet)
 router.register("tickets", TicketViewSet, basename="tickets")
 
-# Nested router for ticket comments
-tickets_router = DefaultRouter()
+# Nested router for ticket comments (SimpleRouter: a DefaultRouter root view would shadow ticket detail)
+tickets_router = SimpleRouter()
 tickets_router.register(r"comments", TicketCommentViewSet, basename="ticket-comments")
 
 app_name = "api"
@@ -24,5 +25,7 @@ urlpatterns = [
     path("auth/login/", login_view, name="login"),
     path("auth/logout/", logout_view, name="logout"),
     path("auth/token/refresh/", TokenRefreshView.as_view(), name="token_refresh"),
+    path("tickets/events/", UserEventStreamView.as_view(), name="ticket-user-events"),
+    path("tickets/<int:pk>/events/", TicketEventStreamView.as_view(), name="ticket-events"),
     path("tickets/<int:ticket_pk>/", include(tickets_router.urls)),
 ] + router.urls
@@ -0,0 +1,27 @@
+"""
+ASGI config for hirethon-template project.
+
+It exposes the ASGI callable as a module-level variable named ``application``.
+The ticket event streams are only served here: under WSGI Django would
+consume the whole stream before sending any of it, so those endpoints
+answer 501 Not Implemented there.
+
+For more information on this file, see
+https://docs.djangoproject.com/en/dev/howto/deployment/asgi/
+
+"""
+import os
+import sys
+from pathlib import Path
+
+from django.core.asgi import get_asgi_application
+
+# This allows easy placement of apps within the interior
+# hirethon_template directory.
+BASE_DIR = Path(__file__).resolve(strict=True).parent.parent
+sys.path.append(str(BASE_DIR / "hirethon_template"))
+
+# We defer to a DJANGO_SETTINGS_MODULE already in the environment
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.production")
+
+application = get_asgi_application()
@@ -4,6 +4,7 @@ Base settings to build other settings files upon.
 from pathlib import Path
 
 import environ
+from celery.schedules import crontab
 
 BASE_DIR = Path(__file__).resolve(strict=True).parent.parent.parent
 # hirethon_template/
@@ -67,6 +68,7 @@ DJANGO_APPS = [
     "django.contrib.staticfiles",
     # "django.contrib.humanize", # Handy template tags
     "django.contrib.admin",
+    "django.contrib.postgres",
     "django.forms",
 ]
 THIRD_PARTY_APPS = [
@@ -365,6 +367,19 @@ REST_FRAMEWORK = {
     "DEFAULT_PERMISSION_CLASSES": ("rest_framework.permissions.IsAuthenticated",),
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
 }
+# Render and parse JSON with orjson (same output as DRF's JSONRenderer); falls back
+# to the stdlib json module when orjson is not installed.
+API_FAST_JSON = env.bool("DJANGO_API_FAST_JSON", default=False)
+if API_FAST_JSON:
+    REST_FRAMEWORK["DEFAULT_RENDERER_CLASSES"] = (
+        "hirethon_template.utils.fast_json.ORJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    )
+    REST_FRAMEWORK["DEFAULT_PARSER_CLASSES"] = (
+        "hirethon_template.utils.fast_json.ORJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    )
 
 # django-cors-headers - https://github.com/adamchainz/django-cors-headers#setup
 CORS_URLS_REGEX = r"^/api/.*$"
@@ -426,6 +441,81 @@ ADMIN_INDEX_TITLE = "Welcome to {} Admin Portal".format("hirethon_template".titl
 CLOUDFRONT_KEY_ID = env("CLOUDFRONT_KEY_ID", default="")
 CLOUDFRONT_DOMAIN = env("CLOUDFRONT_DOMAIN", default="")
 
+# Tickets
+# ------------------------------------------------------------------------------
+# Seconds a cached /api/tickets/stats/ result is served before it is recomputed
+TICKET_STATS_CACHE_TIMEOUT = env.int("TICKET_STATS_CACHE_TIMEOUT", default=30)
+# Seconds a /api/tickets/analytics/resolution/ report is cached; each one scans the tickets in its window
+TICKET_ANALYTICS_CACHE_TIMEOUT = env.int("TICKET_ANALYTICS_CACHE_TIMEOUT", default=300)
+# Days deletions are kept for /api/tickets/changes/; older sync cursors get a full reset
+TICKET_TOMBSTONE_RETENTION_DAYS = env.int("TICKET_TOMBSTONE_RETENTION_DAYS", default=30)
+# Redis used to fan ticket events out to the event streams of every worker;
+# empty keeps the fan-out in-process, which only suits a single process
+TICKET_EVENTS_REDIS_URL = env("TICKET_EVENTS_REDIS_URL", default="")
+# Working hours in TIME_ZONE and weekdays (Monday is 0) counted by business-hours SLA policies
+TICKET_SLA_BUSINESS_HOURS = (
+    env.int("TICKET_SLA_BUSINESS_START_HOUR", default=9),
+    env.int("TICKET_SLA_BUSINESS_END_HOUR", default=17),
+)
+TICKET_SLA_BUSINESS_DAYS = [0, 1, 2, 3, 4]
+# Open/in-progress tickets idle this long get their priority raised one step
+TICKET_ESCALATION_IDLE_HOURS = env.int("TICKET_ESCALATION_IDLE_HOURS", default=72)
+# Tickets waiting on the user this long are closed
+TICKET_AUTO_CLOSE_PENDING_DAYS = env.int("TICKET_AUTO_CLOSE_PENDING_DAYS", default=14)
+# Tickets closed this long are moved to the archive tables; rollups of older days are final
+TICKET_ARCHIVE_AFTER_DAYS = env.int("TICKET_ARCHIVE_AFTER_DAYS", default=365)
+# Months of comment partitions kept created ahead of the current one
+TICKET_COMMENT_PARTITIONS_AHEAD = env.int("TICKET_COMMENT_PARTITIONS_AHEAD", default=3)
+# Directory of the related tickets TF-IDF index; web and Celery workers must see the same one
+TICKET_RELATED_INDEX_DIR = env("TICKET_RELATED_INDEX_DIR", default=str(BASE_DIR / "var" / "related_tickets"))
+# Category/priority model written by the train_triage_model command
+TICKET_TRIAGE_MODEL_PATH = env("TICKET_TRIAGE_MODEL_PATH", default=str(BASE_DIR / "var" / "triage_model.npz"))
+# Predictions at least this likely fill in a category or priority the reporter left out
+TICKET_TRIAGE_MIN_CONFIDENCE = env.float("TICKET_TRIAGE_MIN_CONFIDENCE", default=0.7)
+# Tickets accepted by one /api/tickets/bulk/ request
+TICKET_BULK_CREATE_LIMIT = env.int("TICKET_BULK_CREATE_LIMIT", default=100)
+CELERY_BEAT_SCHEDULE = {
+    "prune-ticket-tombstones": {
+        "task": "hirethon_template.tickets.tasks.prune_ticket_tombstones",
+        "schedule": crontab(hour=3, minute=15),
+    },
+    # Picks up tickets created while no agent could take them
+    "assign-unassigned-tickets": {
+        "task": "hirethon_template.tickets.tasks.assign_unassigned_tickets",
+        "schedule": crontab(minute="*/10"),
+    },
+    "flag-sla-breaches": {
+        "task": "hirethon_template.tickets.tasks.flag_sla_breaches",
+        "schedule": crontab(),
+    },
+    "escalate-stale-tickets": {
+        "task": "hirethon_template.tickets.tasks.escalate_stale_tickets",
+        "schedule": crontab(minute=5),
+    },
+    "auto-close-pending-tickets": {
+        "task": "hirethon_template.tickets.tasks.auto_close_pending_tickets",
+        "schedule": crontab(hour=2, minute=45),
+    },
+    "refresh-ticket-rollups": {
+        "task": "hirethon_template.tickets.tasks.refresh_ticket_rollups",
+        "schedule": crontab(minute="*/15"),
+    },
+    "archive-closed-tickets": {
+        "task": "hirethon_template.tickets.tasks.archive_old_tickets",
+        "schedule": crontab(hour=3, minute=45),
+    },
+    # Runs after archiving, which empties the oldest comment partitions
+    "rotate-comment-partitions": {
+        "task": "hirethon_template.tickets.tasks.rotate_comment_partitions",
+        "schedule": crontab(hour=4, minute=15),
+    },
+    # Compacts the incremental updates and picks up comments added after resolution
+    "rebuild-related-tickets-index": {
+        "task": "hirethon_template.tickets.tasks.rebuild_related_tickets_index",
+        "schedule": crontab(hour=4, minute=30),
+    },
+}
+
 # Update CORS settings
 CORS_ALLOWED_ORIGINS = [
     "https://staging.app.hirethon_template.in",
@@ -27,6 +27,8 @@ CACHES = {
         },
     }
 }
+# Ticket event streams are served by every worker, so fan out through Redis
+TICKET_EVENTS_REDIS_URL = env("TICKET_EVENTS_REDIS_URL", default=env("REDIS_URL"))
 
 # SECURITY
 # ------------------------------------------------------------------------------
@@ -0,0 +1,117 @@
+from django.db.models import Case, CharField, Count, DateTimeField, F, IntegerField, OuterRef, Q, Subquery, Value, When
+from django.db.models.functions import Coalesce, Concat, Greatest, Left, Length
+from django.utils import timezone
+
+from hirethon_template.tickets.managers import COMMENT_EXCERPT_LENGTH
+from hirethon_template.tickets.models import Ticket, TicketComment
+
+
+def comment_excerpt(content):
+    """Shorten a comment the way ticket lists show it."""
+    if len(content) > COMMENT_EXCERPT_LENGTH:
+        return content[:COMMENT_EXCERPT_LENGTH] + "..."
+    return content
+
+
+def _if_newer(timestamp_field, at, field, value):
+    """Take ``value`` for ``field`` only if ``at`` is at least as recent as the stored ``timestamp_field``."""
+    newer = Q(**{f"{timestamp_field}__isnull": True}) | Q(**{f"{timestamp_field}__lte": at})
+    output_field = Ticket._meta.get_field(field)
+    if output_field.is_relation:
+        output_field = output_field.target_field
+    return Case(When(newer, then=Value(value)), default=F(field), output_field=output_field)
+
+
+def record_comment_created(comment):
+    """
+    Fold a new comment into its ticket's activity columns with a single UPDATE.
+
+    Counters move with ``F()`` increments and the "latest comment" columns are
+    only replaced when the comment is at least as new as the stored one, so
+    concurrent writers cannot lose increments or move the latest comment back.
+    """
+    at = comment.created_at
+    changes = {
+        "total_comment_count": F("total_comment_count") + 1,
+        "last_comment_at": _if_newer("last_comment_at", at, "last_comment_at", at),
+        "last_comment_author": _if_newer("last_comment_at", at, "last_comment_author", comment.author_id),
+        "last_activity_at": Greatest("last_activity_at", Value(at, output_field=DateTimeField())),
+        "updated_at": comment.updated_at,
+    }
+    if not comment.is_internal and comment.is_admin_comment:
+        # The first public answer from staff stops the first-response SLA clock
+        changes["first_responded_at"] = Coalesce("first_responded_at", Value(at, output_field=DateTimeField()))
+    if not comment.is_internal:
+        changes.update(
+            public_comment_count=F("public_comment_count") + 1,
+            last_public_comment_at=_if_newer("last_public_comment_at", at, "last_public_comment_at", at),
+            last_public_comment_author=_if_newer(
+                "last_public_comment_at", at, "last_public_comment_author", comment.author_id
+            ),
+            last_public_comment_excerpt=_if_newer(
+                "last_public_comment_at", at, "last_public_comment_excerpt", comment_excerpt(comment.content)
+            ),
+        )
+    return Ticket.objects.filter(pk=comment.ticket_id).update(**changes)
+
+
+def record_comment_removed(comment):
+    """Take a deleted comment out of its ticket's counters and re-read the latest comment columns."""
+    changes = {
+        "total_comment_count": F("total_comment_count") - 1,
+        "updated_at": timezone.now(),
+        **latest_comment_expressions(public=False),
+    }
+    if not comment.is_internal:
+        changes["public_comment_count"] = F("public_comment_count") - 1
+        changes.update(latest_comment_expressions(public=True))
+    return Ticket.objects.filter(pk=comment.ticket_id).update(**changes)
+
+
+def latest_comment_expressions(public):
+    """Subqueries reading the newest (public) comment of each ticket on the ``(ticket, created_at)`` index."""
+    comments = TicketComment.objects.filter(ticket=OuterRef("pk"))
+    if public:
+        comments = comments.filter(is_internal=False)
+    latest = comments.order_by("-created_at", "-pk")
+
+    if not public:
+        return {
+            "last_comment_at": Subquery(latest.values("created_at")[:1]),
+            "last_comment_author": Subquery(latest.values("author")[:1]),
+        }
+
+    excerpt = latest.alias(content_length=Length("content")).annotate(
+        excerpt=Case(
+            When(
+                content_length__gt=COMMENT_EXCERPT_LENGTH,
+                then=Concat(Left("content", COMMENT_EXCERPT_LENGTH), Value("..."), output_field=CharField()),
+            ),
+            default=F("content"),
+            output_field=CharField(),
+        )
+    )
+    return {
+        "last_public_comment_at": Subquery(latest.values("created_at")[:1]),
+        "last_public_comment_author": Subquery(latest.values("author")[:1]),
+        "last_public_comment_excerpt": Coalesce(Subquery(excerpt.values("excerpt")[:1]), Value("")),
+    }
+
+
+def comment_count_expression(public):
+    comments = TicketComment.objects.filter(ticket=OuterRef("pk"))
+    if public:
+        comments = comments.filter(is_internal=False)
+    count = comments.order_by().values("ticket").annotate(total=Count("pk")).values("total")
+    return Coalesce(Subquery(count, output_field=IntegerField()), 0)
+
+
+def refresh_comment_activity(ticket_ids, **extra):
+    """Recompute every comment-derived column of the given tickets from their comments with one UPDATE."""
+    return Ticket.objects.filter(pk__in=ticket_ids).update(
+        total_comment_count=comment_count_expression(public=False),
+        public_comment_count=comment_count_expression(public=True),
+        **latest_comment_expressions(public=False),
+        **latest_comment_expressions(public=True),
+        **extra,
+    )
@@ -3,19 +3,47 @@ from django.utils.html import format_html
 from django.urls import reverse
 from django.utils.safestring import mark_safe
 
-from .models import Ticket, TicketComment
+from .archive import restore_tickets
+from .history import acting_as
+from .models import ArchivedTicket, SLAPolicy, SupportAgent, Ticket, TicketComment, TicketEvent
+
+
+class ActorAdminMixin:
+    """Attribute the ticket events recorded by admin edits and deletes to the admin user."""
+
+    def changeform_view(self, request, *args, **kwargs):
+        with acting_as(request.user):
+            return super().changeform_view(request, *args, **kwargs)
+
+    def changelist_view(self, request, *args, **kwargs):
+        # Bulk actions such as "delete selected" run here
+        with acting_as(request.user):
+            return super().changelist_view(request, *args, **kwargs)
+
+    def delete_view(self, request, *args, **kwargs):
+        with acting_as(request.user):
+            return super().delete_view(request, *args, **kwargs)
 
 
 @admin.register(Ticket)
-class TicketAdmin(admin.ModelAdmin):
+class TicketAdmin(ActorAdminMixin, admin.ModelAdmin):
     list_display = [
         'id', 'title', 'user', 'category', 'priority', 'status', 
-        'assigned_to', 'created_at', 'is_open'
+        'assigned_to', 'public_comment_count', 'total_comment_count', 'last_activity_at',
+        'created_at', 'is_open'
+    ]
+    list_filter = [
+        'status', 'priority', 'category', 'created_at', 'assigned_to', 'first_response_breached',
+        'resolution_breached'
     ]
-    list_filter = ['status', 'priority', 'category', 'created_at', 'assigned_to']
     search_fields = ['title', 'description', 'user__email', 'user__name']
-    readonly_fields = ['id', 'created_at', 'updated_at', 'resolved_at']
-    raw_id_fields = ['user', 'assigned_to']
+    readonly_fields = [
+        'id', 'created_at', 'updated_at', 'resolved_at', 'public_comment_count', 'total_comment_count',
+        'last_comment_at', 'last_comment_author', 'last_public_comment_excerpt', 'last_activity_at',
+        'sla_policy', 'first_response_due_at', 'first_responded_at', 'resolution_due_at',
+        'first_response_breached', 'resolution_breached'
+    ]
+    autocomplete_fields = ['user', 'assigned_to']
     
     fieldsets = (
         ('Basic Information', {
@@ -24,6 +52,18 @@ class TicketAdmin(admin.ModelAdmin):
         ('Status & Assignment', {
             'fields': ('status', 'assigned_to', 'admin_feedback')
         }),
+        ('Activity', {
+            'fields': (
+                'public_comment_count', 'total_comment_count', 'last_comment_at', 'last_comment_author',
+                'last_public_comment_excerpt', 'last_activity_at'
+            )
+        }),
+        ('SLA', {
+            'fields': (
+                'sla_policy', 'first_response_due_at', 'first_responded_at', 'resolution_due_at',
+                'first_response_breached', 'resolution_breached'
+            )
+        }),
         ('Timestamps', {
             'fields': ('created_at', 'updated_at', 'resolved_at'),
             'classes': ('collapse',)
@@ -41,26 +81,10 @@ class TicketAdmin(admin.ModelAdmin):
     def get_queryset(self, request):
         """Optimize queryset."""
         return super().get_queryset(request).select_related('user', 'assigned_to')
-    
-    def save_model(self, request, obj, form, change):
-        """Log admin changes."""
-        if change:
-            # Log status changes
-            if 'status' in form.changed_data:
-                from django.contrib.admin.models import LogEntry, CHANGE
-                LogEntry.objects.log_action(
-                    user_id=request.user.id,
-                    content_type_id=None,  # We'll handle this differently
-                    object_id=obj.id,
-                    object_repr=str(obj),
-                    action_flag=CHANGE,
-                    change_message=f"Status changed to {obj.status}"
-                )
-        super().save_model(request, obj, form, change)
 
 
 @admin.register(TicketComment)
-class TicketCommentAdmin(admin.ModelAdmin):
+class TicketCommentAdmin(ActorAdminMixin, admin.ModelAdmin):
     list_display = [
         'id', 'ticket_link', 'author', 'is_internal', 'is_admin_comment', 
         'created_at', 'content_preview'
@@ -96,6 +120,73 @@ class TicketCommentAdmin(admin.ModelAdmin):
         return super().get_queryset(request).select_related('ticket', 'author')
 
 
+@admin.register(SLAPolicy)
+class SLAPolicyAdmin(admin.ModelAdmin):
+    list_display = [
+        'id', 'priority', 'category', 'first_response_minutes', 'resolution_minutes', 'business_hours_only'
+    ]
+    list_filter = ['priority', 'category', 'business_hours_only']
+
+
+@admin.register(SupportAgent)
+class SupportAgentAdmin(admin.ModelAdmin):
+    list_display = ['user', 'categories', 'is_available', 'max_open_tickets']
+    list_filter = ['is_available']
+    list_editable = ['is_available', 'max_open_tickets']
+    search_fields = ['user__email', 'user__name']
+    autocomplete_fields = ['user']
+
+    def get_queryset(self, request):
+        """Optimize queryset."""
+        return super().get_queryset(request).select_related('user')
+
+
+@admin.register(TicketEvent)
+class TicketEventAdmin(admin.ModelAdmin):
+    """Read-only view of the ticket history."""
+
+    list_display = ['id', 'ticket_id', 'kind', 'old_value', 'new_value', 'actor_id', 'is_internal', 'created_at']
+    list_filter = ['kind', 'is_internal']
+    date_hierarchy = 'created_at'
+    show_full_result_count = False
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(ArchivedTicket)
+class ArchivedTicketAdmin(admin.ModelAdmin):
+    """Read-only view of archived tickets; restoring moves them back to the ticket table."""
+
+    list_display = ['id', 'title', 'user', 'category', 'priority', 'status', 'created_at', 'archived_at']
+    list_filter = ['category', 'priority']
+    search_fields = ['title', 'user__email']
+    date_hierarchy = 'archived_at'
+    show_full_result_count = False
+    actions = ['restore_selected']
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('user')
+
+    @admin.action(description='Restore selected tickets')
+    def restore_selected(self, request, queryset):
+        with acting_as(request.user):
+            restored = restore_tickets(list(queryset.values_list('pk', flat=True)))
+        self.message_user(request, f'Restored {restored} tickets.')
+
+
 # Customize admin site
 admin.site.site_header = "KubeBro Hirethon Admin"
 admin.site.site_title = "Admin Portal"
@@ -0,0 +1,87 @@
+import hashlib
+
+from django.db.models import Count, Max, Q
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+
+
+def make_etag(*parts):
+    """Build a strong ETag from the values that determine a representation."""
+    digest = hashlib.sha1("|".join(str(part) for part in parts).encode("utf-8")).hexdigest()
+    return quote_etag(digest)
+
+
+def viewer_key(request):
+    """Representations differ per viewer and renderer, so validators must too."""
+    user = request.user
+    renderer = getattr(request, "accepted_renderer", None)
+    return (user.pk, user.is_staff or user.is_superuser, getattr(renderer, "format", ""))
+
+
+def ticket_validators(request, queryset, pk):
+    """
+    Return ``(etag, last_modified)`` for one ticket, or None if it is not visible.
+
+    Costs a single query on the ticket primary key and the comment
+    ``(ticket, created_at)`` index; nothing is prefetched or serialized.
+    Only comments the viewer can see count, so internal notes never change a
+    requester's validators.
+    """
+    user = request.user
+    visible = None if user.is_staff or user.is_superuser else Q(comments__is_internal=False)
+    try:
+        row = (
+            queryset.filter(pk=pk)
+            .order_by()
+            .annotate(
+                visible_comment_count=Count("comments", filter=visible),
+                last_comment_change=Max("comments__updated_at", filter=visible),
+            )
+            .values("updated_at", "visible_comment_count", "last_comment_change")
+            .first()
+        )
+    except (TypeError, ValueError):
+        return None
+    if row is None:
+        return None
+
+    last_modified = max(filter(None, [row["updated_at"], row["last_comment_change"]]))
+    etag = make_etag("ticket", pk, *viewer_key(request), row["updated_at"].isoformat(), row["visible_comment_count"],
+                     row["last_comment_change"].isoformat() if row["last_comment_change"] else "")
+    return etag, last_modified
+
+
+def collection_validators(request, queryset):
+    """
+    Return ``(etag, last_modified)`` for a filtered ticket collection.
+
+    The fingerprint is ``max(updated_at)`` plus ``count(*)`` of the filtered
+    queryset, combined with the full query string so each page and ordering
+    validates separately. Comment writes touch ``Ticket.updated_at``, so they
+    change the fingerprint too.
+    """
+    row = queryset.order_by().aggregate(total=Count("id"), last_updated=Max("updated_at"))
+    last_updated = row["last_updated"]
+    etag = make_etag(
+        "tickets", request.get_full_path(), *viewer_key(request), row["total"],
+        last_updated.isoformat() if last_updated else "",
+    )
+    return etag, last_updated
+
+
+def conditional_response(request, validators, build_response):
+    """Answer with 304 when the client's validators match, otherwise build and tag the response."""
+    etag, last_modified = validators
+    timestamp = int(last_modified.timestamp()) if last_modified else None
+
+    not_modified = get_conditional_response(request, etag=etag, last_modified=timestamp)
+    if not_modified is not None:
+        return not_modified
+
+    response = build_response()
+    response["ETag"] = etag
+    if timestamp is not None:
+        response["Last-Modified"] = http_date(timestamp)
+    # Clients may keep a copy but must revalidate it on every use
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
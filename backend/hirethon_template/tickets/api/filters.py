@@ -0,0 +1,46 @@
+from django.db.models import Q
+from django_filters import rest_framework as filters
+from rest_framework.filters import BaseFilterBackend
+
+from hirethon_template.tickets.models import Ticket
+from hirethon_template.tickets.search import filter_by_search
+
+
+class TicketFilter(filters.FilterSet):
+    """Ticket list filters, including SLA deadlines and breaches."""
+
+    resolution_due_before = filters.IsoDateTimeFilter(field_name='resolution_due_at', lookup_expr='lte')
+    resolution_due_after = filters.IsoDateTimeFilter(field_name='resolution_due_at', lookup_expr='gte')
+    first_response_due_before = filters.IsoDateTimeFilter(field_name='first_response_due_at', lookup_expr='lte')
+    sla_breached = filters.BooleanFilter(method='filter_sla_breached')
+
+    class Meta:
+        model = Ticket
+        fields = ['status', 'priority', 'category', 'assigned_to']
+
+    def filter_sla_breached(self, queryset, name, value):
+        breached = Q(first_response_breached=True) | Q(resolution_breached=True)
+        return queryset.filter(breached if value else ~breached)
+
+
+class TicketSearchFilter(BaseFilterBackend):
+    """Full-text ``?search=`` filter backed by the ticket search vector GIN index."""
+
+    search_param = 'search'
+
+    def filter_queryset(self, request, queryset, view):
+        text = request.query_params.get(self.search_param, '').strip()
+        if not text:
+            return queryset
+        return filter_by_search(queryset, text)
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                'name': self.search_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Full-text search over title, description and public comments.',
+                'schema': {'type': 'string'},
+            },
+        ]
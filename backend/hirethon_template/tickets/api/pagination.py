@@ -0,0 +1,242 @@
+import json
+import logging
+from base64 import b64decode, b64encode
+from binascii import Error as BinasciiError
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+logger = logging.getLogger(__name__)
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset (seek) pagination over the queryset ordering plus an ``id`` tiebreak.
+
+    The cursor stores the ordering values of the boundary row, and the next page
+    is fetched with ``WHERE (a, b, id) > (x, y, z)`` expanded into plain lookups.
+    PostgreSQL cannot turn that OR into an index range, so a redundant bound on
+    the leading field is ANDed on; it starts the index scan at the boundary row
+    instead of at the first row of the listing. Pagination is
+    opt-in: it only applies when the request sends ``cursor`` or ``page_size``,
+    and the total count is only computed when ``include_count`` is set.
+    """
+
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    count_query_param = 'include_count'
+    page_size = 25
+    max_page_size = 100
+    tiebreak_field = 'id'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if not self.is_requested(request):
+            return None
+
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.limit = self.get_page_size(request)
+        self.ordering = self.get_ordering(queryset)
+        self.count = queryset.order_by().count() if self.is_count_requested(request) else None
+
+        values, reverse = self.decode_cursor(request)
+        ordering = [self.invert(field) for field in self.ordering] if reverse else self.ordering
+
+        queryset = queryset.order_by(*ordering)
+        if values is not None:
+            queryset = queryset.filter(self.build_seek_filter(ordering, values))
+
+        # Fetch one extra row to find out whether another page follows.
+        results = list(queryset[:self.limit + 1])
+        has_more = len(results) > self.limit
+        results = results[:self.limit]
+        if reverse:
+            results.reverse()
+
+        if reverse:
+            self.has_next = values is not None
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = values is not None
+
+        self.page = results
+        return results
+
+    def get_paginated_response(self, data):
+        response = {
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        }
+        if self.count is not None:
+            response['count'] = self.count
+        return Response(response)
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'count': {'type': 'integer'},
+                'results': schema,
+            },
+        }
+
+    def is_requested(self, request):
+        params = request.query_params
+        return self.cursor_query_param in params or self.page_size_query_param in params
+
+    def is_count_requested(self, request):
+        return request.query_params.get(self.count_query_param, '').lower() in ('1', 'true', 'yes')
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def get_ordering(self, queryset):
+        """Return the queryset ordering with a trailing ``id`` tiebreak."""
+        ordering = list(queryset.query.order_by) or list(queryset.model._meta.ordering)
+        ordering = [field.replace('pk', self.tiebreak_field) if field.lstrip('-') == 'pk' else field
+                    for field in ordering]
+
+        if self.tiebreak_field not in [field.lstrip('-') for field in ordering]:
+            descending = bool(ordering) and ordering[0].startswith('-')
+            ordering.append(f"-{self.tiebreak_field}" if descending else self.tiebreak_field)
+
+        self.fields = {}
+        for field in ordering:
+            name = field.lstrip('-')
+            try:
+                self.fields[name] = queryset.model._meta.get_field(name)
+            except FieldDoesNotExist:
+                raise ValueError(f"Keyset pagination cannot order by '{name}'")
+        return ordering
+
+    @staticmethod
+    def invert(field):
+        return field[1:] if field.startswith('-') else f"-{field}"
+
+    def build_seek_filter(self, ordering, values):
+        """
+        Expand ``(a, b, id) > (x, y, z)`` into lookups honouring each field's direction.
+
+        NULLs follow PostgreSQL's default placement: last in ascending order and
+        first in descending order. The leading field also gets a plain
+        ``>=``/``<=`` bound the index can seek to, except when the rows after
+        the cursor include NULLs, which no range bound can express.
+        """
+        seek = Q()
+        equal = Q()
+        for field, value in zip(ordering, values):
+            name = field.lstrip('-')
+            descending = field.startswith('-')
+            if value is None:
+                after = Q(**{f"{name}__isnull": False}) if descending else None
+                same = Q(**{f"{name}__isnull": True})
+            else:
+                after = Q(**{f"{name}__{'lt' if descending else 'gt'}": value})
+                if not descending and self.fields[name].null:
+                    after |= Q(**{f"{name}__isnull": True})
+                same = Q(**{name: value})
+            if after is not None:
+                seek |= equal & after
+            equal &= same
+
+        name, value = ordering[0].lstrip('-'), values[0]
+        descending = ordering[0].startswith('-')
+        if value is not None and (descending or not self.fields[name].null):
+            seek = Q(**{f"{name}__{'lte' if descending else 'gte'}": value}) & seek
+        return seek
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+
+        try:
+            payload = json.loads(b64decode(encoded.encode('ascii')).decode('utf-8'))
+            raw_values = payload['v']
+            reverse = bool(payload.get('r', False))
+            if len(raw_values) != len(self.ordering):
+                raise ValueError('Cursor does not match the requested ordering')
+            values = [
+                self.fields[field.lstrip('-')].to_python(value)
+                for field, value in zip(self.ordering, raw_values)
+            ]
+        except (BinasciiError, KeyError, TypeError, ValueError, UnicodeError, ValidationError):
+            logger.warning(f"Invalid pagination cursor received: {encoded}")
+            raise NotFound(self.invalid_cursor_message)
+
+        return values, reverse
+
+    def encode_cursor(self, instance, reverse):
+        values = []
+        for field in self.ordering:
+            name = field.lstrip('-')
+            # Pages built from .values() hold dicts keyed by the ordering fields
+            if isinstance(instance, dict):
+                value = instance[name]
+            else:
+                value = self.fields[name].value_from_object(instance)
+            values.append(value.isoformat() if hasattr(value, 'isoformat') else value)
+
+        payload = {'v': values}
+        if reverse:
+            payload['r'] = True
+        encoded = b64encode(json.dumps(payload, separators=(',', ':')).encode('utf-8')).decode('ascii')
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def get_cursor_link(self, base_url, queryset, instance, reverse=False):
+        """Link to the page after ``instance`` in ``queryset``'s ordering, or before it with ``reverse``."""
+        self.base_url = base_url
+        self.ordering = self.get_ordering(queryset)
+        return self.encode_cursor(instance, reverse)
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.page[0], reverse=True)
+
+
+class TicketPagination(KeysetPagination):
+    """Keyset pagination for ticket listings."""
+
+    page_size = 25
+    max_page_size = 100
+
+
+class TicketCommentPagination(KeysetPagination):
+    """Keyset pagination for ticket comment listings."""
+
+    page_size = 50
+    max_page_size = 200
+
+
+class TicketEventPagination(KeysetPagination):
+    """Keyset pagination for ticket timelines, which are always paginated."""
+
+    page_size = 50
+    max_page_size = 200
+
+    def is_requested(self, request):
+        return True
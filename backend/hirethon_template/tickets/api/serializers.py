@@ -1,13 +1,77 @@
 import logging
-from rest_framework import serializers
+from datetime import timedelta
+from functools import partial
+
+from rest_framework import permissions, serializers
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.urls import reverse
+from django.utils import timezone
+
+from hirethon_template.tickets.dedup import find_duplicates
+from hirethon_template.tickets.managers import EMBEDDED_COMMENT_LIMIT
+from hirethon_template.tickets.models import (
+    ArchivedTicket,
+    ArchivedTicketComment,
+    Ticket,
+    TicketComment,
+    TicketDailyRollup,
+    TicketEvent,
+)
+from hirethon_template.tickets.related import related_tickets
+from hirethon_template.tickets.rollups import INTERVALS
+from hirethon_template.tickets.tasks import assign_ticket
+from hirethon_template.tickets.triage import FIELDS as TRIAGE_FIELDS
+from hirethon_template.tickets.triage import suggest, ticket_text
+from hirethon_template.utils.values_serializer import ValuesSerializer
 
-from hirethon_template.tickets.models import Ticket, TicketComment
+from .pagination import TicketCommentPagination
 
 logger = logging.getLogger(__name__)
 User = get_user_model()
 
 
+def parse_fieldset(request):
+    """
+    Return ``(fields, expand)`` from the ``?fields=`` and ``?expand=`` query params.
+
+    ``fields`` is None when the client did not ask for a sparse fieldset.
+    Only safe requests are considered, so write responses keep their full shape.
+    """
+    if request is None or request.method not in permissions.SAFE_METHODS:
+        return None, set()
+
+    def split(name):
+        return {value.strip() for value in request.query_params.get(name, '').split(',') if value.strip()}
+
+    fields = split('fields')
+    return (fields or None), split('expand')
+
+
+class SparseFieldsetMixin:
+    """
+    Serializer mixin trimming output to the request's ``?fields=`` selection.
+
+    Nested relations in ``expandable_fields`` are rendered as primary keys
+    when a sparse fieldset is requested, unless also named in ``?expand=``.
+    """
+    expandable_fields = []
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        fields, expand = parse_fieldset(self.context.get('request'))
+        if fields is None:
+            return
+
+        for name in list(self.fields):
+            if name not in fields:
+                self.fields.pop(name)
+        for name in self.expandable_fields:
+            if name in self.fields and name not in expand:
+                self.fields[name] = serializers.PrimaryKeyRelatedField(read_only=True)
+
+
 class UserBasicSerializer(serializers.ModelSerializer):
     """Basic user information for ticket display."""
     class Meta:
@@ -40,11 +104,23 @@ class TicketCommentSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
-class TicketListSerializer(serializers.ModelSerializer):
+class TicketEventSerializer(serializers.ModelSerializer):
+    """Serializer for ticket timeline entries."""
+    kind = serializers.CharField(source='get_kind_display', read_only=True)
+    actor = UserBasicSerializer(read_only=True)
+
+    class Meta:
+        model = TicketEvent
+        fields = ['id', 'kind', 'old_value', 'new_value', 'actor', 'is_internal', 'created_at']
+        read_only_fields = fields
+
+
+class TicketListSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Serializer for ticket list view (minimal data)."""
+    expandable_fields = ['user', 'assigned_to']
     user = UserBasicSerializer(read_only=True)
     assigned_to = UserBasicSerializer(read_only=True)
-    comment_count = serializers.SerializerMethodField()
+    comment_count = serializers.IntegerField(source='public_comment_count', read_only=True)
     latest_comment = serializers.SerializerMethodField()
     
     class Meta:
@@ -52,42 +128,136 @@ class TicketListSerializer(serializers.ModelSerializer):
         fields = [
             'id', 'title', 'category', 'priority', 'status', 'user', 
             'assigned_to', 'created_at', 'updated_at', 'resolved_at',
-            'comment_count', 'latest_comment'
+            'comment_count', 'latest_comment', 'first_response_due_at', 'resolution_due_at',
+            'first_response_breached', 'resolution_breached'
         ]
     
-    def get_comment_count(self, obj):
-        return obj.comments.filter(is_internal=False).count()
-    
     def get_latest_comment(self, obj):
-        latest = obj.comments.filter(is_internal=False).order_by('-created_at').first()
-        if latest:
-            return {
-                'content': latest.content[:100] + '...' if len(latest.content) > 100 else latest.content,
-                'author': latest.author.name or latest.author.email,
-                'created_at': latest.created_at
-            }
+        # Read from the activity columns Ticket keeps up to date on comment writes
+        if obj.last_public_comment_at is None:
+            return None
+        author = obj.last_public_comment_author
+        return {
+            'content': obj.last_public_comment_excerpt,
+            'author': (author.name or author.email) if author else None,
+            'created_at': obj.last_public_comment_at
+        }
+
+
+def latest_comment_from_row(row):
+    if row['last_public_comment_at'] is None:
         return None
+    return {
+        'content': row['last_public_comment_excerpt'],
+        'author': row['last_public_comment_author__name'] or row['last_public_comment_author__email'],
+        'created_at': row['last_public_comment_at']
+    }
+
 
+class TicketListValuesSerializer(ValuesSerializer):
+    """Fast read path for TicketListSerializer over ``.values()`` rows."""
+    serializer_class = TicketListSerializer
+    computed_fields = {
+        'latest_comment': (
+            [
+                'last_public_comment_excerpt', 'last_public_comment_at',
+                'last_public_comment_author__name', 'last_public_comment_author__email',
+            ],
+            latest_comment_from_row,
+        ),
+    }
 
-class TicketDetailSerializer(serializers.ModelSerializer):
+
+class TicketCommentValuesSerializer(ValuesSerializer):
+    """Fast read path for TicketCommentSerializer over ``.values()`` rows."""
+    serializer_class = TicketCommentSerializer
+    computed_fields = {
+        'is_admin_comment': (
+            ['author__is_staff', 'author__is_superuser'],
+            lambda row: row['author__is_staff'] or row['author__is_superuser'],
+        ),
+    }
+
+
+class TicketSearchResultSerializer(TicketListSerializer):
+    """Ticket list entry with full-text rank and highlighted snippets."""
+    rank = serializers.FloatField(read_only=True)
+    title_highlight = serializers.CharField(read_only=True)
+    description_highlight = serializers.CharField(read_only=True)
+    is_archived = serializers.BooleanField(read_only=True)
+
+    class Meta(TicketListSerializer.Meta):
+        fields = TicketListSerializer.Meta.fields + ['rank', 'title_highlight', 'description_highlight', 'is_archived']
+
+
+class ArchivedTicketSearchResultSerializer(TicketSearchResultSerializer):
+    """Search result entry for a ticket found in the archive."""
+
+    class Meta(TicketSearchResultSerializer.Meta):
+        model = ArchivedTicket
+
+
+class TicketDetailSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Serializer for ticket detail view (full data)."""
+    expandable_fields = ['user', 'assigned_to']
     user = UserBasicSerializer(read_only=True)
     assigned_to = UserBasicSerializer(read_only=True)
     assigned_to_id = serializers.IntegerField(write_only=True, required=False, allow_null=True)
-    comments = TicketCommentSerializer(many=True, read_only=True)
+    comments = serializers.SerializerMethodField()
+    older_comments = serializers.SerializerMethodField()
+    related_tickets = serializers.SerializerMethodField()
     is_open = serializers.BooleanField(read_only=True)
     is_resolved = serializers.BooleanField(read_only=True)
+    is_archived = serializers.BooleanField(read_only=True)
     
     class Meta:
         model = Ticket
         fields = [
             'id', 'title', 'description', 'category', 'priority', 'status',
             'user', 'assigned_to', 'assigned_to_id', 'admin_feedback',
-            'created_at', 'updated_at', 'resolved_at', 'comments',
-            'is_open', 'is_resolved'
+            'created_at', 'updated_at', 'resolved_at', 'comments', 'older_comments', 'related_tickets',
+            'is_open', 'is_resolved', 'is_archived', 'first_response_due_at', 'first_responded_at',
+            'resolution_due_at', 'first_response_breached', 'resolution_breached'
         ]
         read_only_fields = ['id', 'user', 'created_at', 'updated_at', 'resolved_at']
     
+    def get_recent_comments(self, obj):
+        """Newest visible comments (one more than embedded), from TicketQuerySet.with_recent_comments()."""
+        if not hasattr(obj, 'recent_comments'):
+            request = self.context.get('request')
+            include_internal = bool(request and (request.user.is_staff or request.user.is_superuser))
+            obj.recent_comments = Ticket.objects.with_recent_comments(include_internal).get(pk=obj.pk).recent_comments
+        return obj.recent_comments
+
+    def get_comments(self, obj):
+        # Oldest first, like the comments endpoint
+        comments = self.get_recent_comments(obj)[:EMBEDDED_COMMENT_LIMIT][::-1]
+        return TicketCommentSerializer(comments, many=True, context=self.context).data
+
+    def get_older_comments(self, obj):
+        """Cursor link to the comments before the embedded ones, if there are any."""
+        recent = self.get_recent_comments(obj)
+        request = self.context.get('request')
+        if len(recent) <= EMBEDDED_COMMENT_LIMIT or request is None:
+            return None
+
+        url = request.build_absolute_uri(reverse('api:ticket-comments-list', kwargs={'ticket_pk': obj.pk}))
+        oldest = recent[EMBEDDED_COMMENT_LIMIT - 1]
+        return TicketCommentPagination().get_cursor_link(
+            url, TicketComment.objects.order_by('created_at'), oldest, reverse=True
+        )
+
+    def get_related_tickets(self, obj):
+        """Similar resolved tickets whose fixes may apply; users only get their own, admins all of them."""
+        request = self.context.get('request')
+        if request is None:
+            return []
+
+        user = request.user
+        # Admins see every ticket, which spares reading all the ids to rank among
+        tickets = None if (user.is_staff or user.is_superuser) else Ticket.objects.filter(user=user)
+        return related_tickets(obj, tickets)
+
     def create(self, validated_data):
         # Set user to current user
         validated_data['user'] = self.context['request'].user
@@ -114,12 +284,87 @@ class TicketDetailSerializer(serializers.ModelSerializer):
         return super().update(instance, validated_data)
 
 
+class ArchivedTicketCommentSerializer(serializers.ModelSerializer):
+    """Read-only comment of an archived ticket."""
+    author = UserBasicSerializer(read_only=True)
+    is_admin_comment = serializers.BooleanField(read_only=True)
+
+    class Meta:
+        model = ArchivedTicketComment
+        fields = ['id', 'content', 'author', 'is_internal', 'is_admin_comment', 'created_at', 'updated_at']
+        read_only_fields = fields
+
+
+class ArchivedTicketDetailSerializer(serializers.ModelSerializer):
+    """Detail of an archived ticket, shaped like TicketDetailSerializer, with all its visible comments."""
+    user = UserBasicSerializer(read_only=True)
+    assigned_to = UserBasicSerializer(read_only=True)
+    comments = serializers.SerializerMethodField()
+    is_open = serializers.BooleanField(read_only=True)
+    is_resolved = serializers.BooleanField(read_only=True)
+    is_archived = serializers.BooleanField(read_only=True)
+
+    class Meta:
+        model = ArchivedTicket
+        fields = [
+            'id', 'title', 'description', 'category', 'priority', 'status',
+            'user', 'assigned_to', 'admin_feedback', 'created_at', 'updated_at', 'resolved_at', 'comments',
+            'is_open', 'is_resolved', 'is_archived', 'archived_at', 'first_response_due_at', 'first_responded_at',
+            'resolution_due_at', 'first_response_breached', 'resolution_breached'
+        ]
+        read_only_fields = fields
+
+    def get_comments(self, obj):
+        request = self.context.get('request')
+        comments = obj.comments.select_related('author')
+        if not (request and (request.user.is_staff or request.user.is_superuser)):
+            comments = comments.filter(is_internal=False)
+        return ArchivedTicketCommentSerializer(comments, many=True, context=self.context).data
+
+
+def apply_triage(attrs_list):
+    """
+    Predict the category and priority of validated tickets in one batch.
+
+    Fields the reporter left out are filled in when the prediction is at least
+    ``TICKET_TRIAGE_MIN_CONFIDENCE`` likely. Returns the suggestions per
+    ticket, or None for each while no model has been trained.
+    """
+    predictions = suggest([ticket_text(attrs['title'], attrs['description']) for attrs in attrs_list])
+    suggestions = []
+    for attrs, prediction in zip(attrs_list, predictions):
+        if prediction is None:
+            suggestions.append(None)
+            continue
+
+        suggestion = {}
+        for field in TRIAGE_FIELDS:
+            value, confidence = prediction[field]
+            applied = field not in attrs and confidence >= settings.TICKET_TRIAGE_MIN_CONFIDENCE
+            if applied:
+                attrs[field] = value
+            suggestion[field] = {'value': value, 'confidence': round(confidence, 2), 'applied': applied}
+        suggestions.append(suggestion)
+    return suggestions
+
+
+class TicketCreateListSerializer(serializers.ListSerializer):
+    """Creates a batch of tickets, triaged with a single prediction."""
+
+    def validate(self, attrs):
+        self.triage = apply_triage(attrs)
+        return attrs
+
+
 class TicketCreateSerializer(serializers.ModelSerializer):
     """Serializer for creating new tickets."""
     
+    triage = None
+
     class Meta:
         model = Ticket
         fields = ['title', 'description', 'category', 'priority']
+        list_serializer_class = TicketCreateListSerializer
     
     def validate_title(self, value):
         if not value or not value.strip():
@@ -135,10 +380,50 @@ class TicketCreateSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError("Description must be at least 10 characters long.")
         return value.strip()
     
+    def validate(self, attrs):
+        # Tickets created in bulk are triaged together by TicketCreateListSerializer
+        if self.parent is None:
+            self.triage = apply_triage([attrs])[0]
+        return attrs
+
+    def get_possible_duplicates(self, limit=5):
+        """
+        Open tickets that look like duplicates of the validated title and description.
+
+        Call before ``save()`` so the new ticket does not match itself. Users
+        only get matches among their own tickets; admins among all of them.
+        """
+        user = self.context['request'].user
+        tickets = Ticket.objects.all() if (user.is_staff or user.is_superuser) else Ticket.objects.filter(user=user)
+        matches = find_duplicates(
+            self.validated_data['title'], self.validated_data['description'], tickets, limit=limit
+        )
+        if not matches:
+            return []
+
+        rows = Ticket.objects.only('id', 'title', 'status', 'created_at').in_bulk(
+            [ticket_id for ticket_id, _score in matches]
+        )
+        return [
+            {
+                'id': ticket_id,
+                'title': rows[ticket_id].title,
+                'status': rows[ticket_id].status,
+                'created_at': rows[ticket_id].created_at,
+                'similarity': round(score, 2),
+            }
+            for ticket_id, score in matches
+            if ticket_id in rows
+        ]
+
     def create(self, validated_data):
         validated_data['user'] = self.context['request'].user
         logger.info(f"New ticket created: {validated_data['title']} by {validated_data['user'].email}")
-        return super().create(validated_data)
+        ticket = super().create(validated_data)
+
+        # Pick an agent in the background once the ticket is committed
+        transaction.on_commit(partial(assign_ticket.delay, ticket.pk), robust=True)
+        return ticket
 
 
 class TicketStatusUpdateSerializer(serializers.ModelSerializer):
@@ -181,3 +466,57 @@ class TicketCommentCreateSerializer(serializers.ModelSerializer):
         
         logger.info(f"Comment added to ticket {validated_data['ticket'].id} by {validated_data['author'].email}")
         return super().create(validated_data)
+
+
+class TicketStatsFilterSerializer(serializers.Serializer):
+    """Query parameters accepted by the ticket statistics endpoint."""
+    created_after = serializers.DateField(required=False)
+    created_before = serializers.DateField(required=False)
+    assigned_to = serializers.IntegerField(required=False, min_value=1)
+    unassigned = serializers.BooleanField(required=False, default=False)
+    category = serializers.ChoiceField(choices=Ticket.CATEGORY_CHOICES, required=False)
+
+    def validate(self, attrs):
+        created_after = attrs.get('created_after')
+        created_before = attrs.get('created_before')
+        if created_after and created_before and created_after > created_before:
+            raise serializers.ValidationError("created_after must not be later than created_before.")
+        return attrs
+
+
+class TicketCommentFilterSerializer(serializers.Serializer):
+    """Query parameters accepted by the ticket comment listing."""
+    created_after = serializers.DateTimeField(required=False)
+    created_before = serializers.DateTimeField(required=False)
+
+    def validate(self, attrs):
+        created_after = attrs.get('created_after')
+        created_before = attrs.get('created_before')
+        if created_after and created_before and created_after > created_before:
+            raise serializers.ValidationError("created_after must not be later than created_before.")
+        return attrs
+
+
+class TicketAnalyticsFilterSerializer(serializers.Serializer):
+    """Query parameters accepted by the ticket analytics endpoint."""
+    interval = serializers.ChoiceField(choices=INTERVALS, required=False, default='day')
+    dimension = serializers.ChoiceField(
+        choices=TicketDailyRollup.DIMENSION_CHOICES, required=False, default=TicketDailyRollup.ALL
+    )
+    start = serializers.DateField(required=False)
+    end = serializers.DateField(required=False)
+
+    default_days = {'day': 30, 'week': 7 * 12, 'month': 365}
+
+    def validate(self, attrs):
+        attrs['end'] = attrs.get('end') or timezone.localdate()
+        attrs['start'] = attrs.get('start') or attrs['end'] - timedelta(days=self.default_days[attrs['interval']] - 1)
+        if attrs['start'] > attrs['end']:
+            raise serializers.ValidationError("start must not be later than end.")
+        return attrs
+
+
+class TicketResolutionReportSerializer(serializers.Serializer):
+    """Query parameters accepted by the resolution analytics endpoint."""
+    days = serializers.IntegerField(required=False, default=30, min_value=1, max_value=365)
+    weeks = serializers.IntegerField(required=False, default=12, min_value=1, max_value=52)
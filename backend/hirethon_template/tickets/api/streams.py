@@ -0,0 +1,115 @@
+import logging
+import time
+
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+from rest_framework import status
+from rest_framework.exceptions import NotFound
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.views import APIView
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from ..events import get_broker, ticket_channel, user_channel
+from ..models import Ticket
+
+logger = logging.getLogger(__name__)
+
+# Comment lines keep proxies from closing idle streams
+HEARTBEAT_SECONDS = 15
+# Streams end after this long and EventSource reconnects, which bounds how long
+# a stream whose client vanished without a disconnect can linger
+STREAM_MAX_SECONDS = 300
+RECONNECT_MILLISECONDS = 3000
+
+
+class QueryParamJWTAuthentication(JWTAuthentication):
+    """JWT passed as ``?access_token=``, for clients such as EventSource that cannot set headers."""
+
+    def authenticate(self, request):
+        raw_token = request.query_params.get('access_token')
+        if not raw_token:
+            return None
+        validated_token = self.get_validated_token(raw_token.encode())
+        return self.get_user(validated_token), validated_token
+
+
+class EventStreamRenderer(BaseRenderer):
+    """Lets clients negotiate ``text/event-stream``; only error bodies are rendered through it."""
+    media_type = 'text/event-stream'
+    format = 'event-stream'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return JSONRenderer().render(data, renderer_context=renderer_context)
+
+
+async def event_stream(channels, max_seconds=STREAM_MAX_SECONDS):
+    """Relay broker messages on ``channels`` as Server-Sent Events."""
+    yield f"retry: {RECONNECT_MILLISECONDS}\n\n"
+    deadline = time.monotonic() + max_seconds
+    stream = get_broker().listen(channels, HEARTBEAT_SECONDS)
+    try:
+        async for message in stream:
+            if message is None:
+                yield ": keep-alive\n\n"
+            else:
+                yield f"data: {message}\n\n"
+            if time.monotonic() >= deadline:
+                break
+    finally:
+        await stream.aclose()
+
+
+class EventStreamView(APIView):
+    """Base view answering with a Server-Sent Events stream of ticket events."""
+    authentication_classes = [*api_settings.DEFAULT_AUTHENTICATION_CLASSES, QueryParamJWTAuthentication]
+    permission_classes = [IsAuthenticated]
+    renderer_classes = [JSONRenderer, EventStreamRenderer]
+
+    def get_channels(self, request, **kwargs):
+        raise NotImplementedError
+
+    def get(self, request, **kwargs):
+        channels = self.get_channels(request, **kwargs)
+        # Under WSGI Django drains an async iterator before sending any of it, so the
+        # client would hear nothing until the stream ended
+        if not isinstance(request._request, ASGIRequest):
+            return Response(
+                {'error': 'Event streams are only served by the ASGI application'},
+                status=status.HTTP_501_NOT_IMPLEMENTED
+            )
+        logger.info(f"Event stream opened by {request.user.email}: {', '.join(channels)}")
+
+        response = StreamingHttpResponse(event_stream(channels), content_type='text/event-stream')
+        response['Cache-Control'] = 'no-cache'
+        # Stop nginx-style proxies from buffering the stream
+        response['X-Accel-Buffering'] = 'no'
+        return response
+
+
+class TicketEventStreamView(EventStreamView):
+    """Events for one ticket; internal comment events are only streamed to admins."""
+
+    def get_channels(self, request, pk=None):
+        user = request.user
+        is_admin = user.is_staff or user.is_superuser
+
+        tickets = Ticket.objects.filter(pk=pk)
+        if not is_admin:
+            tickets = tickets.filter(user=user)
+        if not tickets.exists():
+            raise NotFound('Ticket not found')
+
+        channels = [ticket_channel(pk)]
+        if is_admin:
+            channels.append(ticket_channel(pk, internal=True))
+        return channels
+
+
+class UserEventStreamView(EventStreamView):
+    """Events for the tickets the current user filed or is assigned."""
+
+    def get_channels(self, request):
+        return [user_channel(request.user.id)]
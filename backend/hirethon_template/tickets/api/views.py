@@ -1,19 +1,52 @@
 import logging
-from django.db.models import Q
+
+from django.conf import settings
 from django.contrib.auth import get_user_model
-from rest_framework import status, permissions
+from django.db import transaction
+from django.db.models import Q
+from django_filters.rest_framework import DjangoFilterBackend
+from rest_framework import permissions, status
 from rest_framework.decorators import action
+from rest_framework.filters import OrderingFilter
+from rest_framework.generics import get_object_or_404
+from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.viewsets import ModelViewSet
-from rest_framework.permissions import IsAuthenticated
-from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework.filters import SearchFilter, OrderingFilter
 
+from hirethon_template.utils.typeahead import parse_typeahead_params, typeahead
+from hirethon_template.utils.values_serializer import ValuesListMixin
+
+from ..analytics import get_report
+from ..archive import archived_ticket, visible_archived_tickets
+from ..changes import decode_cursor, get_changes
+from ..counters import get_global_stats, get_user_summary
+from ..history import reset_actor, set_actor
+from ..models import Ticket, TicketComment, TicketEvent
+from ..rollups import get_rollup_series
+from ..search import search_tickets
+from ..stats import get_ticket_stats
+from .conditional import collection_validators, conditional_response, ticket_validators
+from .filters import TicketFilter, TicketSearchFilter
+from .pagination import TicketCommentPagination, TicketEventPagination, TicketPagination
 from .serializers import (
-    TicketListSerializer, TicketDetailSerializer, TicketCreateSerializer,
-    TicketStatusUpdateSerializer, TicketCommentSerializer, TicketCommentCreateSerializer
+    ArchivedTicketDetailSerializer,
+    ArchivedTicketSearchResultSerializer,
+    TicketAnalyticsFilterSerializer,
+    TicketCommentCreateSerializer,
+    TicketCommentFilterSerializer,
+    TicketCommentSerializer,
+    TicketCommentValuesSerializer,
+    TicketCreateSerializer,
+    TicketDetailSerializer,
+    TicketEventSerializer,
+    TicketListSerializer,
+    TicketListValuesSerializer,
+    TicketResolutionReportSerializer,
+    TicketSearchResultSerializer,
+    TicketStatsFilterSerializer,
+    TicketStatusUpdateSerializer,
+    parse_fieldset,
 )
-from ..models import Ticket, TicketComment
 
 logger = logging.getLogger(__name__)
 User = get_user_model()
@@ -35,18 +68,57 @@ class IsOwnerOrAdmin(permissions.BasePermission):
         return obj.user == request.user
 
 
-class TicketViewSet(ModelViewSet):
+class ActorMixin:
+    """Attribute the ticket events recorded while handling a request to the requesting user."""
+
+    actor_token = None
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        # Authentication has run by now
+        self.actor_token = set_actor(request.user)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        if self.actor_token is not None:
+            reset_actor(self.actor_token)
+            self.actor_token = None
+        return super().finalize_response(request, response, *args, **kwargs)
+
+
+class TicketViewSet(ActorMixin, ValuesListMixin, ModelViewSet):
     """ViewSet for managing tickets."""
     
     permission_classes = [IsAuthenticated, IsOwnerOrAdmin]
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
-    filterset_fields = ['status', 'priority', 'category', 'assigned_to']
-    search_fields = ['title', 'description']
-    ordering_fields = ['created_at', 'updated_at', 'priority', 'status']
+    pagination_class = TicketPagination
+    filter_backends = [DjangoFilterBackend, TicketSearchFilter, OrderingFilter]
+    filterset_class = TicketFilter
+    ordering_fields = [
+        'created_at', 'updated_at', 'last_activity_at', 'first_response_due_at', 'resolution_due_at',
+        'priority', 'status'
+    ]
     ordering = ['-created_at']
+    list_actions = ['list', 'my_tickets', 'assigned_to_me', 'queue', 'search', 'changes']
+    search_result_limit = 20
+    max_search_result_limit = 50
+    # Concrete columns and user relations that ?fields= can select
+    ticket_columns = {
+        'id', 'title', 'description', 'category', 'priority', 'status', 'user', 'assigned_to',
+        'admin_feedback', 'created_at', 'updated_at', 'resolved_at', 'last_activity_at',
+        'first_response_due_at', 'first_responded_at', 'resolution_due_at', 'first_response_breached',
+        'resolution_breached',
+    }
+    # Activity columns backing the comment summary fields of list entries
+    activity_columns = {
+        'comment_count': {'public_comment_count'},
+        'latest_comment': {
+            'last_public_comment_at', 'last_public_comment_excerpt', 'last_public_comment_author',
+            'last_public_comment_author__name', 'last_public_comment_author__email',
+        },
+    }
+    user_relations = ['user', 'assigned_to']
     
-    def get_queryset(self):
-        """Return tickets based on user permissions."""
+    def get_visible_queryset(self):
+        """Return tickets based on user permissions, without joins or annotations."""
         user = self.request.user
         
         if user.is_staff or user.is_superuser:
@@ -61,11 +133,68 @@ class TicketViewSet(ModelViewSet):
         if status_filter:
             queryset = queryset.filter(status=status_filter)
         
-        return queryset.select_related('user', 'assigned_to').prefetch_related('comments__author')
+        return queryset
+
+    def decorate_queryset(self, queryset):
+        """Add the joins, prefetches and annotations the current action serializes."""
+        user = self.request.user
+        include_internal = user.is_staff or user.is_superuser
+        if self.action not in self.list_actions and self.action != 'retrieve':
+            return queryset.select_related('user', 'assigned_to').with_recent_comments(include_internal)
+
+        # Only load what the (possibly sparse) serializer will actually render
+        fields, expand = parse_fieldset(self.request)
+        wanted = fields if fields is not None else set(self.get_serializer_class().Meta.fields)
+
+        related = [name for name in self.user_relations if name in wanted and (fields is None or name in expand)]
+        columns = {'id'} | {name for name in wanted if name in self.ticket_columns}
+        if wanted & {'is_open', 'is_resolved'}:
+            columns.add('status')
+        # Keyset pagination reads the ordering values of boundary rows
+        columns |= {name.lstrip('-') for name in queryset.query.order_by if name.lstrip('-') in self.ticket_columns}
+        for name in related:
+            columns |= {name, f"{name}__id", f"{name}__email", f"{name}__name"}
+        # Comment summaries come from the ticket row itself, never from the comments table
+        for name in wanted & self.activity_columns.keys():
+            columns |= self.activity_columns[name]
+        if 'latest_comment' in wanted:
+            related.append('last_public_comment_author')
+
+        queryset = queryset.only(*columns)
+        if related:
+            queryset = queryset.select_related(*related)
+
+        if wanted & {'comments', 'older_comments'}:
+            queryset = queryset.with_recent_comments(include_internal)
+        return queryset
     
+    def get_queryset(self):
+        """Return tickets based on user permissions."""
+        return self.decorate_queryset(self.get_visible_queryset())
+
+    def list_response(self, request, queryset):
+        """Serve a ticket collection, answering 304 from a cheap fingerprint when unchanged."""
+        def build_response():
+            decorated = self.decorate_queryset(queryset)
+            if self.get_serializer_class() is TicketListSerializer:
+                # Plain list entries skip model instances entirely
+                return self.values_response(decorated, TicketListValuesSerializer)
+
+            page = self.paginate_queryset(decorated)
+            if page is not None:
+                serializer = self.get_serializer(page, many=True)
+                return self.get_paginated_response(serializer.data)
+
+            serializer = self.get_serializer(decorated, many=True)
+            return Response(serializer.data)
+
+        return conditional_response(request, collection_validators(request, queryset), build_response)
+
     def get_serializer_class(self):
         """Return appropriate serializer based on action."""
-        if self.action == 'list':
+        if self.action == 'search':
+            return TicketSearchResultSerializer
+        elif self.action in self.list_actions:
             return TicketListSerializer
         elif self.action == 'create':
             return TicketCreateSerializer
@@ -83,12 +212,34 @@ class TicketViewSet(ModelViewSet):
         
         return [permission() for permission in permission_classes]
     
+    def list(self, request, *args, **kwargs):
+        """List tickets visible to the current user."""
+        queryset = self.filter_queryset(self.get_visible_queryset())
+        return self.list_response(request, queryset)
+
+    def retrieve(self, request, *args, **kwargs):
+        """Get ticket details, answering 304 before any prefetch or serialization when unchanged."""
+        validators = ticket_validators(request, self.get_visible_queryset(), kwargs['pk'])
+        if validators is None:
+            # Tickets closed long ago live in the archive tables
+            archived = archived_ticket(request.user, kwargs['pk'])
+            if archived is not None:
+                return Response(ArchivedTicketDetailSerializer(archived, context={'request': request}).data)
+            # Let the regular lookup produce the 404
+            return super().retrieve(request, *args, **kwargs)
+
+        return conditional_response(
+            request, validators, lambda: super(TicketViewSet, self).retrieve(request, *args, **kwargs)
+        )
+
     def create(self, request, *args, **kwargs):
         """Create a new ticket."""
         logger.info(f"Ticket creation request from {request.user.email}")
         
         serializer = self.get_serializer(data=request.data)
         if serializer.is_valid():
+            # Looked up before saving so the new ticket does not match itself
+            duplicates = serializer.get_possible_duplicates()
             ticket = serializer.save()
             
             # Log ticket creation
@@ -96,7 +247,10 @@ class TicketViewSet(ModelViewSet):
             
             # Return full ticket details
             detail_serializer = TicketDetailSerializer(ticket, context={'request': request})
-            return Response(detail_serializer.data, status=status.HTTP_201_CREATED)
+            return Response(
+                {**detail_serializer.data, 'possible_duplicates': duplicates, 'triage': serializer.triage},
+                status=status.HTTP_201_CREATED
+            )
         
         logger.warning(f"Ticket creation failed: {serializer.errors}")
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
@@ -149,6 +303,55 @@ class TicketViewSet(ModelViewSet):
         
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
     
+    @action(detail=False, methods=['post'], permission_classes=[IsAuthenticated])
+    def duplicates(self, request):
+        """Open tickets that look like duplicates of a ticket about to be filed."""
+        serializer = TicketCreateSerializer(data=request.data, context={'request': request})
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        return Response(serializer.get_possible_duplicates())
+
+    @action(detail=False, methods=['post'], permission_classes=[IsAuthenticated])
+    def bulk(self, request):
+        """Create a list of tickets at once, e.g. when importing them from another tool."""
+        if not isinstance(request.data, list) or not 0 < len(request.data) <= settings.TICKET_BULK_CREATE_LIMIT:
+            return Response(
+                {'error': f'Send a list of 1 to {settings.TICKET_BULK_CREATE_LIMIT} tickets'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        serializer = TicketCreateSerializer(data=request.data, many=True, context={'request': request})
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        with transaction.atomic():
+            tickets = serializer.save()
+        logger.info(f"Bulk created {len(tickets)} tickets for {request.user.email}")
+        return Response(
+            [
+                {'id': ticket.id, 'title': ticket.title, 'category': ticket.category, 'priority': ticket.priority,
+                 'triage': triage}
+                for ticket, triage in zip(tickets, serializer.triage)
+            ],
+            status=status.HTTP_201_CREATED
+        )
+
+    @action(detail=True, methods=['get'], permission_classes=[IsAuthenticated])
+    def timeline(self, request, pk=None):
+        """Chronological history of a ticket, keyset paginated."""
+        ticket = get_object_or_404(self.get_visible_queryset().only('id'), pk=pk)
+
+        # Served from the (ticket, created_at) index
+        events = TicketEvent.objects.filter(ticket=ticket).select_related('actor').order_by('created_at', 'id')
+        # Non-admin users do not see internal comments or SLA bookkeeping
+        if not (request.user.is_staff or request.user.is_superuser):
+            events = events.filter(is_internal=False)
+
+        paginator = TicketEventPagination()
+        page = paginator.paginate_queryset(events, request, view=self)
+        serializer = TicketEventSerializer(page, many=True, context={'request': request})
+        return paginator.get_paginated_response(serializer.data)
+
     @action(detail=True, methods=['patch'], permission_classes=[IsAuthenticated])
     def update_status(self, request, pk=None):
         """Update ticket status (admin only)."""
@@ -175,16 +378,8 @@ class TicketViewSet(ModelViewSet):
     @action(detail=False, methods=['get'], permission_classes=[IsAuthenticated])
     def my_tickets(self, request):
         """Get current user's tickets."""
-        queryset = self.get_queryset().filter(user=request.user)
-        
-        # Apply filters
-        page = self.paginate_queryset(queryset)
-        if page is not None:
-            serializer = TicketListSerializer(page, many=True, context={'request': request})
-            return self.get_paginated_response(serializer.data)
-        
-        serializer = TicketListSerializer(queryset, many=True, context={'request': request})
-        return Response(serializer.data)
+        queryset = self.filter_queryset(self.get_visible_queryset().filter(user=request.user))
+        return self.list_response(request, queryset)
     
     @action(detail=False, methods=['get'], permission_classes=[IsAuthenticated])
     def assigned_to_me(self, request):
@@ -195,17 +390,89 @@ class TicketViewSet(ModelViewSet):
                 status=status.HTTP_403_FORBIDDEN
             )
         
-        queryset = self.get_queryset().filter(assigned_to=request.user)
-        
-        # Apply filters
-        page = self.paginate_queryset(queryset)
-        if page is not None:
-            serializer = TicketListSerializer(page, many=True, context={'request': request})
-            return self.get_paginated_response(serializer.data)
-        
-        serializer = TicketListSerializer(queryset, many=True, context={'request': request})
-        return Response(serializer.data)
+        queryset = self.filter_queryset(self.get_visible_queryset().filter(assigned_to=request.user))
+        return self.list_response(request, queryset)
     
+    @action(detail=False, methods=['get'], permission_classes=[IsAuthenticated])
+    def queue(self, request):
+        """Open tickets, least recently active first, for working through the backlog (admin only)."""
+        if not (request.user.is_staff or request.user.is_superuser):
+            return Response(
+                {'error': 'Only admins can access the ticket queue'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+
+        queryset = self.filter_queryset(self.get_visible_queryset().filter(status__in=Ticket.OPEN_STATUSES))
+        if 'ordering' not in request.query_params:
+            # Served from the partial (last_activity_at, id) index over open tickets
+            queryset = queryset.order_by('last_activity_at', 'id')
+        return self.list_response(request, queryset)
+
+    @action(detail=False, methods=['get'], permission_classes=[IsAuthenticated])
+    def changes(self, request):
+        """Tickets and comments created, updated or deleted since the ``since`` cursor."""
+        try:
+            since = decode_cursor(request.query_params.get('since'))
+        except ValueError:
+            logger.warning(f"Invalid changes cursor from {request.user.email}")
+            return Response(
+                {'error': 'Invalid cursor'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        context = self.get_serializer_context()
+        payload = get_changes(
+            request.user, since, self.decorate_queryset(self.get_visible_queryset()),
+            TicketListValuesSerializer(context=context), TicketCommentValuesSerializer(context=context)
+        )
+        return Response(payload)
+
+    @action(detail=False, methods=['get'], permission_classes=[IsAuthenticated])
+    def search(self, request):
+        """Ranked full-text search over tickets and their public comments."""
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            return Response(
+                {'error': 'Search query parameter "q" is required'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            limit = int(request.query_params.get('limit', self.search_result_limit))
+        except ValueError:
+            limit = self.search_result_limit
+        limit = max(1, min(limit, self.max_search_result_limit))
+
+        # get_queryset() applies the same owner/admin visibility as the list
+        results = list(search_tickets(self.get_queryset(), query)[:limit])
+        serializer = self.get_serializer(results, many=True)
+        if len(results) == limit:
+            return Response(serializer.data)
+
+        # Fewer current matches than asked for: fill up from the archive, ranked after them
+        archived = visible_archived_tickets(request.user).select_related(
+            'user', 'assigned_to', 'last_public_comment_author'
+        )
+        status_filter = request.query_params.get('status')
+        if status_filter:
+            archived = archived.filter(status=status_filter)
+        archived = search_tickets(archived, query)[:limit - len(results)]
+        archived_serializer = ArchivedTicketSearchResultSerializer(
+            archived, many=True, context=self.get_serializer_context()
+        )
+        return Response(serializer.data + archived_serializer.data)
+
+    @action(detail=False, methods=['get'], permission_classes=[IsAuthenticated])
+    def typeahead(self, request):
+        """Prefix and fuzzy title matches for search-as-you-type."""
+        text, limit = parse_typeahead_params(request.query_params)
+        if text is None:
+            return Response([])
+
+        queryset = self.get_visible_queryset()
+        results = typeahead(queryset, text, ['title'], limit).values('id', 'title', 'status', 'priority')
+        return Response(list(results))
+
     @action(detail=False, methods=['get'], permission_classes=[IsAuthenticated])
     def stats(self, request):
         """Get ticket statistics."""
@@ -215,38 +482,70 @@ class TicketViewSet(ModelViewSet):
                 status=status.HTTP_403_FORBIDDEN
             )
         
-        queryset = self.get_queryset()
-        
-        stats = {
-            'total': queryset.count(),
-            'open': queryset.filter(status='open').count(),
-            'in_progress': queryset.filter(status='in_progress').count(),
-            'pending_user': queryset.filter(status='pending_user').count(),
-            'resolved': queryset.filter(status='resolved').count(),
-            'closed': queryset.filter(status='closed').count(),
-            'by_priority': {
-                'low': queryset.filter(priority='low').count(),
-                'medium': queryset.filter(priority='medium').count(),
-                'high': queryset.filter(priority='high').count(),
-                'urgent': queryset.filter(priority='urgent').count(),
-            },
-            'by_category': {
-                'bug': queryset.filter(category='bug').count(),
-                'feature': queryset.filter(category='feature').count(),
-                'support': queryset.filter(category='support').count(),
-                'billing': queryset.filter(category='billing').count(),
-                'other': queryset.filter(category='other').count(),
-            }
-        }
+        filter_serializer = TicketStatsFilterSerializer(data=request.query_params)
+        if not filter_serializer.is_valid():
+            return Response(filter_serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        filters = {key: value for key, value in filter_serializer.validated_data.items() if value}
+        if filters:
+            stats = get_ticket_stats(filters)
+        else:
+            # Unfiltered stats come straight from the counter table
+            stats = get_global_stats()
         
         return Response(stats)
 
+    @action(detail=False, methods=['get'], permission_classes=[IsAuthenticated])
+    def analytics(self, request):
+        """Created, resolved and closed counts, backlog and resolution times over time (admin only)."""
+        if not (request.user.is_staff or request.user.is_superuser):
+            return Response(
+                {'error': 'Only admins can access ticket analytics'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+
+        filter_serializer = TicketAnalyticsFilterSerializer(data=request.query_params)
+        if not filter_serializer.is_valid():
+            return Response(filter_serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        params = filter_serializer.validated_data
+        # Read from the daily rollups the refresh_ticket_rollups task maintains
+        series = get_rollup_series(params['start'], params['end'], params['interval'], params['dimension'])
+        return Response({
+            'interval': params['interval'],
+            'dimension': params['dimension'],
+            'start': params['start'],
+            'end': params['end'],
+            'results': series,
+        })
 
-class TicketCommentViewSet(ModelViewSet):
+    @action(detail=False, methods=['get'], permission_classes=[IsAuthenticated], url_path='analytics/resolution')
+    def resolution_analytics(self, request):
+        """Resolution time percentiles and histogram, weekly cohorts and agent throughput (admin only)."""
+        if not (request.user.is_staff or request.user.is_superuser):
+            return Response(
+                {'error': 'Only admins can access ticket analytics'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+
+        params_serializer = TicketResolutionReportSerializer(data=request.query_params)
+        if not params_serializer.is_valid():
+            return Response(params_serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(get_report(**params_serializer.validated_data))
+
+    @action(detail=False, methods=['get'], permission_classes=[IsAuthenticated])
+    def my_summary(self, request):
+        """Get per-status counts of the current user's own and assigned tickets."""
+        return Response(get_user_summary(request.user))
+
+
+class TicketCommentViewSet(ActorMixin, ValuesListMixin, ModelViewSet):
     """ViewSet for managing ticket comments."""
     
     serializer_class = TicketCommentSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = TicketCommentPagination
     
     def get_queryset(self):
         """Return comments based on user permissions."""
@@ -261,6 +560,22 @@ class TicketCommentViewSet(ModelViewSet):
         
         return queryset.select_related('author', 'ticket').order_by('created_at')
     
+    def list(self, request, *args, **kwargs):
+        """List comments through the values() read path, optionally bounded by creation time."""
+        filter_serializer = TicketCommentFilterSerializer(data=request.query_params)
+        if not filter_serializer.is_valid():
+            return Response(filter_serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        # Bounds on created_at let PostgreSQL skip the monthly partitions outside them
+        created_after = filter_serializer.validated_data.get('created_after')
+        if created_after:
+            queryset = queryset.filter(created_at__gte=created_after)
+        created_before = filter_serializer.validated_data.get('created_before')
+        if created_before:
+            queryset = queryset.filter(created_at__lt=created_before)
+        return self.values_response(queryset, TicketCommentValuesSerializer)
+
     def create(self, request, *args, **kwargs):
         """Create a new comment."""
         ticket_id = kwargs.get('ticket_pk')
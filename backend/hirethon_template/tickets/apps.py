@@ -5,3 +5,6 @@ class TicketsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'hirethon_template.tickets'
     verbose_name = 'Support Tickets'
+
+    def ready(self):
+        import hirethon_template.tickets.signals  # noqa: F401
@@ -0,0 +1,162 @@
+import logging
+from collections import Counter
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Max, Min
+from django.utils import timezone
+
+from hirethon_template.tickets.activity import refresh_comment_activity
+from hirethon_template.tickets.counters import apply_deltas, ticket_change_deltas
+from hirethon_template.tickets.dedup import index_tickets
+from hirethon_template.tickets.history import current_actor_id, record_events
+from hirethon_template.tickets.models import (
+    ArchivedTicket,
+    ArchivedTicketComment,
+    Ticket,
+    TicketComment,
+    TicketEvent,
+    TicketFingerprint,
+)
+from hirethon_template.tickets.partitions import ensure_comment_months
+
+logger = logging.getLogger(__name__)
+
+# Tickets moved per transaction
+BATCH_SIZE = 500
+ARCHIVED_STATUS = 'closed'
+
+
+def _columns(fields):
+    return ', '.join(connection.ops.quote_name(field) for field in fields)
+
+
+def _move_rows(ticket_ids, archived_at):
+    """Copy tickets and their comments into the archive tables, then delete them from the hot ones."""
+    tickets, comments = _columns(ArchivedTicket.COPIED_FIELDS), _columns(ArchivedTicketComment.COPIED_FIELDS)
+    with connection.cursor() as cursor:
+        # ON CONFLICT keeps a rerun harmless should rows ever be left in both tables
+        cursor.execute(
+            f"INSERT INTO {ArchivedTicket._meta.db_table} ({tickets}, archived_at) "
+            f"SELECT {tickets}, %s FROM {Ticket._meta.db_table} WHERE id = ANY(%s) ON CONFLICT (id) DO NOTHING",
+            [archived_at, ticket_ids],
+        )
+        cursor.execute(
+            f"INSERT INTO {ArchivedTicketComment._meta.db_table} ({comments}) "
+            f"SELECT {comments} FROM {TicketComment._meta.db_table} WHERE ticket_id = ANY(%s) "
+            f"ON CONFLICT (id) DO NOTHING",
+            [ticket_ids],
+        )
+        # Plain DELETEs: the ticket is moving, not going away, so no delete signal,
+        # tombstone or event stream message must see it
+        for model in (TicketFingerprint, TicketComment):
+            cursor.execute(f"DELETE FROM {model._meta.db_table} WHERE ticket_id = ANY(%s)", [ticket_ids])
+        cursor.execute(f"DELETE FROM {Ticket._meta.db_table} WHERE id = ANY(%s)", [ticket_ids])
+
+
+def archive_closed_tickets(now=None, batch_size=BATCH_SIZE):
+    """
+    Move tickets closed for ``TICKET_ARCHIVE_AFTER_DAYS`` and their comments to the archive tables.
+
+    Each batch locks its tickets (skipping rows other writers hold) and moves
+    them in its own transaction, taking them out of the counters and recording
+    an internal ``archived`` event. A moved ticket no longer matches, so a run
+    that dies mid-way leaves its committed batches done and the next run
+    resumes where it stopped. Returns the number of tickets archived.
+    """
+    now = now or timezone.now()
+    cutoff = now - timedelta(days=settings.TICKET_ARCHIVE_AFTER_DAYS)
+    candidates = Ticket.objects.filter(status=ARCHIVED_STATUS, status_changed_at__lt=cutoff).order_by('pk')
+    archived = 0
+    while True:
+        with transaction.atomic():
+            batch = list(
+                candidates.select_for_update(skip_locked=True).values('id', *Ticket.COUNTER_FIELDS)[:batch_size]
+            )
+            if not batch:
+                break
+
+            ticket_ids = [row['id'] for row in batch]
+            _move_rows(ticket_ids, now)
+            deltas = Counter()
+            for row in batch:
+                ticket_change_deltas(row, None, deltas)
+            apply_deltas(deltas)
+            record_events([
+                TicketEvent(ticket_id=ticket_id, kind=TicketEvent.ARCHIVED, is_internal=True, created_at=now)
+                for ticket_id in ticket_ids
+            ])
+
+        archived += len(batch)
+        logger.debug(f"Archived batch of {len(batch)} tickets ({archived} so far)")
+    if archived:
+        logger.info(f"Archived {archived} tickets closed before {cutoff.isoformat()}")
+    return archived
+
+
+def restore_tickets(ticket_ids):
+    """Move archived tickets and their comments back to the ticket tables; returns the number restored."""
+    now = timezone.now()
+    tickets, comments = _columns(ArchivedTicket.COPIED_FIELDS), _columns(ArchivedTicketComment.COPIED_FIELDS)
+    with transaction.atomic():
+        rows = list(
+            ArchivedTicket.objects.select_for_update().filter(pk__in=ticket_ids)
+            .values('id', 'title', 'description', *Ticket.COUNTER_FIELDS)
+        )
+        ticket_ids = [row['id'] for row in rows]
+        if not ticket_ids:
+            return 0
+
+        span = ArchivedTicketComment.objects.filter(ticket_id__in=ticket_ids).aggregate(
+            first=Min('created_at'), last=Max('created_at')
+        )
+        if span['first'] is not None:
+            # A comment whose month has no partition cannot be inserted back
+            ensure_comment_months(span['first'], span['last'])
+        with connection.cursor() as cursor:
+            # Columns the archive does not keep start over; the activity ones are recomputed below
+            cursor.execute(
+                f"INSERT INTO {Ticket._meta.db_table} ({tickets}, last_activity_at, sla_paused_seconds) "
+                f"SELECT {tickets}, %s, 0 FROM {ArchivedTicket._meta.db_table} WHERE id = ANY(%s)",
+                [now, ticket_ids],
+            )
+            cursor.execute(
+                f"INSERT INTO {TicketComment._meta.db_table} ({comments}) "
+                f"SELECT {comments} FROM {ArchivedTicketComment._meta.db_table} WHERE ticket_id = ANY(%s)",
+                [ticket_ids],
+            )
+        ArchivedTicket.objects.filter(pk__in=ticket_ids).delete()
+        refresh_comment_activity(ticket_ids)
+        index_tickets([(row['id'], row['title'], row['description']) for row in rows])
+
+        deltas = Counter()
+        for row in rows:
+            ticket_change_deltas(None, row, deltas)
+        apply_deltas(deltas)
+        record_events([
+            TicketEvent(
+                ticket_id=ticket_id, kind=TicketEvent.RESTORED, actor_id=current_actor_id(), is_internal=True,
+                created_at=now
+            )
+            for ticket_id in ticket_ids
+        ])
+    logger.info(f"Restored archived tickets {ticket_ids}")
+    return len(ticket_ids)
+
+
+def archived_ticket(user, pk):
+    """The archived ticket ``pk`` if ``user`` may see it (owner or admin), else None."""
+    tickets = ArchivedTicket.objects.select_related('user', 'assigned_to')
+    if not (user.is_staff or user.is_superuser):
+        tickets = tickets.filter(user=user)
+    try:
+        return tickets.filter(pk=pk).first()
+    except (TypeError, ValueError):
+        return None
+
+
+def visible_archived_tickets(user):
+    if user.is_staff or user.is_superuser:
+        return ArchivedTicket.objects.all()
+    return ArchivedTicket.objects.filter(user=user)
@@ -0,0 +1,152 @@
+import heapq
+import logging
+from collections import defaultdict
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Sum
+
+from hirethon_template.tickets.counters import ASSIGNEE
+from hirethon_template.tickets.models import SupportAgent, Ticket, TicketCounter
+
+logger = logging.getLogger(__name__)
+User = get_user_model()
+
+ALL_CATEGORIES = [value for value, _label in Ticket.CATEGORY_CHOICES]
+
+
+class AgentHeap:
+    """
+    Per-category min-heaps of ``(open tickets, user id)`` over the eligible agents.
+
+    An agent sits in the heap of every category it handles. Assigning a ticket
+    pushes a fresh entry with the new load instead of re-sorting; outdated
+    entries are skipped when they reach the top. Picking an agent for a whole
+    batch of tickets therefore costs ``O(log n)`` per ticket and no queries.
+    """
+
+    def __init__(self, agents, loads):
+        self.loads = {}
+        self.capacity = {}
+        self.categories = {}
+        self.heaps = defaultdict(list)
+        for agent in agents:
+            user_id = agent.user_id
+            self.loads[user_id] = loads.get(user_id, 0)
+            self.capacity[user_id] = agent.max_open_tickets
+            self.categories[user_id] = agent.categories or ALL_CATEGORIES
+            for category in self.categories[user_id]:
+                self.heaps[category].append((self.loads[user_id], user_id))
+        for heap in self.heaps.values():
+            heapq.heapify(heap)
+
+    def pick(self, category):
+        """Return the least loaded agent with spare capacity for ``category``, or None."""
+        heap = self.heaps.get(category)
+        while heap:
+            load, user_id = heap[0]
+            capacity = self.capacity[user_id]
+            # Loads only grow within a batch, so stale and full entries can be dropped for good
+            if load != self.loads[user_id] or (capacity is not None and load >= capacity):
+                heapq.heappop(heap)
+                continue
+            return user_id
+        return None
+
+    def assign(self, user_id):
+        self.loads[user_id] += 1
+        for category in self.categories[user_id]:
+            heapq.heappush(self.heaps[category], (self.loads[user_id], user_id))
+
+
+def open_ticket_loads(user_ids):
+    """Open tickets per assignee, read from the assignee counters rather than the ticket table."""
+    rows = (
+        TicketCounter.objects.filter(
+            scope=ASSIGNEE, scope_id__in=user_ids, dimension="status", value__in=Ticket.OPEN_STATUSES
+        )
+        .values("scope_id")
+        .annotate(total=Sum("count"))
+    )
+    return {row["scope_id"]: row["total"] for row in rows}
+
+
+def build_agent_heap(exclude=()):
+    """
+    Lock the available agents and load them into an ``AgentHeap``.
+
+    The agent rows stay locked until the surrounding transaction ends, so
+    concurrent assignment runs are serialized and each one reads the loads
+    the previous one committed. Must be called inside a transaction.
+    """
+    agents = list(
+        SupportAgent.objects.select_for_update(of=("self",))
+        .filter(is_available=True, user__is_active=True, user__is_staff=True)
+        .exclude(user_id__in=exclude)
+        .order_by("pk")
+    )
+    return AgentHeap(agents, open_ticket_loads([agent.user_id for agent in agents]))
+
+
+def assign_tickets(tickets, heap):
+    """Assign each ticket to the agent ``heap`` picks; returns the number of tickets assigned."""
+    assigned = 0
+    for ticket in tickets:
+        user_id = heap.pick(ticket.category)
+        if user_id is None:
+            logger.info(f"No agent available for ticket {ticket.id} ({ticket.category})")
+            continue
+        heap.assign(user_id)
+        ticket.assigned_to_id = user_id
+        # save() keeps the counters, search vector and events in step
+        ticket.save()
+        assigned += 1
+    return assigned
+
+
+def auto_assign(ticket_ids=None):
+    """Assign the given open, unassigned tickets (or all of them), oldest first."""
+    with transaction.atomic():
+        heap = build_agent_heap()
+        tickets = Ticket.objects.filter(assigned_to__isnull=True, status__in=Ticket.OPEN_STATUSES)
+        if ticket_ids is not None:
+            tickets = tickets.filter(pk__in=ticket_ids)
+        tickets = tickets.select_for_update(skip_locked=True).order_by("created_at", "id")
+        assigned = assign_tickets(tickets, heap)
+
+    if assigned:
+        logger.info(f"Auto-assigned {assigned} tickets")
+    return assigned
+
+
+def rebalance_agent(user_id):
+    """
+    Hand the open tickets of an agent who left the pool to the remaining agents.
+
+    Tickets no one else can take are unassigned so the next auto-assignment
+    run picks them up. Returns ``(reassigned, unassigned)``.
+    """
+    with transaction.atomic():
+        heap = build_agent_heap(exclude=[user_id])
+        # Only the tickets of a deactivated or unavailable agent move
+        still_active = User.objects.filter(pk=user_id, is_active=True, is_staff=True).exclude(
+            support_agent__is_available=False
+        )
+        if still_active.exists():
+            return 0, 0
+
+        tickets = list(
+            Ticket.objects.select_for_update()
+            .filter(assigned_to_id=user_id, status__in=Ticket.OPEN_STATUSES)
+            .order_by("created_at", "id")
+        )
+        reassigned = assign_tickets(tickets, heap)
+        unassigned = 0
+        for ticket in tickets:
+            if ticket.assigned_to_id == user_id:
+                ticket.assigned_to = None
+                ticket.save()
+                unassigned += 1
+
+    logger.info(f"Rebalanced tickets of user {user_id}: {reassigned} reassigned, {unassigned} unassigned")
+    return reassigned, unassigned
@@ -0,0 +1,119 @@
+import logging
+from collections import Counter
+from datetime import timedelta
+from functools import partial
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from hirethon_template.tickets.counters import apply_deltas, ticket_change_deltas
+from hirethon_template.tickets.events import publish_ticket_saved
+from hirethon_template.tickets.history import change_events, record_events
+from hirethon_template.tickets.models import Ticket
+from hirethon_template.tickets.related import INDEXED_STATUSES, add_tickets
+from hirethon_template.tickets.sla import LOCKED_STATE_FIELDS, apply_sla
+
+logger = logging.getLogger(__name__)
+
+# Tickets locked and rewritten per transaction
+BATCH_SIZE = 500
+NEXT_PRIORITY = {'low': 'medium', 'medium': 'high', 'high': 'urgent'}
+ESCALATED_STATUSES = ('open', 'in_progress')
+# Everything a batch reads to rewrite a ticket, recount it and recompute its SLA
+BATCH_FIELDS = (
+    'id', 'status', 'priority', 'category', 'user', 'assigned_to', 'created_at', 'updated_at',
+    'status_changed_at', 'escalated_at', 'sla_policy', 'first_response_due_at', 'resolution_due_at',
+    *LOCKED_STATE_FIELDS,
+)
+
+
+def process_in_batches(candidates, change, fields, batch_size=BATCH_SIZE):
+    """
+    Apply ``change(ticket, now)`` to every ticket in ``candidates``, one bounded batch per transaction.
+
+    Each batch locks its rows (skipping rows other writers hold), rewrites them
+    with a single ``bulk_update``, applies the counter deltas of the whole
+    batch in one upsert and records its history in one INSERT, so nothing goes
+    through the per-row ``Ticket.save()``. Tickets it resolves or closes are
+    added to the related tickets index once the batch commits.
+    ``change`` must make a ticket stop matching ``candidates``; that makes a run
+    resumable, since a run that dies mid-way leaves its committed batches done
+    and the next run picks up whatever still matches.
+    """
+    processed = 0
+    policies = {}
+    while True:
+        with transaction.atomic():
+            batch = list(candidates.select_for_update(skip_locked=True).only(*BATCH_FIELDS)[:batch_size])
+            if not batch:
+                break
+
+            now = timezone.now()
+            deltas = Counter()
+            events = []
+            indexed = []
+            for ticket in batch:
+                old_state = {
+                    field: getattr(ticket, field) for field in (*Ticket.COUNTER_FIELDS, *LOCKED_STATE_FIELDS)
+                }
+                change(ticket, now)
+                apply_sla(ticket, old_state, now, policies)
+                ticket.updated_at = now
+                new_state = ticket.counter_state()
+                ticket_change_deltas(old_state, new_state, deltas)
+                events += change_events(ticket.pk, old_state, new_state, now)
+                if new_state['status'] in INDEXED_STATUSES and old_state['status'] not in INDEXED_STATUSES:
+                    indexed.append(ticket.pk)
+                publish_ticket_saved(ticket, created=False)
+
+            Ticket.objects.bulk_update(batch, [*fields, 'updated_at', *Ticket.SLA_FIELDS])
+            apply_deltas(deltas)
+            record_events(events)
+            if indexed:
+                transaction.on_commit(partial(add_tickets, indexed), robust=True)
+
+        processed += len(batch)
+        logger.debug(f"Processed batch of {len(batch)} tickets ({processed} so far)")
+    return processed
+
+
+def escalate_idle_tickets(now=None, batch_size=BATCH_SIZE):
+    """Raise the priority of running tickets idle for ``TICKET_ESCALATION_IDLE_HOURS`` by one step."""
+    cutoff = (now or timezone.now()) - timedelta(hours=settings.TICKET_ESCALATION_IDLE_HOURS)
+    # Read through the partial (last_activity_at, id) index over open tickets; a ticket
+    # escalates again only after another idle period
+    candidates = (
+        Ticket.objects.filter(
+            status__in=ESCALATED_STATUSES,
+            last_activity_at__lt=cutoff,
+            priority__in=NEXT_PRIORITY,
+        )
+        .filter(Q(escalated_at__isnull=True) | Q(escalated_at__lt=cutoff))
+        .order_by('last_activity_at', 'id')
+    )
+
+    def escalate(ticket, at):
+        ticket.priority = NEXT_PRIORITY[ticket.priority]
+        ticket.escalated_at = at
+
+    escalated = process_in_batches(candidates, escalate, ['priority', 'escalated_at'], batch_size)
+    logger.info(f"Escalated {escalated} tickets idle since {cutoff.isoformat()}")
+    return escalated
+
+
+def close_abandoned_tickets(now=None, batch_size=BATCH_SIZE):
+    """Close tickets left in ``pending_user`` for ``TICKET_AUTO_CLOSE_PENDING_DAYS``."""
+    cutoff = (now or timezone.now()) - timedelta(days=settings.TICKET_AUTO_CLOSE_PENDING_DAYS)
+    candidates = Ticket.objects.filter(status='pending_user', status_changed_at__lt=cutoff).order_by(
+        'status_changed_at', 'id'
+    )
+
+    def close(ticket, at):
+        ticket.status = 'closed'
+        ticket.status_changed_at = at
+
+    closed = process_in_batches(candidates, close, ['status', 'status_changed_at'], batch_size)
+    logger.info(f"Closed {closed} tickets pending on the user since {cutoff.isoformat()}")
+    return closed
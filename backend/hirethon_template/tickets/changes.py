@@ -0,0 +1,93 @@
+import json
+from base64 import b64decode, b64encode
+from binascii import Error as BinasciiError
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from hirethon_template.tickets.models import TicketComment, TicketTombstone
+
+# Rows are stamped before their transaction commits, so a row can become visible
+# after a sync that started later than its updated_at. Every sync re-reads this
+# much history before the cursor; clients apply changes idempotently by id.
+SYNC_OVERLAP = timedelta(seconds=30)
+# Larger deltas are cheaper to replace with a full reload of the lists
+MAX_CHANGES = 500
+
+
+def encode_cursor(moment):
+    payload = json.dumps({"t": moment.isoformat()}, separators=(",", ":"))
+    return b64encode(payload.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(encoded):
+    """Return the high-water mark in a cursor, or None for a full sync. Raises ValueError if malformed."""
+    if not encoded:
+        return None
+    try:
+        moment = parse_datetime(json.loads(b64decode(encoded.encode("ascii")).decode("utf-8"))["t"])
+    except (BinasciiError, KeyError, TypeError, UnicodeError, ValueError):
+        raise ValueError("Invalid cursor")
+    if moment is None or timezone.is_naive(moment):
+        raise ValueError("Invalid cursor")
+    return moment
+
+
+def get_changes(user, since, tickets, ticket_serializer, comment_serializer):
+    """
+    Return the sync payload for ``tickets`` (already limited to what ``user`` may see) since a cursor.
+
+    ``tickets`` and ``comments`` hold the rendered rows created or updated
+    after ``since`` (everything when it is None), and ``deleted`` the ids of
+    tickets and comments removed since. Comments that became internal are
+    reported as deleted to non-admins. ``reset`` tells the client to reload
+    its lists instead: the cursor predates the tombstone retention window, or
+    there are more than ``MAX_CHANGES`` changes of one kind.
+    """
+    # Taken before reading, so anything committed meanwhile is in the next sync
+    now = timezone.now()
+    payload = {"cursor": encode_cursor(now), "reset": False, "tickets": [], "comments": [],
+               "deleted": {"tickets": [], "comments": []}}
+    if since is not None and since < now - timedelta(days=settings.TICKET_TOMBSTONE_RETENTION_DAYS):
+        payload["reset"] = True
+        return payload
+
+    is_admin = user.is_staff or user.is_superuser
+    comments = TicketComment.objects.filter(ticket_id__in=tickets.order_by().values("id"))
+    if not is_admin:
+        comments = comments.filter(is_internal=False)
+
+    deleted_tickets, deleted_comments = [], []
+    if since is not None:
+        after = since - SYNC_OVERLAP
+        tickets = tickets.filter(updated_at__gt=after)
+        comments = comments.filter(updated_at__gt=after)
+
+        tombstones = TicketTombstone.objects.filter(deleted_at__gt=after)
+        if not is_admin:
+            tombstones = tombstones.filter(owner_id=user.id, is_internal=False)
+            deleted_comments.extend(
+                TicketComment.objects.filter(
+                    ticket__user=user, is_internal=True, updated_at__gt=after
+                ).values_list("id", flat=True)[:MAX_CHANGES + 1]
+            )
+        for object_type, object_id in tombstones.order_by("deleted_at").values_list("object_type", "object_id")[
+            :MAX_CHANGES + 1
+        ]:
+            (deleted_tickets if object_type == TicketTombstone.TICKET else deleted_comments).append(object_id)
+
+    ticket_rows = list(tickets.order_by("updated_at", "id").values(*ticket_serializer.value_keys)[:MAX_CHANGES + 1])
+    comment_rows = list(
+        comments.order_by("updated_at", "id").values("ticket_id", *comment_serializer.value_keys)[:MAX_CHANGES + 1]
+    )
+    if any(len(rows) > MAX_CHANGES for rows in (ticket_rows, comment_rows, deleted_tickets, deleted_comments)):
+        payload["reset"] = True
+        return payload
+
+    payload["tickets"] = ticket_serializer.serialize(ticket_rows)
+    comments = comment_serializer.serialize(comment_rows)
+    payload["comments"] = [{**comment, "ticket": row["ticket_id"]} for comment, row in zip(comments, comment_rows)]
+    payload["deleted"] = {"tickets": deleted_tickets, "comments": deleted_comments}
+    return payload
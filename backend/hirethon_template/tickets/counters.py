@@ -0,0 +1,166 @@
+import logging
+from collections import Counter
+
+from django.db import connection, transaction
+from django.db.models import Count
+
+from hirethon_template.tickets.models import Ticket, TicketCounter
+
+logger = logging.getLogger(__name__)
+
+GLOBAL = 'global'
+REQUESTER = 'requester'
+ASSIGNEE = 'assignee'
+
+
+def counter_keys(state):
+    """Return the (scope, scope_id, dimension, value) rows a ticket in ``state`` counts towards."""
+    status = state['status']
+    keys = [
+        (GLOBAL, 0, 'status', status),
+        (GLOBAL, 0, 'priority', state['priority']),
+        (GLOBAL, 0, 'category', state['category']),
+        (GLOBAL, 0, 'status_priority', f"{status}:{state['priority']}"),
+        (REQUESTER, state['user_id'], 'status', status),
+    ]
+    if state['assigned_to_id']:
+        keys.append((ASSIGNEE, state['assigned_to_id'], 'status', status))
+    return keys
+
+
+def ticket_change_deltas(old_state, new_state, deltas=None):
+    """Add the counter deltas for a ticket moving from ``old_state`` to ``new_state`` to ``deltas``."""
+    deltas = Counter() if deltas is None else deltas
+    if old_state:
+        deltas.subtract(counter_keys(old_state))
+    if new_state:
+        deltas.update(counter_keys(new_state))
+    return deltas
+
+
+def apply_ticket_change(old_state, new_state):
+    """Apply the counter deltas for a ticket moving from ``old_state`` to ``new_state``.
+
+    Either state may be ``None`` for a created or deleted ticket. Must be called
+    inside the transaction that writes the ticket.
+    """
+    apply_deltas(ticket_change_deltas(old_state, new_state))
+
+
+def apply_deltas(deltas):
+    """Upsert counter rows, adding each delta to the stored count."""
+    rows = sorted((key, delta) for key, delta in deltas.items() if delta)
+    if not rows:
+        return
+
+    table = TicketCounter._meta.db_table
+    placeholders = ', '.join(['(%s, %s, %s, %s, %s)'] * len(rows))
+    params = [value for key, delta in rows for value in (*key, delta)]
+    # Rows are sorted so concurrent writers always lock them in the same order.
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {table} (scope, scope_id, dimension, value, count) VALUES {placeholders} "
+            f"ON CONFLICT (scope, scope_id, dimension, value) "
+            f"DO UPDATE SET count = {table}.count + EXCLUDED.count",
+            params,
+        )
+
+
+def expected_counts():
+    """Compute every counter value from scratch by scanning the ticket table."""
+    counts = Counter()
+    tickets = Ticket.objects.order_by()
+
+    for dimension in ('status', 'priority', 'category'):
+        for row in tickets.values(dimension).annotate(total=Count('id')):
+            counts[(GLOBAL, 0, dimension, row[dimension])] = row['total']
+    for row in tickets.values('status', 'priority').annotate(total=Count('id')):
+        counts[(GLOBAL, 0, 'status_priority', f"{row['status']}:{row['priority']}")] = row['total']
+    for row in tickets.values('user_id', 'status').annotate(total=Count('id')):
+        counts[(REQUESTER, row['user_id'], 'status', row['status'])] = row['total']
+    assigned = tickets.filter(assigned_to__isnull=False)
+    for row in assigned.values('assigned_to_id', 'status').annotate(total=Count('id')):
+        counts[(ASSIGNEE, row['assigned_to_id'], 'status', row['status'])] = row['total']
+    return counts
+
+
+def stored_counts():
+    return Counter({
+        (row.scope, row.scope_id, row.dimension, row.value): row.count
+        for row in TicketCounter.objects.all()
+    })
+
+
+def reconcile_counters(dry_run=False):
+    """
+    Rebuild the counter table from the ticket table and return the drift found.
+
+    The counter table is locked for the duration of the rebuild, so ticket
+    writes that land meanwhile apply their deltas on top of the rebuilt counts.
+    Returns a list of ``(key, stored, expected)`` tuples.
+    """
+    with transaction.atomic():
+        if not dry_run:
+            with connection.cursor() as cursor:
+                cursor.execute(f"LOCK TABLE {TicketCounter._meta.db_table} IN EXCLUSIVE MODE")
+
+        stored = stored_counts()
+        expected = expected_counts()
+        drift = [
+            (key, stored.get(key, 0), expected.get(key, 0))
+            for key in sorted(set(stored) | set(expected))
+            if stored.get(key, 0) != expected.get(key, 0)
+        ]
+
+        if drift and not dry_run:
+            TicketCounter.objects.all().delete()
+            TicketCounter.objects.bulk_create(
+                [
+                    TicketCounter(scope=scope, scope_id=scope_id, dimension=dimension, value=value, count=count)
+                    for (scope, scope_id, dimension, value), count in expected.items()
+                    if count
+                ],
+                batch_size=1000,
+            )
+            logger.warning(f"Ticket counters rebuilt, {len(drift)} rows had drifted")
+
+    return drift
+
+
+def _status_summary(rows):
+    summary = {status: 0 for status, _label in Ticket.STATUS_CHOICES}
+    for row in rows:
+        summary[row.value] = row.count
+    summary['total'] = sum(summary.values())
+    return summary
+
+
+def get_global_stats():
+    """Return the unfiltered ticket statistics from the counter table."""
+    statuses = [value for value, _label in Ticket.STATUS_CHOICES]
+    priorities = [value for value, _label in Ticket.PRIORITY_CHOICES]
+    counts = {
+        (row.dimension, row.value): row.count
+        for row in TicketCounter.objects.filter(scope=GLOBAL, scope_id=0)
+    }
+
+    stats = {'total': sum(counts.get(('status', status), 0) for status in statuses)}
+    stats.update({status: counts.get(('status', status), 0) for status in statuses})
+    stats['by_priority'] = {priority: counts.get(('priority', priority), 0) for priority in priorities}
+    stats['by_category'] = {
+        category: counts.get(('category', category), 0) for category, _label in Ticket.CATEGORY_CHOICES
+    }
+    stats['by_status_priority'] = {
+        status: {priority: counts.get(('status_priority', f"{status}:{priority}"), 0) for priority in priorities}
+        for status in statuses
+    }
+    return stats
+
+
+def get_user_summary(user):
+    """Return per-status counts of the tickets a user filed and, for staff, is assigned."""
+    rows = list(TicketCounter.objects.filter(scope__in=[REQUESTER, ASSIGNEE], scope_id=user.id, dimension='status'))
+    summary = {'requested': _status_summary(row for row in rows if row.scope == REQUESTER)}
+    if user.is_staff or user.is_superuser:
+        summary['assigned'] = _status_summary(row for row in rows if row.scope == ASSIGNEE)
+    return summary
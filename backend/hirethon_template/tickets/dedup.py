@@ -0,0 +1,139 @@
+import hashlib
+import logging
+import re
+import zlib
+
+import numpy as np
+from django.contrib.postgres.fields import ArrayField
+from django.db.models import BigIntegerField, F, Func, IntegerField, Value
+
+from hirethon_template.tickets.models import Ticket, TicketFingerprint
+
+logger = logging.getLogger(__name__)
+
+SHINGLE_SIZE = 5
+NUM_PERM = 128
+# 32 bands of 4 rows: a pair with Jaccard similarity s shares a band with probability
+# 1 - (1 - s**4)**32, i.e. 0.2 at s=0.3, 0.87 at s=0.5 and 0.998 at s=0.7
+BANDS = 32
+ROWS_PER_BAND = NUM_PERM // BANDS
+# Estimated similarity from which a candidate is reported as a duplicate
+DUPLICATE_THRESHOLD = 0.5
+# Candidates scored per lookup, those sharing the most bands first
+MAX_CANDIDATES = 200
+# Longer texts are cut; the start of a ticket carries its gist
+MAX_TEXT_LENGTH = 4000
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64(0xFFFFFFFF)
+# Fixed seed: signatures must match across processes and deploys
+_rng = np.random.default_rng(20261017)
+_PERM_A = _rng.integers(1, 1 << 31, NUM_PERM, dtype=np.uint64)
+_PERM_B = _rng.integers(0, 1 << 31, NUM_PERM, dtype=np.uint64)
+_WHITESPACE = re.compile(r"\s+")
+
+
+class SharedElements(Func):
+    """Number of distinct elements two arrays have in common."""
+
+    template = "cardinality(ARRAY(SELECT unnest(%(expressions)s)))"
+    arg_joiner = ") INTERSECT SELECT unnest("
+    output_field = IntegerField()
+
+
+def ticket_text(title, description):
+    return f"{title}\n{description}"
+
+
+def shingles(text):
+    """Hashes of the character shingles of ``text``, case and whitespace normalized."""
+    text = _WHITESPACE.sub(" ", text.lower()).strip()[:MAX_TEXT_LENGTH]
+    if len(text) <= SHINGLE_SIZE:
+        pieces = {text}
+    else:
+        pieces = {text[index:index + SHINGLE_SIZE] for index in range(len(text) - SHINGLE_SIZE + 1)}
+    return np.fromiter((zlib.crc32(piece.encode()) for piece in pieces), dtype=np.uint64, count=len(pieces))
+
+
+def signature(text):
+    """MinHash signature of ``text``: the minimum of each of ``NUM_PERM`` universal hashes over its shingles."""
+    hashes = shingles(text)
+    # a * h + b stays below 2**64: a and b are under 2**31 and h under 2**32
+    permuted = (np.outer(_PERM_A, hashes) + _PERM_B[:, None]) % _MERSENNE_PRIME & _MAX_HASH
+    return permuted.min(axis=1).astype(np.uint32)
+
+
+def band_keys(signature):
+    """One signed 64-bit key per LSH band, distinct across band positions."""
+    keys = []
+    for band, rows in enumerate(signature.reshape(BANDS, ROWS_PER_BAND)):
+        digest = hashlib.blake2b(rows.tobytes(), digest_size=8, salt=band.to_bytes(2, "little")).digest()
+        keys.append(int.from_bytes(digest, "little", signed=True))
+    return keys
+
+
+def similarity(first, second):
+    """Estimated Jaccard similarity of the texts behind two signatures."""
+    return float(np.count_nonzero(first == second)) / NUM_PERM
+
+
+def fingerprint(ticket_id, title, description):
+    """Build the (unsaved) fingerprint of a ticket."""
+    sig = signature(ticket_text(title, description))
+    return TicketFingerprint(ticket_id=ticket_id, signature=sig.tobytes(), bands=band_keys(sig))
+
+
+def index_tickets(rows):
+    """Upsert the fingerprints of ``(id, title, description)`` rows in one statement."""
+    fingerprints = [fingerprint(*row) for row in rows]
+    TicketFingerprint.objects.bulk_create(
+        fingerprints, update_conflicts=True, unique_fields=["ticket"], update_fields=["signature", "bands"]
+    )
+    return len(fingerprints)
+
+
+def backfill_fingerprints(batch_size=1000, missing_only=True):
+    """Index tickets in primary key batches, by default only those without a fingerprint; returns the count."""
+    tickets = Ticket.objects.all()
+    if missing_only:
+        tickets = tickets.filter(fingerprint__isnull=True)
+    indexed = 0
+    last_id = 0
+    while True:
+        rows = list(
+            tickets.filter(pk__gt=last_id).order_by("pk").values_list("pk", "title", "description")[:batch_size]
+        )
+        if not rows:
+            break
+        indexed += index_tickets(rows)
+        last_id = rows[-1][0]
+        logger.info(f"Fingerprinted tickets up to id {last_id}")
+    return indexed
+
+
+def find_duplicates(title, description, tickets=None, limit=5, threshold=DUPLICATE_THRESHOLD):
+    """
+    Open tickets among ``tickets`` (default: all) that are likely duplicates, as ``(ticket id, similarity)``.
+
+    Candidates are the fingerprints sharing at least one band key, read
+    through the GIN index on ``bands``, so the cost depends on the number of
+    near matches rather than on the size of the table. The ``MAX_CANDIDATES``
+    sharing the most bands, the likeliest to be similar, then have their
+    signatures compared to estimate the similarity. Best matches come first.
+    """
+    sig = signature(ticket_text(title, description))
+    keys = band_keys(sig)
+    open_tickets = (Ticket.objects.all() if tickets is None else tickets).filter(status__in=Ticket.OPEN_STATUSES)
+    candidates = (
+        TicketFingerprint.objects.filter(bands__overlap=keys, ticket__in=open_tickets)
+        .annotate(shared=SharedElements(F("bands"), Value(keys, output_field=ArrayField(BigIntegerField()))))
+        .order_by("-shared", "ticket_id")
+        .values_list("ticket_id", "signature")[:MAX_CANDIDATES]
+    )
+
+    matches = []
+    for ticket_id, stored in candidates:
+        score = similarity(sig, np.frombuffer(stored, dtype=np.uint32))
+        if score >= threshold:
+            matches.append((ticket_id, score))
+    matches.sort(key=lambda match: (-match[1], match[0]))
+    return matches[:limit]
@@ -0,0 +1,162 @@
+import asyncio
+import json
+import logging
+import threading
+from collections import defaultdict
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+
+def ticket_channel(ticket_id, internal=False):
+    """Events about one ticket; internal comment events go to a staff-only channel."""
+    return f"tickets:ticket:{ticket_id}:internal" if internal else f"tickets:ticket:{ticket_id}"
+
+
+def user_channel(user_id):
+    """Events about the tickets a user filed or is assigned."""
+    return f"tickets:user:{user_id}"
+
+
+class MemoryBroker:
+    """
+    In-process fan-out to asyncio subscribers.
+
+    Only reaches streams served by the same process, so it is meant for
+    development and tests; deployments with several workers use Redis.
+    """
+
+    def __init__(self):
+        self._subscribers = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def publish(self, channels, message):
+        with self._lock:
+            subscribers = {subscriber for channel in channels for subscriber in self._subscribers.get(channel, ())}
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, message)
+            except RuntimeError:
+                # The subscriber's event loop is already closed
+                pass
+
+    async def listen(self, channels, timeout):
+        """Yield messages published to ``channels``, or None after ``timeout`` seconds of silence."""
+        subscriber = (asyncio.get_running_loop(), asyncio.Queue())
+        with self._lock:
+            for channel in channels:
+                self._subscribers[channel].add(subscriber)
+        try:
+            while True:
+                try:
+                    yield await asyncio.wait_for(subscriber[1].get(), timeout)
+                except asyncio.TimeoutError:
+                    yield None
+        finally:
+            with self._lock:
+                for channel in channels:
+                    self._subscribers[channel].discard(subscriber)
+                    if not self._subscribers[channel]:
+                        del self._subscribers[channel]
+
+
+class RedisBroker:
+    """Fan-out through Redis pub/sub, reaching streams in every worker process."""
+
+    def __init__(self, url):
+        import redis
+
+        self.url = url
+        self.client = redis.Redis.from_url(url)
+
+    def publish(self, channels, message):
+        with self.client.pipeline(transaction=False) as pipeline:
+            for channel in channels:
+                pipeline.publish(channel, message)
+            pipeline.execute()
+
+    async def listen(self, channels, timeout):
+        """Yield messages published to ``channels``, or None after ``timeout`` seconds of silence."""
+        from redis import asyncio as aioredis
+
+        client = aioredis.Redis.from_url(self.url)
+        pubsub = client.pubsub(ignore_subscribe_messages=True)
+        await pubsub.subscribe(*channels)
+        try:
+            while True:
+                message = await pubsub.get_message(timeout=timeout)
+                yield message["data"].decode("utf-8") if message else None
+        finally:
+            await pubsub.unsubscribe()
+            await pubsub.close()
+            await client.close()
+
+
+@lru_cache(maxsize=None)
+def _broker_for(url):
+    return RedisBroker(url) if url else MemoryBroker()
+
+
+def get_broker():
+    return _broker_for(settings.TICKET_EVENTS_REDIS_URL)
+
+
+def publish(event, ticket_id, recipients, internal=False):
+    """
+    Send ``event`` to the ticket's channel and to ``recipients``' user channels once the transaction commits.
+
+    Nothing is sent if the transaction rolls back. A broker outage is logged
+    but never fails the write that triggered the event.
+    """
+    channels = [ticket_channel(ticket_id, internal)] + [user_channel(user_id) for user_id in sorted(recipients)]
+    message = json.dumps(event, cls=DjangoJSONEncoder, separators=(",", ":"))
+
+    def send():
+        try:
+            get_broker().publish(channels, message)
+        except Exception:
+            logger.exception(f"Failed to publish {event['type']} event for ticket {ticket_id}")
+
+    transaction.on_commit(send)
+
+
+def publish_ticket_saved(ticket, created, old_assignee_id=None):
+    recipients = {ticket.user_id, ticket.assigned_to_id, old_assignee_id} - {None}
+    event = {
+        "type": "ticket.created" if created else "ticket.updated",
+        "ticket": ticket.pk,
+        "status": ticket.status,
+        "priority": ticket.priority,
+        "assigned_to": ticket.assigned_to_id,
+        "updated_at": ticket.updated_at,
+    }
+    publish(event, ticket.pk, recipients)
+
+
+def publish_ticket_deleted(ticket):
+    recipients = {ticket.user_id, ticket.assigned_to_id} - {None}
+    publish({"type": "ticket.deleted", "ticket": ticket.pk}, ticket.pk, recipients)
+
+
+def publish_comment_event(comment, kind):
+    """Publish ``comment.<kind>``; internal comments never reach the requester's channels."""
+    ticket = comment.ticket
+    recipients = {ticket.assigned_to_id} if comment.is_internal else {ticket.user_id, ticket.assigned_to_id}
+    event = {
+        "type": f"comment.{kind}",
+        "ticket": comment.ticket_id,
+        "comment": comment.pk,
+        "author": comment.author_id,
+        "is_internal": comment.is_internal,
+    }
+    publish(event, comment.ticket_id, recipients - {None}, internal=comment.is_internal)
+
+
+def publish_sla_breached(ticket_id, assignee_id, kind):
+    """Tell staff watching the ticket, and its assignee, that an SLA deadline passed."""
+    event = {"type": "ticket.sla_breached", "ticket": ticket_id, "sla": kind}
+    publish(event, ticket_id, {assignee_id} - {None}, internal=True)
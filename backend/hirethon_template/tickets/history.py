@@ -0,0 +1,75 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.utils import timezone
+
+from hirethon_template.tickets.models import TicketEvent
+
+# Ticket columns whose changes are recorded, with the event kind they produce
+TRACKED_FIELDS = {
+    "status": TicketEvent.STATUS_CHANGED,
+    "priority": TicketEvent.PRIORITY_CHANGED,
+    "category": TicketEvent.CATEGORY_CHANGED,
+    "assigned_to_id": TicketEvent.ASSIGNEE_CHANGED,
+}
+
+_actor_id = ContextVar("ticket_actor_id", default=None)
+
+
+def set_actor(user):
+    """Attribute the events recorded in the current context to ``user``; returns a token for ``reset_actor``."""
+    return _actor_id.set(user.pk if user is not None and user.is_authenticated else None)
+
+
+def reset_actor(token):
+    _actor_id.reset(token)
+
+
+@contextmanager
+def acting_as(user):
+    token = set_actor(user)
+    try:
+        yield
+    finally:
+        reset_actor(token)
+
+
+def current_actor_id():
+    """The user behind the current request, or None for automatic changes."""
+    return _actor_id.get()
+
+
+def _value(value):
+    return "" if value is None else str(value)
+
+
+def change_events(ticket_id, old_state, new_state, at=None, actor_id=None):
+    """
+    Build (unsaved) events for the tracked fields that differ between two states.
+
+    ``old_state`` is None for a new ticket, which produces a single ``CREATED``
+    event. Both states are dicts as returned by ``Ticket.counter_state()``.
+    """
+    at = at or timezone.now()
+    if old_state is None:
+        return [
+            TicketEvent(
+                ticket_id=ticket_id, kind=TicketEvent.CREATED, new_value=_value(new_state["status"]),
+                actor_id=actor_id, created_at=at,
+            )
+        ]
+    return [
+        TicketEvent(
+            ticket_id=ticket_id, kind=kind, old_value=_value(old_state[field]), new_value=_value(new_state[field]),
+            actor_id=actor_id, created_at=at,
+        )
+        for field, kind in TRACKED_FIELDS.items()
+        if old_state[field] != new_state[field]
+    ]
+
+
+def record_events(events):
+    """Write ``events`` in one INSERT; call inside the transaction that made the changes."""
+    if events:
+        TicketEvent.objects.bulk_create(events)
+    return len(events)
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from hirethon_template.tickets.dedup import backfill_fingerprints
+
+
+class Command(BaseCommand):
+    help = "Compute the duplicate-detection fingerprints of existing tickets."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000, help="Tickets fingerprinted per statement.")
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Recompute every fingerprint, not only the missing ones.",
+        )
+
+    def handle(self, *args, **options):
+        indexed = backfill_fingerprints(batch_size=options["batch_size"], missing_only=not options["all"])
+        self.stdout.write(self.style.SUCCESS(f"Fingerprinted {indexed} tickets."))
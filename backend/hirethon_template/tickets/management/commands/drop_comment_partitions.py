@@ -0,0 +1,41 @@
+from datetime import datetime, timezone
+
+from django.core.management.base import BaseCommand, CommandError
+
+from hirethon_template.tickets.partitions import drop_comment_partitions
+
+
+class Command(BaseCommand):
+    help = "Drop the monthly ticket comment partitions that end on or before a date."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--before", required=True, help="Date (YYYY-MM-DD, UTC) the partitions must end by.")
+        parser.add_argument(
+            "--include-comments",
+            action="store_true",
+            help="Also drop partitions that still hold comments, deleting those comments.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only list the partitions that would be dropped.",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            before = datetime.strptime(options["before"], "%Y-%m-%d").replace(tzinfo=timezone.utc)
+        except ValueError:
+            raise CommandError("--before must be a date in YYYY-MM-DD format.")
+
+        dropped = drop_comment_partitions(
+            before, include_comments=options["include_comments"], dry_run=options["dry_run"]
+        )
+        for name in dropped:
+            self.stdout.write(name)
+
+        if not dropped:
+            self.stdout.write(self.style.SUCCESS("No comment partitions to drop."))
+        elif options["dry_run"]:
+            self.stdout.write(self.style.WARNING(f"{len(dropped)} comment partitions would be dropped."))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"Dropped {len(dropped)} comment partitions."))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from hirethon_template.tickets.related import rebuild_index
+
+
+class Command(BaseCommand):
+    help = "Rebuild the related tickets index from every resolved and closed ticket."
+
+    def handle(self, *args, **options):
+        indexed = rebuild_index()
+        self.stdout.write(self.style.SUCCESS(f"Indexed {indexed} tickets."))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from hirethon_template.tickets.search import rebuild_search_vectors
+
+
+class Command(BaseCommand):
+    help = "Recompute the full-text search vector of every ticket."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000, help="Tickets updated per statement.")
+
+    def handle(self, *args, **options):
+        updated = rebuild_search_vectors(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt search vectors for {updated} tickets."))
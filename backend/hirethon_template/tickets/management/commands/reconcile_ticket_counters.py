@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from hirethon_template.tickets.counters import reconcile_counters
+
+
+class Command(BaseCommand):
+    help = "Rebuild the ticket counter table from tickets_ticket and report any drift."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report drift, do not rewrite the counters.",
+        )
+
+    def handle(self, *args, **options):
+        drift = reconcile_counters(dry_run=options["dry_run"])
+
+        for (scope, scope_id, dimension, value), stored, expected in drift:
+            self.stdout.write(f"{scope}:{scope_id} {dimension}={value}: stored {stored}, expected {expected}")
+
+        if not drift:
+            self.stdout.write(self.style.SUCCESS("Ticket counters are in sync."))
+        elif options["dry_run"]:
+            self.stdout.write(self.style.WARNING(f"{len(drift)} counters have drifted."))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"Rebuilt ticket counters, fixed {len(drift)} rows."))
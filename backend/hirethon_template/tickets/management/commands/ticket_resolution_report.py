@@ -0,0 +1,39 @@
+import json
+
+from django.core.management.base import BaseCommand
+from django.core.serializers.json import DjangoJSONEncoder
+
+from hirethon_template.tickets.analytics import build_report
+
+
+class Command(BaseCommand):
+    help = "Report resolution time percentiles, weekly cohorts and agent throughput."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=30, help="Window for resolution times and throughput.")
+        parser.add_argument("--weeks", type=int, default=12, help="Number of weekly creation cohorts.")
+        parser.add_argument("--json", action="store_true", help="Print the full report as JSON.")
+
+    def handle(self, *args, **options):
+        report = build_report(days=options["days"], weeks=options["weeks"])
+
+        if options["json"]:
+            self.stdout.write(json.dumps(report, cls=DjangoJSONEncoder, indent=2))
+            return
+
+        percentiles = report["resolution_percentiles"]["all"]
+        self.stdout.write(f"Resolved in the last {report['days']} days: {report['resolved']}")
+        hours = ", ".join(
+            f"{name} {value / 3600:.1f}" if value is not None else f"{name} -" for name, value in percentiles.items()
+        )
+        self.stdout.write(f"Resolution time (hours): {hours}")
+        self.stdout.write("Weekly cohorts (share resolved within 1, 2, ... weeks):")
+        for cohort in report["cohorts"]:
+            rates = " ".join(f"{rate:.0%}" for rate in cohort["resolved_within_weeks"])
+            self.stdout.write(f"  {cohort['week']}  {cohort['tickets']:>7}  {rates}")
+        self.stdout.write("Agents by tickets resolved:")
+        for agent in report["agents"]:
+            self.stdout.write(
+                f"  user {agent['assignee_id']:>6}  {agent['resolved']:>6} resolved  {agent['per_day']:>6}/day  "
+                f"median {agent['median_resolution_seconds'] / 3600:.1f} h"
+            )
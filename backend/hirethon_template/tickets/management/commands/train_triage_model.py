@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from hirethon_template.tickets.triage import model_path, train_model
+
+
+class Command(BaseCommand):
+    help = "Train the category/priority triage model on resolved and closed tickets."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--jobs", type=int, default=None, help="Worker processes counting tickets (default: one per CPU)."
+        )
+
+    def handle(self, *args, **options):
+        try:
+            model = train_model(jobs=options["jobs"])
+        except ValueError as error:
+            raise CommandError(error)
+        self.stdout.write(self.style.SUCCESS(f"Trained on {model.trained_on} tickets, saved to {model_path()}."))
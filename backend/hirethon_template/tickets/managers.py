@@ -0,0 +1,27 @@
+from django.db import models
+from django.db.models import Prefetch
+
+# Length of the latest comment excerpt shown in ticket lists.
+COMMENT_EXCERPT_LENGTH = 100
+# Newest comments embedded in a ticket detail; older ones are paged through the comments endpoint.
+EMBEDDED_COMMENT_LIMIT = 20
+
+
+class TicketQuerySet(models.QuerySet):
+    """Custom queryset for the Ticket model."""
+
+    def with_recent_comments(self, include_internal=False, limit=EMBEDDED_COMMENT_LIMIT):
+        """
+        Prefetch each ticket's newest ``limit + 1`` visible comments into ``recent_comments``, newest first.
+
+        The extra row only tells whether older comments exist. The slice is
+        applied per ticket in SQL, so long-running tickets never load their
+        whole history, and internal comments are filtered out in the query
+        rather than after it.
+        """
+        from hirethon_template.tickets.models import TicketComment
+
+        comments = TicketComment.objects.select_related("author").order_by("-created_at", "-id")
+        if not include_internal:
+            comments = comments.filter(is_internal=False)
+        return self.prefetch_related(Prefetch("comments", queryset=comments[: limit + 1], to_attr="recent_comments"))
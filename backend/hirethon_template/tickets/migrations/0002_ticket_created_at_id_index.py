@@ -0,0 +1,16 @@
+# Generated by Django 4.2.3 on 2026-10-17 00:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tickets", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="ticket",
+            index=models.Index(fields=["created_at", "id"], name="tickets_tic_created_8f9e5d_idx"),
+        ),
+    ]
@@ -0,0 +1,69 @@
+# Generated by Django 4.2.3 on 2026-10-17 00:12
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def populate_counters(apps, schema_editor):
+    Ticket = apps.get_model("tickets", "Ticket")
+    TicketCounter = apps.get_model("tickets", "TicketCounter")
+    tickets = Ticket.objects.order_by()
+    counters = []
+
+    for dimension in ("status", "priority", "category"):
+        for row in tickets.values(dimension).annotate(total=Count("id")):
+            counters.append(TicketCounter(scope="global", dimension=dimension, value=row[dimension], count=row["total"]))
+    for row in tickets.values("status", "priority").annotate(total=Count("id")):
+        value = f"{row['status']}:{row['priority']}"
+        counters.append(TicketCounter(scope="global", dimension="status_priority", value=value, count=row["total"]))
+    for row in tickets.values("user_id", "status").annotate(total=Count("id")):
+        counters.append(
+            TicketCounter(
+                scope="requester", scope_id=row["user_id"], dimension="status", value=row["status"], count=row["total"]
+            )
+        )
+    for row in tickets.filter(assigned_to__isnull=False).values("assigned_to_id", "status").annotate(total=Count("id")):
+        counters.append(
+            TicketCounter(
+                scope="assignee",
+                scope_id=row["assigned_to_id"],
+                dimension="status",
+                value=row["status"],
+                count=row["total"],
+            )
+        )
+
+    TicketCounter.objects.bulk_create(counters, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tickets", "0002_ticket_created_at_id_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TicketCounter",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                (
+                    "scope",
+                    models.CharField(
+                        choices=[("global", "Global"), ("requester", "Requester"), ("assignee", "Assignee")],
+                        max_length=20,
+                    ),
+                ),
+                ("scope_id", models.BigIntegerField(default=0, help_text="User id for requester/assignee scopes")),
+                ("dimension", models.CharField(max_length=20)),
+                ("value", models.CharField(max_length=50)),
+                ("count", models.BigIntegerField(default=0)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name="ticketcounter",
+            constraint=models.UniqueConstraint(
+                fields=("scope", "scope_id", "dimension", "value"), name="tickets_counter_unique_key"
+            ),
+        ),
+        migrations.RunPython(populate_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 4.2.3 on 2026-10-17 00:13
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+
+BACKFILL_SEARCH_VECTORS = """
+UPDATE tickets_ticket AS t SET search_vector =
+    setweight(to_tsvector('english', coalesce(t.title, '')), 'A')
+    || setweight(to_tsvector('english', coalesce(t.description, '')), 'B')
+    || setweight(to_tsvector('english', coalesce((
+        SELECT string_agg(c.content, ' ') FROM tickets_ticketcomment AS c
+        WHERE c.ticket_id = t.id AND NOT c.is_internal
+    ), '')), 'C');
+"""
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tickets", "0003_ticketcounter"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="ticket",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="ticket",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_vector"], name="tickets_tic_search__29333d_gin"
+            ),
+        ),
+        migrations.RunSQL(BACKFILL_SEARCH_VECTORS, migrations.RunSQL.noop),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.3 on 2026-10-17 00:15
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tickets", "0004_ticket_search_vector"),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddIndex(
+            model_name="ticket",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["title"], name="tickets_title_trgm_idx", opclasses=["gin_trgm_ops"]
+            ),
+        ),
+    ]
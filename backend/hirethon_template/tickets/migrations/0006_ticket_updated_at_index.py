@@ -0,0 +1,16 @@
+# Generated by Django 4.2.3 on 2026-10-17 00:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tickets", "0005_ticket_title_trigram_index"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="ticket",
+            index=models.Index(fields=["updated_at"], name="tickets_tic_updated_c8331d_idx"),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 4.2.3 on 2026-10-17 00:25
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tickets", "0006_ticket_updated_at_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TicketTombstone",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                (
+                    "object_type",
+                    models.CharField(choices=[("ticket", "Ticket"), ("comment", "Comment")], max_length=10),
+                ),
+                ("object_id", models.BigIntegerField()),
+                ("ticket_id", models.BigIntegerField()),
+                (
+                    "owner_id",
+                    models.BigIntegerField(help_text="Requester of the ticket, for visibility checks", null=True),
+                ),
+                ("is_internal", models.BooleanField(default=False)),
+                ("deleted_at", models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="ticketcomment",
+            index=models.Index(fields=["updated_at"], name="tickets_tic_updated_867c16_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="tickettombstone",
+            index=models.Index(fields=["deleted_at"], name="tickets_tic_deleted_e75c9b_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="tickettombstone",
+            index=models.Index(fields=["owner_id", "deleted_at"], name="tickets_tic_owner_i_72442f_idx"),
+        ),
+    ]
@@ -0,0 +1,120 @@
+# Generated by Django 4.2.3 on 2026-10-17 00:34
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+BACKFILL_ACTIVITY = """
+UPDATE tickets_ticket AS t SET
+    total_comment_count = (SELECT count(*) FROM tickets_ticketcomment AS c WHERE c.ticket_id = t.id),
+    public_comment_count = (
+        SELECT count(*) FROM tickets_ticketcomment AS c WHERE c.ticket_id = t.id AND NOT c.is_internal
+    ),
+    last_activity_at = t.updated_at;
+
+UPDATE tickets_ticket AS t SET
+    last_comment_at = c.created_at,
+    last_comment_author_id = c.author_id,
+    last_activity_at = GREATEST(t.last_activity_at, c.created_at)
+FROM (
+    SELECT DISTINCT ON (ticket_id) ticket_id, created_at, author_id FROM tickets_ticketcomment
+    ORDER BY ticket_id, created_at DESC, id DESC
+) AS c
+WHERE c.ticket_id = t.id;
+
+UPDATE tickets_ticket AS t SET
+    last_public_comment_at = c.created_at,
+    last_public_comment_author_id = c.author_id,
+    last_public_comment_excerpt = CASE
+        WHEN length(c.content) > 100 THEN left(c.content, 100) || '...' ELSE c.content
+    END
+FROM (
+    SELECT DISTINCT ON (ticket_id) ticket_id, created_at, author_id, content FROM tickets_ticketcomment
+    WHERE NOT is_internal
+    ORDER BY ticket_id, created_at DESC, id DESC
+) AS c
+WHERE c.ticket_id = t.id;
+"""
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("tickets", "0007_ticket_tombstone"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="ticket",
+            name="last_activity_at",
+            field=models.DateTimeField(
+                default=django.utils.timezone.now,
+                editable=False,
+                help_text="Last time the ticket was saved or commented on",
+            ),
+        ),
+        migrations.AddField(
+            model_name="ticket",
+            name="last_comment_at",
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="ticket",
+            name="last_comment_author",
+            field=models.ForeignKey(
+                blank=True,
+                editable=False,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="+",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AddField(
+            model_name="ticket",
+            name="last_public_comment_at",
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="ticket",
+            name="last_public_comment_author",
+            field=models.ForeignKey(
+                blank=True,
+                editable=False,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="+",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AddField(
+            model_name="ticket",
+            name="last_public_comment_excerpt",
+            field=models.CharField(blank=True, editable=False, max_length=103),
+        ),
+        migrations.AddField(
+            model_name="ticket",
+            name="public_comment_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="ticket",
+            name="total_comment_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunSQL(BACKFILL_ACTIVITY, migrations.RunSQL.noop),
+        migrations.AddIndex(
+            model_name="ticket",
+            index=models.Index(fields=["last_activity_at", "id"], name="tickets_tic_last_ac_772964_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="ticket",
+            index=models.Index(
+                condition=models.Q(("status__in", ["open", "in_progress", "pending_user"])),
+                fields=["last_activity_at", "id"],
+                name="tickets_open_activity_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,61 @@
+# Generated by Django 4.2.3 on 2026-10-17 00:37
+
+from django.conf import settings
+import django.contrib.postgres.fields
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("tickets", "0008_ticket_activity"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SupportAgent",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                (
+                    "categories",
+                    django.contrib.postgres.fields.ArrayField(
+                        base_field=models.CharField(
+                            choices=[
+                                ("bug", "Bug Report"),
+                                ("feature", "Feature Request"),
+                                ("support", "Technical Support"),
+                                ("billing", "Billing Issue"),
+                                ("other", "Other"),
+                            ],
+                            max_length=20,
+                        ),
+                        blank=True,
+                        default=list,
+                        help_text="Categories this agent handles; empty means every category",
+                        size=None,
+                    ),
+                ),
+                (
+                    "is_available",
+                    models.BooleanField(default=True, help_text="Unavailable agents receive no new tickets"),
+                ),
+                (
+                    "max_open_tickets",
+                    models.PositiveIntegerField(
+                        blank=True,
+                        help_text="Open tickets after which no more are assigned; empty means no limit",
+                        null=True,
+                    ),
+                ),
+                (
+                    "user",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="support_agent",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+        ),
+    ]
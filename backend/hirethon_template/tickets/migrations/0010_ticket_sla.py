@@ -0,0 +1,143 @@
+# Generated by Django 4.2.3 on 2026-10-17 00:40
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+BACKFILL_FIRST_RESPONSE = """
+UPDATE tickets_ticket AS t SET first_responded_at = (
+    SELECT min(c.created_at) FROM tickets_ticketcomment AS c
+    JOIN users_user AS u ON u.id = c.author_id
+    WHERE c.ticket_id = t.id AND NOT c.is_internal AND (u.is_staff OR u.is_superuser)
+);
+"""
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("tickets", "0009_support_agent"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SLAPolicy",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                (
+                    "priority",
+                    models.CharField(
+                        blank=True,
+                        choices=[("low", "Low"), ("medium", "Medium"), ("high", "High"), ("urgent", "Urgent")],
+                        help_text="Empty matches every priority",
+                        max_length=10,
+                    ),
+                ),
+                (
+                    "category",
+                    models.CharField(
+                        blank=True,
+                        choices=[
+                            ("bug", "Bug Report"),
+                            ("feature", "Feature Request"),
+                            ("support", "Technical Support"),
+                            ("billing", "Billing Issue"),
+                            ("other", "Other"),
+                        ],
+                        help_text="Empty matches every category",
+                        max_length=20,
+                    ),
+                ),
+                ("first_response_minutes", models.PositiveIntegerField()),
+                ("resolution_minutes", models.PositiveIntegerField()),
+                (
+                    "business_hours_only",
+                    models.BooleanField(
+                        default=False,
+                        help_text="Only count working hours (TICKET_SLA_BUSINESS_HOURS) towards the targets",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "SLA policy",
+                "verbose_name_plural": "SLA policies",
+            },
+        ),
+        migrations.AddField(
+            model_name="ticket",
+            name="first_responded_at",
+            field=models.DateTimeField(
+                blank=True, editable=False, help_text="First public comment by an admin", null=True
+            ),
+        ),
+        migrations.AddField(
+            model_name="ticket",
+            name="first_response_breached",
+            field=models.BooleanField(default=False, editable=False),
+        ),
+        migrations.AddField(
+            model_name="ticket",
+            name="first_response_due_at",
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="ticket",
+            name="resolution_breached",
+            field=models.BooleanField(default=False, editable=False),
+        ),
+        migrations.AddField(
+            model_name="ticket",
+            name="resolution_due_at",
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="ticket",
+            name="sla_paused_at",
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="ticket",
+            name="sla_paused_seconds",
+            field=models.PositiveIntegerField(
+                default=0, editable=False, help_text="SLA clock time spent paused, added to every deadline"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="ticket",
+            index=models.Index(
+                condition=models.Q(
+                    ("first_responded_at__isnull", True),
+                    ("first_response_breached", False),
+                    ("status__in", ["open", "in_progress"]),
+                ),
+                fields=["first_response_due_at"],
+                name="tickets_sla_response_due_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="ticket",
+            index=models.Index(
+                condition=models.Q(("resolution_breached", False), ("status__in", ["open", "in_progress"])),
+                fields=["resolution_due_at"],
+                name="tickets_sla_resolution_due_idx",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="slapolicy",
+            constraint=models.UniqueConstraint(fields=("priority", "category"), name="tickets_slapolicy_unique_scope"),
+        ),
+        migrations.AddField(
+            model_name="ticket",
+            name="sla_policy",
+            field=models.ForeignKey(
+                blank=True,
+                editable=False,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="tickets",
+                to="tickets.slapolicy",
+            ),
+        ),
+        migrations.RunSQL(BACKFILL_FIRST_RESPONSE, migrations.RunSQL.noop),
+    ]
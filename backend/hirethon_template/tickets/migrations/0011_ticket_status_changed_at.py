@@ -0,0 +1,33 @@
+# Generated by Django 4.2.3 on 2026-10-17 00:43
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+BACKFILL_STATUS_CHANGED_AT = "UPDATE tickets_ticket SET status_changed_at = updated_at;"
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tickets", "0010_ticket_sla"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="ticket",
+            name="escalated_at",
+            field=models.DateTimeField(
+                blank=True, editable=False, help_text="Last automatic priority escalation of an idle ticket", null=True
+            ),
+        ),
+        migrations.AddField(
+            model_name="ticket",
+            name="status_changed_at",
+            field=models.DateTimeField(default=django.utils.timezone.now, editable=False),
+        ),
+        migrations.RunSQL(BACKFILL_STATUS_CHANGED_AT, migrations.RunSQL.noop),
+        migrations.AddIndex(
+            model_name="ticket",
+            index=models.Index(fields=["status", "status_changed_at"], name="tickets_tic_status_3f33e3_idx"),
+        ),
+    ]
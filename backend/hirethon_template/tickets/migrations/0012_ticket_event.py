@@ -0,0 +1,79 @@
+# Generated by Django 4.2.3 on 2026-10-17 00:46
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+# Start the history of existing tickets with their creation and their comments
+BACKFILL_EVENTS = """
+INSERT INTO tickets_ticketevent (ticket_id, kind, old_value, new_value, actor_id, is_internal, created_at)
+SELECT id, 1, '', 'open', user_id, false, created_at FROM tickets_ticket
+UNION ALL
+SELECT ticket_id, 6, '', id::text, author_id, is_internal, created_at FROM tickets_ticketcomment;
+"""
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("tickets", "0011_ticket_status_changed_at"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TicketEvent",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                (
+                    "kind",
+                    models.PositiveSmallIntegerField(
+                        choices=[
+                            (1, "created"),
+                            (2, "status_changed"),
+                            (3, "priority_changed"),
+                            (4, "category_changed"),
+                            (5, "assignee_changed"),
+                            (6, "comment_added"),
+                            (7, "comment_deleted"),
+                            (8, "sla_breached"),
+                            (9, "deleted"),
+                        ]
+                    ),
+                ),
+                ("old_value", models.CharField(blank=True, max_length=50)),
+                ("new_value", models.CharField(blank=True, max_length=50)),
+                ("is_internal", models.BooleanField(default=False, help_text="Only shown to admins")),
+                ("created_at", models.DateTimeField(default=django.utils.timezone.now)),
+                (
+                    "actor",
+                    models.ForeignKey(
+                        blank=True,
+                        db_constraint=False,
+                        help_text="User who made the change; empty for automatic changes",
+                        null=True,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    "ticket",
+                    models.ForeignKey(
+                        db_constraint=False,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        related_name="events",
+                        to="tickets.ticket",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(fields=["ticket", "created_at"], name="tickets_tic_ticket__766ceb_idx"),
+                    models.Index(fields=["created_at"], name="tickets_tic_created_6b6f75_idx"),
+                ],
+            },
+        ),
+        migrations.RunSQL(BACKFILL_EVENTS, migrations.RunSQL.noop),
+    ]
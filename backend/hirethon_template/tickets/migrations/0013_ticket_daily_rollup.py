@@ -0,0 +1,68 @@
+# Generated by Django 4.2.3 on 2026-10-17 00:49
+
+import django.contrib.postgres.fields
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tickets", "0012_ticket_event"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TicketDailyRollup",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("day", models.DateField()),
+                (
+                    "dimension",
+                    models.CharField(
+                        choices=[
+                            ("all", "All tickets"),
+                            ("category", "Category"),
+                            ("priority", "Priority"),
+                            ("assignee", "Assignee"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                (
+                    "value",
+                    models.CharField(
+                        blank=True,
+                        help_text="Category, priority or assignee id; empty for all tickets and for unassigned ones",
+                        max_length=50,
+                    ),
+                ),
+                ("created", models.PositiveIntegerField(default=0)),
+                ("resolved", models.PositiveIntegerField(default=0)),
+                ("closed", models.PositiveIntegerField(default=0)),
+                (
+                    "backlog",
+                    models.PositiveIntegerField(default=0, help_text="Tickets still open at the end of the day"),
+                ),
+                ("resolution_p50_seconds", models.PositiveIntegerField(blank=True, null=True)),
+                ("resolution_p90_seconds", models.PositiveIntegerField(blank=True, null=True)),
+                (
+                    "resolution_histogram",
+                    django.contrib.postgres.fields.ArrayField(
+                        base_field=models.PositiveIntegerField(),
+                        blank=True,
+                        default=list,
+                        help_text="Tickets resolved per log-scale resolution time bucket, merged for weekly and monthly figures",
+                        size=None,
+                    ),
+                ),
+                ("computed_at", models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                "indexes": [models.Index(fields=["computed_at"], name="tickets_tic_compute_f85588_idx")],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="ticketdailyrollup",
+            constraint=models.UniqueConstraint(fields=("dimension", "value", "day"), name="tickets_rollup_unique_key"),
+        ),
+    ]
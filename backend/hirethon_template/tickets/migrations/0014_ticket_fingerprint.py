@@ -0,0 +1,44 @@
+# Generated by Django 4.2.3 on 2026-10-17 00:57
+
+import django.contrib.postgres.fields
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tickets", "0013_ticket_daily_rollup"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TicketFingerprint",
+            fields=[
+                (
+                    "ticket",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="fingerprint",
+                        serialize=False,
+                        to="tickets.ticket",
+                    ),
+                ),
+                ("signature", models.BinaryField(help_text="MinHash values as little-endian uint32")),
+                (
+                    "bands",
+                    django.contrib.postgres.fields.ArrayField(
+                        base_field=models.BigIntegerField(),
+                        help_text="One hash per LSH band of the signature",
+                        size=None,
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    django.contrib.postgres.indexes.GinIndex(fields=["bands"], name="tickets_fingerprint_bands_idx")
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,161 @@
+# Generated by Django 4.2.3 on 2026-10-17 01:17
+
+from django.conf import settings
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("tickets", "0014_ticket_fingerprint"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ArchivedTicket",
+            fields=[
+                ("id", models.BigIntegerField(primary_key=True, serialize=False)),
+                ("title", models.CharField(max_length=200)),
+                ("description", models.TextField()),
+                (
+                    "category",
+                    models.CharField(
+                        choices=[
+                            ("bug", "Bug Report"),
+                            ("feature", "Feature Request"),
+                            ("support", "Technical Support"),
+                            ("billing", "Billing Issue"),
+                            ("other", "Other"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                (
+                    "priority",
+                    models.CharField(
+                        choices=[("low", "Low"), ("medium", "Medium"), ("high", "High"), ("urgent", "Urgent")],
+                        max_length=10,
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("open", "Open"),
+                            ("in_progress", "In Progress"),
+                            ("pending_user", "Pending User"),
+                            ("resolved", "Resolved"),
+                            ("closed", "Closed"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                ("admin_feedback", models.TextField(blank=True)),
+                ("created_at", models.DateTimeField()),
+                ("updated_at", models.DateTimeField()),
+                ("resolved_at", models.DateTimeField(blank=True, null=True)),
+                ("status_changed_at", models.DateTimeField()),
+                ("public_comment_count", models.PositiveIntegerField(default=0)),
+                ("total_comment_count", models.PositiveIntegerField(default=0)),
+                ("last_public_comment_at", models.DateTimeField(blank=True, null=True)),
+                ("last_public_comment_excerpt", models.CharField(blank=True, max_length=103)),
+                ("first_response_due_at", models.DateTimeField(blank=True, null=True)),
+                ("first_responded_at", models.DateTimeField(blank=True, null=True)),
+                ("resolution_due_at", models.DateTimeField(blank=True, null=True)),
+                ("first_response_breached", models.BooleanField(default=False)),
+                ("resolution_breached", models.BooleanField(default=False)),
+                ("search_vector", django.contrib.postgres.search.SearchVectorField(null=True)),
+                ("archived_at", models.DateTimeField(default=django.utils.timezone.now)),
+                (
+                    "assigned_to",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    "last_public_comment_author",
+                    models.ForeignKey(
+                        blank=True,
+                        db_index=False,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="archived_tickets",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["-created_at"],
+            },
+        ),
+        migrations.AlterField(
+            model_name="ticketevent",
+            name="kind",
+            field=models.PositiveSmallIntegerField(
+                choices=[
+                    (1, "created"),
+                    (2, "status_changed"),
+                    (3, "priority_changed"),
+                    (4, "category_changed"),
+                    (5, "assignee_changed"),
+                    (6, "comment_added"),
+                    (7, "comment_deleted"),
+                    (8, "sla_breached"),
+                    (9, "deleted"),
+                    (10, "archived"),
+                    (11, "restored"),
+                ]
+            ),
+        ),
+        migrations.CreateModel(
+            name="ArchivedTicketComment",
+            fields=[
+                ("id", models.BigIntegerField(primary_key=True, serialize=False)),
+                ("content", models.TextField()),
+                ("is_internal", models.BooleanField(default=False)),
+                ("created_at", models.DateTimeField()),
+                ("updated_at", models.DateTimeField()),
+                (
+                    "author",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, related_name="+", to=settings.AUTH_USER_MODEL
+                    ),
+                ),
+                (
+                    "ticket",
+                    models.ForeignKey(
+                        db_index=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="comments",
+                        to="tickets.archivedticket",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["created_at"],
+                "indexes": [models.Index(fields=["ticket", "created_at"], name="tickets_arc_ticket__f5a292_idx")],
+            },
+        ),
+        migrations.AddIndex(
+            model_name="archivedticket",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_vector"], name="tickets_archived_search_idx"
+            ),
+        ),
+    ]
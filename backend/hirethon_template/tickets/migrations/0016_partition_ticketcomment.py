@@ -0,0 +1,113 @@
+"""
+Convert tickets_ticketcomment into a table range partitioned by month of created_at.
+
+The existing table is not rewritten. It becomes the first partition,
+tickets_ticketcomment_legacy, covering everything before the first month
+boundary at least a day away, and monthly partitions start there:
+
+1. A unique (id, created_at) index is built CONCURRENTLY, because a
+   partitioned table's primary key must include the partition key, and a
+   CHECK constraint matching the legacy range is added NOT VALID and then
+   validated. Both only take locks that let reads and writes continue.
+2. In one short transaction the table is renamed, its identity column
+   becomes a plain sequence (partitioned tables cannot have identity
+   columns before PostgreSQL 17), an empty partitioned parent takes over
+   the name, and the old table is attached. The validated CHECK spares the
+   attach a scan, and the parent's indexes and foreign keys adopt the
+   matching ones the old table already has instead of building new ones.
+
+Django keeps treating ``id`` as the primary key; it stays unique because
+every row still draws it from the one sequence.
+"""
+from datetime import datetime, timedelta, timezone
+
+from django.db import migrations, transaction
+
+TABLE = "tickets_ticketcomment"
+LEGACY = "tickets_ticketcomment_legacy"
+# Months of partitions created up front; the rotate_comment_partitions task keeps extending them
+MONTHS_AHEAD = 3
+
+
+def add_months(month, count):
+    index = month.year * 12 + month.month - 1 + count
+    return month.replace(year=index // 12, month=index % 12 + 1)
+
+
+def legacy_until():
+    # Comments keep being inserted into the old table until the switch, which the CHECK must accept
+    soon = datetime.now(timezone.utc) + timedelta(days=1)
+    return add_months(datetime(soon.year, soon.month, 1, tzinfo=timezone.utc), 1)
+
+
+def partition_comments(apps, schema_editor):
+    connection = schema_editor.connection
+    until = legacy_until()
+    schema_editor.execute(
+        f"ALTER TABLE {TABLE} ADD CONSTRAINT {LEGACY}_range CHECK (created_at < %s) NOT VALID", [until]
+    )
+    schema_editor.execute(f"ALTER TABLE {TABLE} VALIDATE CONSTRAINT {LEGACY}_range")
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT indexrelid::regclass::text, pg_get_indexdef(indexrelid) FROM pg_index "
+            "WHERE indrelid = %s::regclass AND NOT indisprimary AND indexrelid <> %s::regclass",
+            [TABLE, f"{TABLE}_id_created_at_uniq"],
+        )
+        indexes = cursor.fetchall()
+        cursor.execute(
+            "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint WHERE conrelid = %s::regclass AND contype = 'f'",
+            [TABLE],
+        )
+        foreign_keys = cursor.fetchall()
+
+    statements = [
+        f"LOCK TABLE {TABLE} IN ACCESS EXCLUSIVE MODE",
+        f"ALTER TABLE {TABLE} RENAME TO {LEGACY}",
+        f"CREATE SEQUENCE {TABLE}_id_seq_new",
+        f"SELECT setval('{TABLE}_id_seq_new', nextval(pg_get_serial_sequence('{LEGACY}', 'id')), false)",
+        f"ALTER TABLE {LEGACY} ALTER COLUMN id DROP IDENTITY",
+        f"ALTER SEQUENCE {TABLE}_id_seq_new RENAME TO {TABLE}_id_seq",
+        f"ALTER TABLE {LEGACY} DROP CONSTRAINT {TABLE}_pkey",
+        f"ALTER TABLE {LEGACY} ADD CONSTRAINT {LEGACY}_pkey PRIMARY KEY USING INDEX {TABLE}_id_created_at_uniq",
+    ]
+    # Index names are schema-wide; the old ones step aside so the parent's keep Django's names
+    statements += [f"ALTER INDEX {name} RENAME TO {name[:55]}_legacy" for name, _definition in indexes]
+    statements += [
+        f"CREATE TABLE {TABLE} (LIKE {LEGACY}) PARTITION BY RANGE (created_at)",
+        f"ALTER TABLE {TABLE} ALTER COLUMN id SET DEFAULT nextval('{TABLE}_id_seq')",
+        f"ALTER SEQUENCE {TABLE}_id_seq OWNED BY {TABLE}.id",
+        f"ALTER TABLE {TABLE} ADD CONSTRAINT {TABLE}_pkey PRIMARY KEY (id, created_at)",
+        f"ALTER TABLE {TABLE} ATTACH PARTITION {LEGACY} FOR VALUES FROM (MINVALUE) TO ('{until.isoformat()}')",
+        f"ALTER TABLE {LEGACY} DROP CONSTRAINT {LEGACY}_range",
+    ]
+    # The definitions were read before the rename, so they now name the parent
+    statements += [definition for _name, definition in indexes]
+    statements += [f"ALTER TABLE {TABLE} ADD CONSTRAINT {name} {definition}" for name, definition in foreign_keys]
+    for offset in range(MONTHS_AHEAD + 1):
+        month = add_months(until, offset)
+        statements.append(
+            f"CREATE TABLE {TABLE}_p{month:%Y_%m} PARTITION OF {TABLE} "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+        )
+
+    with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+        for statement in statements:
+            cursor.execute(statement)
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ("tickets", "0015_ticket_archive"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            f"CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS {TABLE}_id_created_at_uniq ON {TABLE} (id, created_at)",
+            reverse_sql=f"DROP INDEX CONCURRENTLY IF EXISTS {TABLE}_id_created_at_uniq",
+        ),
+        migrations.RunPython(partition_comments, elidable=False),
+    ]
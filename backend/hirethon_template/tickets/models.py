@@ -1,8 +1,14 @@
 import logging
-from django.db import models
+from functools import partial
+from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
+from django.db import models, transaction
 from django.contrib.auth import get_user_model
 from django.utils import timezone
 
+from hirethon_template.tickets.managers import COMMENT_EXCERPT_LENGTH, TicketQuerySet
+
 logger = logging.getLogger(__name__)
 User = get_user_model()
 
@@ -33,6 +39,26 @@ class Ticket(models.Model):
         ('other', 'Other'),
     ]
     
+    OPEN_STATUSES = ('open', 'in_progress', 'pending_user')
+    # Statuses in which the SLA clock runs; it is paused while waiting on the user or once resolved
+    SLA_RUNNING_STATUSES = ('open', 'in_progress')
+
+    # Fields that feed TicketCounter rows
+    COUNTER_FIELDS = ('status', 'priority', 'category', 'user_id', 'assigned_to_id')
+
+    # Comment-derived columns, maintained by tickets.activity with single-row UPDATEs
+    ACTIVITY_FIELDS = (
+        'public_comment_count', 'total_comment_count', 'last_comment_at', 'last_comment_author',
+        'last_public_comment_at', 'last_public_comment_author', 'last_public_comment_excerpt',
+        'first_responded_at',
+    )
+
+    # SLA columns, only written by a save that recomputes them (see tickets.sla.apply_sla)
+    SLA_FIELDS = (
+        'sla_policy', 'first_response_due_at', 'resolution_due_at', 'first_response_breached',
+        'resolution_breached', 'sla_paused_at', 'sla_paused_seconds',
+    )
+
     # Basic ticket information
     title = models.CharField(max_length=200)
     description = models.TextField()
@@ -55,22 +81,127 @@ class Ticket(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     resolved_at = models.DateTimeField(null=True, blank=True)
+    status_changed_at = models.DateTimeField(default=timezone.now, editable=False)
+    escalated_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        editable=False,
+        help_text="Last automatic priority escalation of an idle ticket"
+    )
     
     # Admin feedback
     admin_feedback = models.TextField(blank=True, help_text="Admin feedback or resolution notes")
     
+    # Activity summary, so lists never read the comments table
+    public_comment_count = models.PositiveIntegerField(default=0, editable=False)
+    total_comment_count = models.PositiveIntegerField(default=0, editable=False)
+    last_comment_at = models.DateTimeField(null=True, blank=True, editable=False)
+    last_comment_author = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        editable=False,
+        related_name='+'
+    )
+    last_public_comment_at = models.DateTimeField(null=True, blank=True, editable=False)
+    last_public_comment_author = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        editable=False,
+        related_name='+'
+    )
+    last_public_comment_excerpt = models.CharField(max_length=COMMENT_EXCERPT_LENGTH + 3, blank=True, editable=False)
+    last_activity_at = models.DateTimeField(
+        default=timezone.now,
+        editable=False,
+        help_text="Last time the ticket was saved or commented on"
+    )
+
+    # SLA deadlines from the matching SLAPolicy
+    sla_policy = models.ForeignKey(
+        'SLAPolicy',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        editable=False,
+        related_name='tickets'
+    )
+    first_response_due_at = models.DateTimeField(null=True, blank=True, editable=False)
+    first_responded_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        editable=False,
+        help_text="First public comment by an admin"
+    )
+    resolution_due_at = models.DateTimeField(null=True, blank=True, editable=False)
+    first_response_breached = models.BooleanField(default=False, editable=False)
+    resolution_breached = models.BooleanField(default=False, editable=False)
+    sla_paused_at = models.DateTimeField(null=True, blank=True, editable=False)
+    sla_paused_seconds = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        help_text="SLA clock time spent paused, added to every deadline"
+    )
+
+    # Full-text search document over title, description and public comments
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    objects = TicketQuerySet.as_manager()
+
     class Meta:
         ordering = ['-created_at']
         indexes = [
             models.Index(fields=['status', 'priority']),
             models.Index(fields=['user', 'created_at']),
             models.Index(fields=['assigned_to', 'status']),
+            models.Index(fields=['created_at', 'id']),
+            models.Index(fields=['updated_at']),
+            models.Index(fields=['last_activity_at', 'id']),
+            models.Index(fields=['status', 'status_changed_at']),
+            models.Index(
+                name='tickets_open_activity_idx',
+                fields=['last_activity_at', 'id'],
+                condition=models.Q(status__in=['open', 'in_progress', 'pending_user']),
+            ),
+            # The breach sweeper reads only running tickets not yet flagged, in due order
+            models.Index(
+                name='tickets_sla_response_due_idx',
+                fields=['first_response_due_at'],
+                condition=models.Q(
+                    status__in=['open', 'in_progress'],
+                    first_responded_at__isnull=True,
+                    first_response_breached=False,
+                ),
+            ),
+            models.Index(
+                name='tickets_sla_resolution_due_idx',
+                fields=['resolution_due_at'],
+                condition=models.Q(status__in=['open', 'in_progress'], resolution_breached=False),
+            ),
+            GinIndex(fields=['search_vector']),
+            GinIndex(name='tickets_title_trgm_idx', fields=['title'], opclasses=['gin_trgm_ops']),
         ]
     
     def __str__(self):
         return f"#{self.id} - {self.title}"
     
+    def counter_state(self):
+        """Return the fields that feed the ticket counters."""
+        return {field: getattr(self, field) for field in self.COUNTER_FIELDS}
+
     def save(self, *args, **kwargs):
+        from hirethon_template.tickets.counters import apply_ticket_change
+        from hirethon_template.tickets.dedup import index_tickets
+        from hirethon_template.tickets.events import publish_ticket_saved
+        from hirethon_template.tickets.history import change_events, current_actor_id, record_events
+        from hirethon_template.tickets.related import INDEXED_STATUSES
+        from hirethon_template.tickets.search import update_search_vectors
+        from hirethon_template.tickets.sla import LOCKED_STATE_FIELDS, apply_sla
+        from hirethon_template.tickets.tasks import index_related_ticket
+
         # Log ticket creation/updates
         if self.pk:
             logger.info(f"Ticket updated: {self.id} - Status: {self.status}")
@@ -82,19 +213,63 @@ class Ticket(models.Model):
             self.resolved_at = timezone.now()
             logger.info(f"Ticket resolved: {self.id}")
         
-        super().save(*args, **kwargs)
+        with transaction.atomic():
+            # Lock the row and read what the counters and the SLA clock currently reflect
+            old_state = None
+            if not self._state.adding:
+                old_state = (
+                    Ticket.objects.select_for_update()
+                    .filter(pk=self.pk)
+                    .values(*self.COUNTER_FIELDS, *LOCKED_STATE_FIELDS, 'title', 'description')
+                    .first()
+                )
+
+            created = self._state.adding
+            self.last_activity_at = timezone.now()
+            if old_state is None or old_state['status'] != self.status:
+                self.status_changed_at = self.last_activity_at
+            sla_changed = apply_sla(self, old_state, self.last_activity_at)
+            if not created and kwargs.get('update_fields') is None:
+                # Never write back activity or SLA columns this instance may have read before
+                # a comment or the breach sweeper changed them
+                skipped = self.ACTIVITY_FIELDS if sla_changed else self.ACTIVITY_FIELDS + self.SLA_FIELDS
+                deferred = self.get_deferred_fields()
+                kwargs['update_fields'] = [
+                    field.name for field in self._meta.concrete_fields
+                    if not field.primary_key and field.attname not in deferred and field.name not in skipped
+                ]
+            super().save(*args, **kwargs)
+            new_state = self.counter_state()
+            apply_ticket_change(old_state, new_state)
+            record_events(change_events(self.pk, old_state, new_state, self.last_activity_at, current_actor_id()))
+            if old_state is None or (old_state['title'], old_state['description']) != (self.title, self.description):
+                # Status, assignee and SLA saves leave the searchable text alone
+                update_search_vectors([self.pk])
+                index_tickets([(self.pk, self.title, self.description)])
+            publish_ticket_saved(self, created, old_state and old_state['assigned_to_id'])
+            if self.status in INDEXED_STATUSES and (old_state is None or old_state['status'] not in INDEXED_STATUSES):
+                # Offer its fix to the next similar tickets once the resolution or closure is committed
+                transaction.on_commit(partial(index_related_ticket.delay, self.pk), robust=True)
     
     @property
     def is_open(self):
-        return self.status in ['open', 'in_progress', 'pending_user']
+        return self.status in self.OPEN_STATUSES
     
     @property
     def is_resolved(self):
         return self.status in ['resolved', 'closed']
 
+    is_archived = False
+
 
 class TicketComment(models.Model):
-    """Comments on tickets by users and admins."""
+    """
+    Comments on tickets by users and admins.
+
+    The table is range partitioned by month of ``created_at`` (see
+    ``partitions.py``), so queries bounded on ``created_at`` only read the
+    months they cover.
+    """
     
     ticket = models.ForeignKey(Ticket, on_delete=models.CASCADE, related_name='comments')
     author = models.ForeignKey(User, on_delete=models.CASCADE, related_name='ticket_comments')
@@ -111,18 +286,387 @@ class TicketComment(models.Model):
         indexes = [
             models.Index(fields=['ticket', 'created_at']),
             models.Index(fields=['author', 'created_at']),
+            models.Index(fields=['updated_at']),
         ]
     
     def __str__(self):
         return f"Comment on #{self.ticket.id} by {self.author.email}"
     
     def save(self, *args, **kwargs):
+        from hirethon_template.tickets.activity import record_comment_created, refresh_comment_activity
+        from hirethon_template.tickets.events import publish_comment_event
+        from hirethon_template.tickets.history import record_events
+        from hirethon_template.tickets.search import append_comment_vector, update_search_vectors
+
         # Log comment creation
         if not self.pk:
             logger.info(f"Comment added to ticket {self.ticket.id} by {self.author.email}")
         
-        super().save(*args, **kwargs)
+        with transaction.atomic():
+            created = self._state.adding
+            previous = None
+            if not created:
+                previous = TicketComment.objects.filter(pk=self.pk).values('content', 'is_internal').first()
+            super().save(*args, **kwargs)
+            current = {'content': self.content, 'is_internal': self.is_internal}
+            if created:
+                if not self.is_internal:
+                    append_comment_vector(self)
+            elif previous != current and not (previous and previous['is_internal'] and self.is_internal):
+                # Only edits to public text change what the ticket is found by
+                update_search_vectors([self.ticket_id])
+            # Touch the ticket so list fingerprints and ETags see the new activity
+            if created:
+                record_comment_created(self)
+                record_events([
+                    TicketEvent(
+                        ticket_id=self.ticket_id,
+                        kind=TicketEvent.COMMENT_ADDED,
+                        new_value=str(self.pk),
+                        actor_id=self.author_id,
+                        is_internal=self.is_internal,
+                        created_at=self.created_at
+                    )
+                ])
+            else:
+                # An edit may change the excerpt or move the comment in or out of the public counts
+                refresh_comment_activity([self.ticket_id], updated_at=self.updated_at)
+            publish_comment_event(self, 'created' if created else 'updated')
     
     @property
     def is_admin_comment(self):
         return self.author.is_staff or self.author.is_superuser
+
+
+class SLAPolicy(models.Model):
+    """First-response and resolution targets for tickets of a priority and/or category."""
+
+    priority = models.CharField(
+        max_length=10,
+        choices=Ticket.PRIORITY_CHOICES,
+        blank=True,
+        help_text="Empty matches every priority"
+    )
+    category = models.CharField(
+        max_length=20,
+        choices=Ticket.CATEGORY_CHOICES,
+        blank=True,
+        help_text="Empty matches every category"
+    )
+    first_response_minutes = models.PositiveIntegerField()
+    resolution_minutes = models.PositiveIntegerField()
+    business_hours_only = models.BooleanField(
+        default=False,
+        help_text="Only count working hours (TICKET_SLA_BUSINESS_HOURS) towards the targets"
+    )
+
+    class Meta:
+        verbose_name = 'SLA policy'
+        verbose_name_plural = 'SLA policies'
+        constraints = [
+            models.UniqueConstraint(fields=['priority', 'category'], name='tickets_slapolicy_unique_scope'),
+        ]
+
+    def __str__(self):
+        return f"SLA {self.priority or 'any'}/{self.category or 'any'}"
+
+
+class SupportAgent(models.Model):
+    """Staff member who can be picked by automatic ticket assignment."""
+
+    user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='support_agent')
+    categories = ArrayField(
+        models.CharField(max_length=20, choices=Ticket.CATEGORY_CHOICES),
+        default=list,
+        blank=True,
+        help_text="Categories this agent handles; empty means every category"
+    )
+    is_available = models.BooleanField(default=True, help_text="Unavailable agents receive no new tickets")
+    max_open_tickets = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        help_text="Open tickets after which no more are assigned; empty means no limit"
+    )
+
+    def __str__(self):
+        return f"Agent {self.user.email}"
+
+
+class TicketCounter(models.Model):
+    """Incrementally maintained ticket counts for dashboards."""
+
+    SCOPE_CHOICES = [
+        ('global', 'Global'),
+        ('requester', 'Requester'),
+        ('assignee', 'Assignee'),
+    ]
+
+    scope = models.CharField(max_length=20, choices=SCOPE_CHOICES)
+    scope_id = models.BigIntegerField(default=0, help_text="User id for requester/assignee scopes")
+    dimension = models.CharField(max_length=20)
+    value = models.CharField(max_length=50)
+    count = models.BigIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['scope', 'scope_id', 'dimension', 'value'],
+                name='tickets_counter_unique_key',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.scope}:{self.scope_id} {self.dimension}={self.value} ({self.count})"
+
+
+class TicketTombstone(models.Model):
+    """Record of a deleted ticket or comment, reported by the changes feed."""
+
+    TICKET = 'ticket'
+    COMMENT = 'comment'
+    OBJECT_TYPE_CHOICES = [
+        (TICKET, 'Ticket'),
+        (COMMENT, 'Comment'),
+    ]
+
+    object_type = models.CharField(max_length=10, choices=OBJECT_TYPE_CHOICES)
+    object_id = models.BigIntegerField()
+    ticket_id = models.BigIntegerField()
+    owner_id = models.BigIntegerField(null=True, help_text="Requester of the ticket, for visibility checks")
+    is_internal = models.BooleanField(default=False)
+    deleted_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['deleted_at']),
+            models.Index(fields=['owner_id', 'deleted_at']),
+        ]
+
+    def __str__(self):
+        return f"Deleted {self.object_type} {self.object_id}"
+
+
+class TicketEvent(models.Model):
+    """
+    Append-only history of ticket state changes.
+
+    Rows are only ever inserted, in bulk and inside the transaction that made
+    the change. Neither key is a database constraint, so the history of a
+    deleted ticket or user is kept.
+    """
+
+    CREATED = 1
+    STATUS_CHANGED = 2
+    PRIORITY_CHANGED = 3
+    CATEGORY_CHANGED = 4
+    ASSIGNEE_CHANGED = 5
+    COMMENT_ADDED = 6
+    COMMENT_DELETED = 7
+    SLA_BREACHED = 8
+    DELETED = 9
+    ARCHIVED = 10
+    RESTORED = 11
+    KIND_CHOICES = [
+        (CREATED, 'created'),
+        (STATUS_CHANGED, 'status_changed'),
+        (PRIORITY_CHANGED, 'priority_changed'),
+        (CATEGORY_CHANGED, 'category_changed'),
+        (ASSIGNEE_CHANGED, 'assignee_changed'),
+        (COMMENT_ADDED, 'comment_added'),
+        (COMMENT_DELETED, 'comment_deleted'),
+        (SLA_BREACHED, 'sla_breached'),
+        (DELETED, 'deleted'),
+        (ARCHIVED, 'archived'),
+        (RESTORED, 'restored'),
+    ]
+
+    ticket = models.ForeignKey(
+        Ticket,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name='events'
+    )
+    kind = models.PositiveSmallIntegerField(choices=KIND_CHOICES)
+    old_value = models.CharField(max_length=50, blank=True)
+    new_value = models.CharField(max_length=50, blank=True)
+    actor = models.ForeignKey(
+        User,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        null=True,
+        blank=True,
+        related_name='+',
+        help_text="User who made the change; empty for automatic changes"
+    )
+    is_internal = models.BooleanField(default=False, help_text="Only shown to admins")
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['ticket', 'created_at']),
+            models.Index(fields=['created_at']),
+        ]
+
+    def __str__(self):
+        return f"#{self.ticket_id} {self.get_kind_display()}"
+
+
+class TicketDailyRollup(models.Model):
+    """Per-day ticket flow and resolution times, overall and per category, priority and assignee."""
+
+    ALL = 'all'
+    CATEGORY = 'category'
+    PRIORITY = 'priority'
+    ASSIGNEE = 'assignee'
+    DIMENSION_CHOICES = [
+        (ALL, 'All tickets'),
+        (CATEGORY, 'Category'),
+        (PRIORITY, 'Priority'),
+        (ASSIGNEE, 'Assignee'),
+    ]
+
+    day = models.DateField()
+    dimension = models.CharField(max_length=20, choices=DIMENSION_CHOICES)
+    value = models.CharField(
+        max_length=50,
+        blank=True,
+        help_text="Category, priority or assignee id; empty for all tickets and for unassigned ones"
+    )
+    created = models.PositiveIntegerField(default=0)
+    resolved = models.PositiveIntegerField(default=0)
+    closed = models.PositiveIntegerField(default=0)
+    backlog = models.PositiveIntegerField(default=0, help_text="Tickets still open at the end of the day")
+    resolution_p50_seconds = models.PositiveIntegerField(null=True, blank=True)
+    resolution_p90_seconds = models.PositiveIntegerField(null=True, blank=True)
+    resolution_histogram = ArrayField(
+        models.PositiveIntegerField(),
+        default=list,
+        blank=True,
+        help_text="Tickets resolved per log-scale resolution time bucket, merged for weekly and monthly figures"
+    )
+    computed_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['dimension', 'value', 'day'], name='tickets_rollup_unique_key'),
+        ]
+        indexes = [
+            models.Index(fields=['computed_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.day} {self.dimension}={self.value or '-'}"
+
+
+class TicketFingerprint(models.Model):
+    """MinHash signature and LSH band keys of a ticket's text, for near-duplicate lookups."""
+
+    ticket = models.OneToOneField(
+        Ticket,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='fingerprint'
+    )
+    signature = models.BinaryField(help_text="MinHash values as little-endian uint32")
+    bands = ArrayField(models.BigIntegerField(), help_text="One hash per LSH band of the signature")
+
+    class Meta:
+        indexes = [
+            GinIndex(fields=['bands'], name='tickets_fingerprint_bands_idx'),
+        ]
+
+    def __str__(self):
+        return f"Fingerprint of ticket {self.ticket_id}"
+
+
+class ArchivedTicket(models.Model):
+    """
+    A ticket closed long ago, moved out of the ticket table by tickets.archive.
+
+    Keeps the ticket's primary key and the columns its detail and search
+    results show. Archived tickets are read-only; restoring one moves it back.
+    """
+
+    id = models.BigIntegerField(primary_key=True)
+    title = models.CharField(max_length=200)
+    description = models.TextField()
+    category = models.CharField(max_length=20, choices=Ticket.CATEGORY_CHOICES)
+    priority = models.CharField(max_length=10, choices=Ticket.PRIORITY_CHOICES)
+    status = models.CharField(max_length=20, choices=Ticket.STATUS_CHOICES)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='archived_tickets')
+    assigned_to = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    admin_feedback = models.TextField(blank=True)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    resolved_at = models.DateTimeField(null=True, blank=True)
+    status_changed_at = models.DateTimeField()
+    public_comment_count = models.PositiveIntegerField(default=0)
+    total_comment_count = models.PositiveIntegerField(default=0)
+    last_public_comment_at = models.DateTimeField(null=True, blank=True)
+    last_public_comment_author = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        db_index=False,
+        related_name='+'
+    )
+    last_public_comment_excerpt = models.CharField(max_length=COMMENT_EXCERPT_LENGTH + 3, blank=True)
+    first_response_due_at = models.DateTimeField(null=True, blank=True)
+    first_responded_at = models.DateTimeField(null=True, blank=True)
+    resolution_due_at = models.DateTimeField(null=True, blank=True)
+    first_response_breached = models.BooleanField(default=False)
+    resolution_breached = models.BooleanField(default=False)
+    search_vector = SearchVectorField(null=True)
+    archived_at = models.DateTimeField(default=timezone.now)
+
+    # Columns copied from and back to the ticket table, which shares their names
+    COPIED_FIELDS = (
+        'id', 'title', 'description', 'category', 'priority', 'status', 'user_id', 'assigned_to_id',
+        'admin_feedback', 'created_at', 'updated_at', 'resolved_at', 'status_changed_at',
+        'public_comment_count', 'total_comment_count', 'last_public_comment_at', 'last_public_comment_author_id',
+        'last_public_comment_excerpt', 'first_response_due_at', 'first_responded_at', 'resolution_due_at',
+        'first_response_breached', 'resolution_breached', 'search_vector',
+    )
+
+    is_open = False
+    is_resolved = True
+    is_archived = True
+
+    class Meta:
+        ordering = ['-created_at']
+        # Only what lookups by id and search need; the archive is never listed or filtered in bulk
+        indexes = [
+            GinIndex(fields=['search_vector'], name='tickets_archived_search_idx'),
+        ]
+
+    def __str__(self):
+        return f"#{self.id} - {self.title} (archived)"
+
+
+class ArchivedTicketComment(models.Model):
+    """A comment of an archived ticket, with its original primary key."""
+
+    id = models.BigIntegerField(primary_key=True)
+    # Served by the (ticket, created_at) index
+    ticket = models.ForeignKey(ArchivedTicket, on_delete=models.CASCADE, db_index=False, related_name='comments')
+    author = models.ForeignKey(User, on_delete=models.CASCADE, related_name='+')
+    content = models.TextField()
+    is_internal = models.BooleanField(default=False)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+
+    COPIED_FIELDS = ('id', 'ticket_id', 'author_id', 'content', 'is_internal', 'created_at', 'updated_at')
+
+    class Meta:
+        ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['ticket', 'created_at']),
+        ]
+
+    def __str__(self):
+        return f"Comment on archived #{self.ticket_id}"
+
+    @property
+    def is_admin_comment(self):
+        return self.author.is_staff or self.author.is_superuser
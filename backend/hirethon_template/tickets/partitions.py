@@ -0,0 +1,175 @@
+import logging
+import re
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+
+from django.conf import settings
+from django.db import OperationalError, connection, transaction
+from django.utils import timezone
+
+from hirethon_template.tickets.activity import refresh_comment_activity
+from hirethon_template.tickets.models import TicketComment
+from hirethon_template.tickets.search import update_search_vectors
+
+logger = logging.getLogger(__name__)
+
+# TicketComment is range partitioned by month of created_at (migration 0016)
+COMMENT_TABLE = TicketComment._meta.db_table
+# Dropping a partition briefly locks the whole table; give up rather than queue writers behind it
+DROP_LOCK_TIMEOUT = '5s'
+# SQLSTATE of lock_timeout expiring
+LOCK_NOT_AVAILABLE = '55P03'
+_BOUNDS = re.compile(r"FROM \((.+)\) TO \((.+)\)")
+
+
+def month_start(moment):
+    """Midnight UTC on the first day of the month ``moment`` falls in."""
+    moment = moment.astimezone(dt_timezone.utc)
+    return datetime(moment.year, moment.month, 1, tzinfo=dt_timezone.utc)
+
+
+def add_months(month, count):
+    index = month.year * 12 + month.month - 1 + count
+    return month.replace(year=index // 12, month=index % 12 + 1)
+
+
+def partition_name(month, table=COMMENT_TABLE):
+    return f'{table}_p{month:%Y_%m}'
+
+
+def _bound(value):
+    # Bounds read back as quoted timestamptz literals, or MINVALUE/MAXVALUE
+    if value in ('MINVALUE', 'MAXVALUE'):
+        return None
+    return datetime.fromisoformat(value.strip("'"))
+
+
+def partitions(table=COMMENT_TABLE):
+    """``(name, lower, upper)`` of each partition of ``table`` in range order; open bounds are None."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT child.relname, pg_get_expr(child.relpartbound, child.oid)
+            FROM pg_inherits
+            JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+            WHERE pg_inherits.inhparent = %s::regclass
+            """,
+            [table],
+        )
+        rows = cursor.fetchall()
+    result = []
+    for name, bounds in rows:
+        lower, upper = _BOUNDS.search(bounds).groups()
+        result.append((name, _bound(lower), _bound(upper)))
+    return sorted(result, key=lambda partition: partition[1] or datetime.min.replace(tzinfo=dt_timezone.utc))
+
+
+def create_partitions(first, last, table=COMMENT_TABLE):
+    """Create the monthly partitions of ``table`` from month ``first`` through ``last``; returns their names."""
+    created = []
+    month = first
+    with connection.cursor() as cursor:
+        while month <= last:
+            name = partition_name(month, table)
+            # Indexes, the primary key and foreign keys are inherited from the parent
+            cursor.execute(
+                f"CREATE TABLE IF NOT EXISTS {connection.ops.quote_name(name)} "
+                f"PARTITION OF {connection.ops.quote_name(table)} FOR VALUES FROM (%s) TO (%s)",
+                [month, add_months(month, 1)],
+            )
+            created.append(name)
+            month = add_months(month, 1)
+    return created
+
+
+def ensure_comment_partitions(now=None, ahead=None):
+    """
+    Make sure comment partitions exist for this month and ``ahead`` months after it.
+
+    Starts after the newest existing partition, so a gap left while the task
+    did not run is filled too. A comment whose month has no partition cannot
+    be inserted, which is why this runs daily well ahead of need.
+    """
+    now = now or timezone.now()
+    ahead = settings.TICKET_COMMENT_PARTITIONS_AHEAD if ahead is None else ahead
+    current = month_start(now)
+    uppers = [upper for _name, _lower, upper in partitions() if upper is not None]
+    first = max(uppers) if uppers else current
+    created = create_partitions(first, add_months(current, ahead))
+    if created:
+        logger.info(f"Created comment partitions {', '.join(created)}")
+    return created
+
+
+def ensure_comment_months(first, last):
+    """
+    Create the partitions missing for comments from ``first`` through ``last``; returns their names.
+
+    Restoring archived comments needs this, as the partitions of the months
+    archiving emptied may have been dropped since.
+    """
+    covered = partitions()
+    created = []
+    month = month_start(first)
+    while month <= last:
+        if not any(
+            (lower is None or lower <= month) and (upper is None or month < upper)
+            for _name, lower, upper in covered
+        ):
+            created += create_partitions(month, month)
+        month = add_months(month, 1)
+    if created:
+        logger.info(f"Recreated comment partitions {', '.join(created)}")
+    return created
+
+
+def drop_comment_partitions(before, include_comments=False, dry_run=False):
+    """
+    Drop the comment partitions that end on or before ``before``; returns their names.
+
+    Only empty partitions go unless ``include_comments`` is set, in which case
+    their comments are deleted with them and the comment-derived columns of
+    the affected tickets are recomputed. Dropping a partition is a catalog
+    change rather than a row-by-row DELETE, so it costs the same at any size.
+    Partitions of the current month or later are never dropped, since new
+    comments would have nowhere to go.
+    """
+    before = min(before, month_start(timezone.now()))
+    dropped = []
+    for name, _lower, upper in partitions():
+        if upper is None or upper > before:
+            continue
+
+        quoted = connection.ops.quote_name(name)
+        try:
+            with transaction.atomic(), connection.cursor() as cursor:
+                cursor.execute(f"SET LOCAL lock_timeout = '{DROP_LOCK_TIMEOUT}'")
+                cursor.execute(f"LOCK TABLE {quoted} IN ACCESS EXCLUSIVE MODE")
+                cursor.execute(f"SELECT DISTINCT ticket_id FROM {quoted}")
+                ticket_ids = [ticket_id for ticket_id, in cursor.fetchall()]
+                if ticket_ids and not include_comments:
+                    logger.debug(f"Keeping comment partition {name}, it still has comments")
+                    continue
+                if dry_run:
+                    dropped.append(name)
+                    continue
+
+                cursor.execute(f"DROP TABLE {quoted}")
+                refresh_comment_activity(ticket_ids)
+                update_search_vectors(ticket_ids)
+        except OperationalError as error:
+            if getattr(error.__cause__, 'sqlstate', None) != LOCK_NOT_AVAILABLE:
+                raise
+            logger.warning(f"Could not lock comment partition {name} in time, leaving it for the next run")
+            continue
+        dropped.append(name)
+        logger.info(f"Dropped comment partition {name} ({len(ticket_ids)} tickets had comments in it)")
+    return dropped
+
+
+def maintain_comment_partitions(now=None):
+    """Create upcoming partitions and drop the empty ones archiving has cleared out."""
+    now = now or timezone.now()
+    created = ensure_comment_partitions(now)
+    dropped = drop_comment_partitions(month_start(now - timedelta(days=settings.TICKET_ARCHIVE_AFTER_DAYS)))
+    return created, dropped
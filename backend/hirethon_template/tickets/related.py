@@ -0,0 +1,365 @@
+import fcntl
+import json
+import logging
+import os
+import re
+import shutil
+import uuid
+import zlib
+from contextlib import contextmanager
+from pathlib import Path
+
+import numpy as np
+from django.conf import settings
+from django.contrib.postgres.aggregates import StringAgg
+from django.db.models import Q, Value
+
+from hirethon_template.tickets.models import Ticket
+
+logger = logging.getLogger(__name__)
+
+# Tickets whose fixes are worth suggesting
+INDEXED_STATUSES = ('resolved', 'closed')
+# Terms are hashed into this many features, so new words never need a vocabulary rebuild
+FEATURE_BITS = 20
+FEATURES = 1 << FEATURE_BITS
+# Query terms kept, by weight; bounds the postings read per lookup
+QUERY_TERMS = 32
+# Terms in a larger share of the documents say little and have the longest postings,
+# so they are left out of queries once they are in more than COMMON_TERM_DOCUMENTS
+MAX_DOCUMENT_RATIO = 0.2
+COMMON_TERM_DOCUMENTS = 1000
+# Tickets in the delta segment before an incremental update rebuilds the whole index instead
+MAX_DELTA_DOCUMENTS = 2000
+DOCUMENT_BATCH_SIZE = 1000
+RELATED_LIMIT = 5
+# Results fetched per wanted suggestion, as tickets reopened since they were indexed are filtered out
+OVERFETCH = 4
+MIN_SIMILARITY = 0.1
+MANIFEST = 'manifest.json'
+ARRAYS = ('ticket_ids', 'indptr', 'postings', 'weights', 'df')
+_TOKEN = re.compile(r"\w{2,}")
+# Index loaded by this process, with the manifest it was loaded from
+_loaded = {}
+
+
+def ticket_text(*parts):
+    return '\n'.join(part for part in parts if part)
+
+
+def term_counts(text):
+    """Sorted hashed features of the words of ``text`` and how often each occurs."""
+    tokens = _TOKEN.findall(text.lower())
+    hashes = np.fromiter((zlib.crc32(token.encode()) for token in tokens), dtype=np.uint32, count=len(tokens))
+    features, counts = np.unique(hashes & np.uint32(FEATURES - 1), return_counts=True)
+    return features.astype(np.int32), counts
+
+
+def inverse_document_frequency(df, documents):
+    """Smoothed IDF, as scikit-learn's TfidfVectorizer computes it."""
+    return (np.log((1 + documents) / (1 + df)) + 1).astype(np.float32)
+
+
+def build_segment(documents, base_df=None, base_documents=0):
+    """
+    Inverted TF-IDF arrays of ``(ticket id, text)`` documents.
+
+    Postings are stored by feature (CSC): the documents containing feature
+    ``f`` are ``postings[indptr[f]:indptr[f + 1]]``, with their L2-normalized
+    weights at the same positions in ``weights``. IDF is computed over this
+    segment and the ``base_df``/``base_documents`` of the segment it extends.
+    """
+    ticket_ids, features, counts = [], [], []
+    for ticket_id, text in documents:
+        doc_features, doc_counts = term_counts(text)
+        if len(doc_features):
+            ticket_ids.append(ticket_id)
+            features.append(doc_features)
+            counts.append(doc_counts)
+
+    lengths = np.array([len(doc_features) for doc_features in features], dtype=np.int64)
+    features = np.concatenate(features) if features else np.empty(0, dtype=np.int32)
+    counts = np.concatenate(counts) if counts else np.empty(0, dtype=np.int64)
+    df = np.bincount(features, minlength=FEATURES).astype(np.int32)
+    idf = inverse_document_frequency(
+        df if base_df is None else df + base_df, len(ticket_ids) + base_documents
+    )
+
+    documents = np.repeat(np.arange(len(ticket_ids), dtype=np.int32), lengths)
+    weights = (1 + np.log(counts)).astype(np.float32) * idf[features]
+    norms = np.sqrt(np.bincount(documents, weights=weights ** 2, minlength=len(ticket_ids)))
+    weights /= norms[documents].astype(np.float32)
+
+    order = np.argsort(features, kind='stable')
+    indptr = np.zeros(FEATURES + 1, dtype=np.int64)
+    np.cumsum(df, out=indptr[1:])
+    return {
+        'ticket_ids': np.array(ticket_ids, dtype=np.int64),
+        'indptr': indptr,
+        'postings': documents[order],
+        'weights': weights[order],
+        'df': df,
+    }
+
+
+class Segment:
+    """Arrays of a segment directory, memory-mapped so every process shares them through the page cache."""
+
+    def __init__(self, path):
+        self.path = path
+        for name in ARRAYS:
+            # Plain views of the maps; slicing a memmap subclass costs more than the read itself
+            setattr(self, name, np.load(path / f'{name}.npy', mmap_mode='r').view(np.ndarray))
+
+    def __len__(self):
+        return len(self.ticket_ids)
+
+    def scores(self, features, weights, min_score):
+        """Ticket ids and dot products of the documents scoring at least ``min_score`` against the query."""
+        starts, ends = self.indptr[features], self.indptr[features + 1]
+        lengths = ends - starts
+        if not lengths.any():
+            return np.empty(0, dtype=np.int64), np.empty(0)
+
+        postings = np.concatenate([self.postings[start:end] for start, end in zip(starts, ends)])
+        contributions = np.concatenate([self.weights[start:end] for start, end in zip(starts, ends)])
+        contributions *= np.repeat(weights, lengths).astype(np.float32)
+        # Accumulating into one slot per document beats sorting the postings once queries touch many
+        scores = np.bincount(postings, weights=contributions, minlength=len(self))
+        documents = np.flatnonzero(scores >= min_score)
+        return self.ticket_ids[documents], scores[documents]
+
+
+class RelatedIndex:
+    """
+    A base segment built from every indexed ticket, plus a small delta segment.
+
+    Incremental updates only rewrite the delta; a ticket in the delta replaces
+    its entry in the base.
+    """
+
+    def __init__(self, base, delta=None):
+        self.segments = [segment for segment in (base, delta) if segment is not None]
+        self.documents = sum(len(segment) for segment in self.segments)
+        self.df = base.df if delta is None else base.df + delta.df
+        self.idf = inverse_document_frequency(self.df, self.documents)
+        self.replaced = np.sort(delta.ticket_ids) if delta is not None else None
+
+    @classmethod
+    def load(cls, directory, manifest):
+        delta = manifest['delta'] and Segment(directory / manifest['delta'])
+        return cls(Segment(directory / manifest['base']), delta)
+
+    def query_vector(self, text):
+        """The highest weighted features of ``text`` and their normalized TF-IDF weights."""
+        features, counts = term_counts(text)
+        keep = self.df[features] <= max(MAX_DOCUMENT_RATIO * self.documents, COMMON_TERM_DOCUMENTS)
+        features, counts = features[keep], counts[keep]
+        weights = (1 + np.log(counts)) * self.idf[features]
+        if len(features) > QUERY_TERMS:
+            top = np.argpartition(-weights, QUERY_TERMS - 1)[:QUERY_TERMS]
+            features, weights = features[top], weights[top]
+        norm = np.sqrt((weights ** 2).sum())
+        return features, (weights / norm if norm else weights)
+
+    def search(self, text, limit=RELATED_LIMIT, exclude=(), min_score=MIN_SIMILARITY, among=None):
+        """
+        Best matching ``(ticket id, cosine similarity)`` pairs for ``text``, best first.
+
+        ``among``, an array of ticket ids, restricts the results to those
+        tickets before the best ``limit`` are picked.
+        """
+        features, weights = self.query_vector(text)
+        if not len(features):
+            return []
+
+        ticket_ids, scores = [], []
+        for position, segment in enumerate(self.segments):
+            segment_ids, segment_scores = segment.scores(features, weights, min_score)
+            if position == 0 and self.replaced is not None:
+                current = ~np.isin(segment_ids, self.replaced, assume_unique=True)
+                segment_ids, segment_scores = segment_ids[current], segment_scores[current]
+            ticket_ids.append(segment_ids)
+            scores.append(segment_scores)
+        ticket_ids, scores = np.concatenate(ticket_ids), np.concatenate(scores)
+
+        keep = ~np.isin(ticket_ids, list(exclude))
+        if among is not None:
+            keep &= np.isin(ticket_ids, among)
+        ticket_ids, scores = ticket_ids[keep], scores[keep]
+        if len(scores) > limit:
+            top = np.argpartition(-scores, limit - 1)[:limit]
+            ticket_ids, scores = ticket_ids[top], scores[top]
+        order = np.lexsort((ticket_ids, -scores))
+        return [(int(ticket_ids[index]), float(scores[index])) for index in order]
+
+
+def index_directory():
+    return Path(settings.TICKET_RELATED_INDEX_DIR)
+
+
+def get_index():
+    """The index this process has mapped, reloaded when a worker published a new one; None before the first build."""
+    directory = index_directory()
+    try:
+        # A few dozen bytes naming the current segments, which are never reused
+        manifest = (directory / MANIFEST).read_text()
+    except FileNotFoundError:
+        return None
+
+    loaded = _loaded.get(directory)
+    if loaded is None or loaded[0] != manifest:
+        try:
+            loaded = _loaded[directory] = (manifest, RelatedIndex.load(directory, json.loads(manifest)))
+        except FileNotFoundError:
+            # The segments were replaced since the manifest was read; keep the previous index
+            return loaded and loaded[1]
+    return loaded[1]
+
+
+def ticket_documents(ticket_ids=None, batch_size=DOCUMENT_BATCH_SIZE):
+    """
+    ``(ticket id, text)`` of resolved and closed tickets, by primary key batches.
+
+    The text is the title, description, resolution notes and public comments.
+    """
+    tickets = Ticket.objects.filter(status__in=INDEXED_STATUSES)
+    if ticket_ids is not None:
+        tickets = tickets.filter(pk__in=ticket_ids)
+    tickets = tickets.annotate(
+        comment_text=StringAgg(
+            'comments__content', '\n', filter=Q(comments__is_internal=False), default=Value('')
+        )
+    )
+    last_id = 0
+    while True:
+        rows = list(
+            tickets.filter(pk__gt=last_id).order_by('pk')
+            .values_list('pk', 'title', 'description', 'admin_feedback', 'comment_text')[:batch_size]
+        )
+        for ticket_id, *parts in rows:
+            yield ticket_id, ticket_text(*parts)
+        if len(rows) < batch_size:
+            return
+        last_id = rows[-1][0]
+
+
+@contextmanager
+def _write_lock(directory):
+    """Serialize writers across processes; readers never lock."""
+    directory.mkdir(parents=True, exist_ok=True)
+    with open(directory / '.lock', 'w') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def _write_segment(directory, arrays):
+    """Write a segment under a fresh name, renamed into place once complete."""
+    name = f'segment-{uuid.uuid4().hex}'
+    staging = directory / f'.{name}'
+    staging.mkdir()
+    for array_name in ARRAYS:
+        np.save(staging / f'{array_name}.npy', arrays[array_name])
+    staging.rename(directory / name)
+    return name
+
+
+def _publish(directory, base, delta=None):
+    """Point the manifest at new segments atomically and drop the others."""
+    staging = directory / f'.{MANIFEST}.{uuid.uuid4().hex}'
+    staging.write_text(json.dumps({'base': base, 'delta': delta}))
+    os.replace(staging, directory / MANIFEST)
+    # Processes that mapped the old files keep reading them until they reload
+    for path in directory.iterdir():
+        if path.is_dir() and path.name not in (base, delta):
+            shutil.rmtree(path, ignore_errors=True)
+
+
+def _rebuild(directory):
+    arrays = build_segment(ticket_documents())
+    _publish(directory, _write_segment(directory, arrays))
+    return len(arrays['ticket_ids'])
+
+
+def rebuild_index():
+    """Index every resolved and closed ticket from scratch; returns the number of tickets indexed."""
+    directory = index_directory()
+    with _write_lock(directory):
+        indexed = _rebuild(directory)
+    logger.info(f"Rebuilt the related tickets index with {indexed} tickets")
+    return indexed
+
+
+def add_tickets(ticket_ids):
+    """
+    Index or refresh ``ticket_ids`` by rewriting the delta segment with them.
+
+    The delta is rebuilt from the database with the current IDF; once it holds
+    more than ``MAX_DELTA_DOCUMENTS`` tickets the whole index is rebuilt.
+    """
+    directory = index_directory()
+    with _write_lock(directory):
+        manifest_path = directory / MANIFEST
+        if not manifest_path.exists():
+            return _rebuild(directory)
+
+        manifest = json.loads(manifest_path.read_text())
+        base = Segment(directory / manifest['base'])
+        delta_ids = set(ticket_ids)
+        if manifest['delta']:
+            delta_ids.update(Segment(directory / manifest['delta']).ticket_ids.tolist())
+        if len(delta_ids) > MAX_DELTA_DOCUMENTS:
+            return _rebuild(directory)
+
+        arrays = build_segment(ticket_documents(delta_ids), base.df, len(base))
+        _publish(directory, manifest['base'], _write_segment(directory, arrays))
+    logger.info(f"Indexed tickets {sorted(ticket_ids)} for related ticket suggestions")
+    return len(arrays['ticket_ids'])
+
+
+def related_tickets(ticket, tickets=None, limit=RELATED_LIMIT):
+    """
+    Resolved and closed tickets among ``tickets`` (default: all) similar to ``ticket``.
+
+    The ids of the resolved and closed ``tickets`` are read first and the
+    index only ranks those, so a user with few tickets of their own still gets
+    the best of them rather than whatever survives a global top list. Returns
+    dicts ready for the API, best match first, or an empty list while the
+    index has not been built.
+    """
+    index = get_index()
+    if index is None:
+        return []
+    among = None
+    if tickets is not None:
+        among = np.fromiter(
+            tickets.filter(status__in=INDEXED_STATUSES).values_list('id', flat=True), dtype=np.int64
+        )
+        if not len(among):
+            return []
+    matches = index.search(
+        ticket_text(ticket.title, ticket.description), limit * OVERFETCH, exclude=[ticket.pk], among=among
+    )
+    if not matches:
+        return []
+
+    rows = (
+        (Ticket.objects.all() if tickets is None else tickets)
+        .filter(status__in=INDEXED_STATUSES)
+        .only('id', 'title', 'status', 'resolved_at')
+        .in_bulk([ticket_id for ticket_id, _score in matches])
+    )
+    return [
+        {
+            'id': ticket_id,
+            'title': rows[ticket_id].title,
+            'status': rows[ticket_id].status,
+            'resolved_at': rows[ticket_id].resolved_at,
+            'similarity': round(score, 2),
+        }
+        for ticket_id, score in matches
+        if ticket_id in rows
+    ][:limit]
@@ -0,0 +1,360 @@
+import logging
+import math
+from collections import Counter, defaultdict
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import (
+    Aggregate,
+    Case,
+    CharField,
+    Count,
+    Exists,
+    F,
+    FloatField,
+    Func,
+    Max,
+    Min,
+    OuterRef,
+    Q,
+    Value,
+    When,
+)
+from django.db.models.functions import Floor, Greatest, Least, Ln, TruncDate
+from django.utils import timezone
+
+from hirethon_template.tickets.models import Ticket, TicketDailyRollup, TicketEvent
+
+logger = logging.getLogger(__name__)
+
+# Ticket column each rollup dimension is broken down by
+DIMENSIONS = {
+    TicketDailyRollup.ALL: None,
+    TicketDailyRollup.CATEGORY: "category",
+    TicketDailyRollup.PRIORITY: "priority",
+    TicketDailyRollup.ASSIGNEE: "assigned_to_id",
+}
+INTERVALS = ("day", "week", "month")
+# Resolution time histogram resolution: bucket i holds times in [2**(i/4), 2**((i+1)/4)) seconds
+BUCKETS_PER_OCTAVE = 4
+# Events are re-read this far behind the last refresh, to catch transactions that committed late
+REWIND = timedelta(minutes=10)
+
+
+class Percentile(Aggregate):
+    """PostgreSQL ``percentile_cont`` ordered-set aggregate."""
+
+    function = "PERCENTILE_CONT"
+    template = "%(function)s(%(percentile)s) WITHIN GROUP (ORDER BY %(expressions)s)"
+    output_field = FloatField()
+
+    def __init__(self, expression, percentile, **extra):
+        super().__init__(expression, percentile=float(percentile), **extra)
+
+
+def resolution_seconds():
+    return Func(F("resolved_at") - F("created_at"), template="EXTRACT(EPOCH FROM %(expressions)s)",
+                output_field=FloatField())
+
+
+def left_backlog_at():
+    """When a ticket stopped counting as open: resolution, or a move to closed without one."""
+    return Least(
+        "resolved_at",
+        Case(When(status__in=["resolved", "closed"], then="status_changed_at")),
+    )
+
+
+def histogram_percentile(histogram, percentile):
+    """Approximate percentile of a resolution time histogram, in seconds."""
+    rank = percentile * sum(histogram)
+    if not rank:
+        return None
+    seen = 0
+    for index, count in enumerate(histogram):
+        seen += count
+        if count and seen >= rank:
+            # Geometric middle of the bucket
+            return round(2 ** ((index + 0.5) / BUCKETS_PER_OCTAVE))
+
+
+def merge_histograms(histograms):
+    merged = []
+    for histogram in histograms:
+        if len(histogram) > len(merged):
+            merged += [0] * (len(histogram) - len(merged))
+        for index, count in enumerate(histogram):
+            merged[index] += count
+    return merged
+
+
+def _day_start(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def _date_range(first_day, last_day):
+    return [first_day + timedelta(days=offset) for offset in range((last_day - first_day).days + 1)]
+
+
+def _runs(days):
+    """Split sorted days into ``(first, last)`` runs of consecutive days."""
+    runs = []
+    for day in days:
+        if runs and day == runs[-1][1] + timedelta(days=1):
+            runs[-1][1] = day
+        else:
+            runs.append([day, day])
+    return runs
+
+
+def _key(value):
+    return "" if value is None else str(value)
+
+
+def _by_day(queryset, day_field, key, **aggregates):
+    """``{(day, key): row}`` for ``queryset`` grouped by local day and dimension key."""
+    rows = (
+        queryset.order_by()
+        .annotate(day=TruncDate(day_field), key=key)
+        .values("day", "key")
+        .annotate(n=Count("id"), **aggregates)
+    )
+    return {(row["day"], _key(row["key"])): row for row in rows}
+
+
+def _by_key(queryset, key):
+    rows = queryset.order_by().annotate(key=key).values("key").annotate(n=Count("id"))
+    return Counter({_key(row["key"]): row["n"] for row in rows})
+
+
+def _dimension_key(field):
+    return F(field) if field else Value("", output_field=CharField())
+
+
+def opening_backlogs(start):
+    """``{dimension: Counter}`` of the tickets open at ``start``, by their current breakdown values."""
+    still_open = Ticket.objects.annotate(left_at=left_backlog_at()).filter(
+        Q(left_at__isnull=True) | Q(left_at__gte=start), created_at__lt=start
+    )
+    return {dimension: _by_key(still_open, _dimension_key(field)) for dimension, field in DIMENSIONS.items()}
+
+
+def advance_backlogs(backlogs, since, until):
+    """Move ``backlogs`` counted at ``since`` on to ``until`` with the tickets created and gone in between."""
+    tickets = Ticket.objects.all()
+    left = tickets.annotate(left_at=left_backlog_at())
+    for dimension, field in DIMENSIONS.items():
+        key = _dimension_key(field)
+        backlogs[dimension].update(_by_key(tickets.filter(created_at__gte=since, created_at__lt=until), key))
+        backlogs[dimension].subtract(_by_key(left.filter(left_at__gte=since, left_at__lt=until), key))
+
+
+def compute_days(first_day, last_day, computed_at=None, backlogs=None):
+    """
+    Build (unsaved) rollup rows for every day from ``first_day`` to ``last_day``.
+
+    Every metric is a grouped range scan over the whole run, so a run costs a
+    fixed number of queries per dimension however many days it covers. The
+    backlog is carried forward from ``backlogs``, the tickets open at the
+    start of the run by dimension (counted when not given), which are left
+    advanced to the end of the run. They go by each ticket's current values,
+    so a ticket moved to another category or assignee counts under the new
+    one on every day. Closures come from the event log, so a ticket closed
+    and reopened still counts on the day it was closed.
+    """
+    computed_at = computed_at or timezone.now()
+    start, end = _day_start(first_day), _day_start(last_day + timedelta(days=1))
+    days = _date_range(first_day, last_day)
+    tickets = Ticket.objects.all()
+    left = tickets.annotate(left_at=left_backlog_at())
+    closed = TicketEvent.objects.filter(
+        kind=TicketEvent.STATUS_CHANGED, new_value="closed", created_at__gte=start, created_at__lt=end
+    ).filter(Exists(Ticket.objects.filter(pk=OuterRef("ticket_id"))))
+    resolved = tickets.filter(resolved_at__gte=start, resolved_at__lt=end)
+    bucket = Floor(Ln(Greatest(resolution_seconds(), Value(1.0))) * (BUCKETS_PER_OCTAVE / math.log(2)))
+    if backlogs is None:
+        backlogs = opening_backlogs(start)
+
+    rows = []
+    for dimension, field in DIMENSIONS.items():
+        key = _dimension_key(field)
+        created = _by_day(tickets.filter(created_at__gte=start, created_at__lt=end), "created_at", key)
+        resolutions = _by_day(
+            resolved, "resolved_at", key,
+            p50=Percentile(resolution_seconds(), 0.5), p90=Percentile(resolution_seconds(), 0.9),
+        )
+        closures = _by_day(closed, "created_at", F(f"ticket__{field}") if field else key)
+        departures = _by_day(left.filter(left_at__gte=start, left_at__lt=end), "left_at", key)
+        backlog = backlogs[dimension]
+
+        histograms = defaultdict(list)
+        for row in resolved.order_by().annotate(day=TruncDate("resolved_at"), key=key, bucket=bucket).values(
+            "day", "key", "bucket"
+        ).annotate(n=Count("id")):
+            histogram = histograms[(row["day"], _key(row["key"]))]
+            index = int(row["bucket"])
+            histogram += [0] * (index + 1 - len(histogram))
+            histogram[index] = row["n"]
+
+        keys = {value for _day, value in (*created, *resolutions, *closures, *departures)} | set(backlog)
+        if field is None:
+            keys.add("")
+        for value in sorted(keys):
+            open_tickets = backlog[value]
+            for day in days:
+                open_tickets += _count(created, day, value) - _count(departures, day, value)
+                resolution = resolutions.get((day, value), {})
+                rollup = TicketDailyRollup(
+                    day=day, dimension=dimension, value=value,
+                    created=_count(created, day, value),
+                    resolved=_count(resolutions, day, value),
+                    closed=_count(closures, day, value),
+                    backlog=max(open_tickets, 0),
+                    resolution_p50_seconds=_seconds(resolution.get("p50")),
+                    resolution_p90_seconds=_seconds(resolution.get("p90")),
+                    resolution_histogram=histograms.get((day, value), []),
+                    computed_at=computed_at,
+                )
+                # Quiet breakdown values are left out; missing rows read as zeros
+                if field is None or rollup.created or rollup.resolved or rollup.closed or rollup.backlog:
+                    rows.append(rollup)
+            backlog[value] = open_tickets
+    return rows
+
+
+def _count(metric, day, value):
+    row = metric.get((day, value))
+    return row["n"] if row else 0
+
+
+def _seconds(value):
+    return None if value is None else round(value)
+
+
+def changed_days(since):
+    """Local days whose rollups may differ because of the events recorded since ``since``."""
+    touched = TicketEvent.objects.filter(created_at__gte=since).values("ticket_id")
+    # Every day a touched ticket has history on: a new category or assignee moves the
+    # ticket between breakdown values on all of them
+    days = set(
+        TicketEvent.objects.filter(ticket_id__in=touched)
+        .order_by()
+        .annotate(day=TruncDate("created_at"))
+        .values_list("day", flat=True)
+        .distinct()
+    )
+    days.update(
+        Ticket.objects.filter(pk__in=touched, resolved_at__isnull=False)
+        .order_by()
+        .annotate(day=TruncDate("resolved_at"))
+        .values_list("day", flat=True)
+        .distinct()
+    )
+    return days
+
+
+def refresh_rollups(now=None):
+    """
+    Recompute the rollups of the days that changed since the last refresh; returns the number of days.
+
+    The first refresh covers every day since the oldest ticket. Later ones
+    recompute the days touched by new events plus the days since the last
+    rolled-up one, each run of consecutive days in its own transaction. Days
+    old enough for their tickets to be archived keep the rollups they have.
+    """
+    now = now or timezone.now()
+    today = timezone.localdate(now)
+    latest = TicketDailyRollup.objects.filter(dimension=TicketDailyRollup.ALL, value="").aggregate(
+        day=Max("day"), computed_at=Max("computed_at")
+    )
+    if latest["day"] is None:
+        first_created = Ticket.objects.aggregate(first=Min("created_at"))["first"]
+        if first_created is None:
+            return 0
+        days = set(_date_range(timezone.localdate(first_created), today))
+    else:
+        days = changed_days(latest["computed_at"] - REWIND)
+        days.update(_date_range(latest["day"], today))
+        # Older days may count archived tickets the ticket table no longer has
+        archived_before = today - timedelta(days=settings.TICKET_ARCHIVE_AFTER_DAYS)
+        days = {day for day in days if day >= archived_before}
+
+    days = sorted(day for day in days if day <= today)
+    # Only the first run counts its opening backlog; later ones advance it over the gap before them
+    backlogs, counted_until = None, None
+    for first_day, last_day in _runs(days):
+        if backlogs is None:
+            backlogs = opening_backlogs(_day_start(first_day))
+        else:
+            advance_backlogs(backlogs, counted_until, _day_start(first_day))
+        with transaction.atomic():
+            rows = compute_days(first_day, last_day, now, backlogs)
+            TicketDailyRollup.objects.filter(day__gte=first_day, day__lte=last_day).delete()
+            TicketDailyRollup.objects.bulk_create(rows, batch_size=1000)
+        counted_until = _day_start(last_day + timedelta(days=1))
+        logger.debug(f"Rolled up tickets from {first_day} to {last_day} ({len(rows)} rows)")
+
+    if days:
+        logger.info(f"Refreshed ticket rollups for {len(days)} days")
+    return len(days)
+
+
+def bucket_start(day, interval):
+    if interval == "week":
+        return day - timedelta(days=day.weekday())
+    if interval == "month":
+        return day.replace(day=1)
+    return day
+
+
+def get_rollup_series(start, end, interval="day", dimension=TicketDailyRollup.ALL):
+    """
+    Ticket flow between two dates, bucketed by day, ISO week or month.
+
+    Counts add up over a bucket and the backlog is the one at the end of its
+    last rolled-up day. Daily percentiles are exact; weekly and monthly ones
+    come from the merged histograms and are accurate to about 10%.
+    """
+    rollups = TicketDailyRollup.objects.filter(dimension=dimension, day__gte=start, day__lte=end).order_by(
+        "value", "day"
+    )
+    computed_through = TicketDailyRollup.objects.filter(dimension=TicketDailyRollup.ALL, value="").aggregate(
+        day=Max("day")
+    )["day"]
+    if computed_through is None:
+        return []
+
+    buckets = defaultdict(list)
+    for rollup in rollups:
+        buckets[(bucket_start(rollup.day, interval), rollup.value)].append(rollup)
+
+    series = []
+    for (first_day, value), rows in sorted(buckets.items()):
+        last_day = min(_bucket_end(first_day, interval), end, computed_through)
+        if interval == "day":
+            p50, p90 = rows[0].resolution_p50_seconds, rows[0].resolution_p90_seconds
+        else:
+            histogram = merge_histograms(row.resolution_histogram for row in rows)
+            p50, p90 = histogram_percentile(histogram, 0.5), histogram_percentile(histogram, 0.9)
+        series.append({
+            "bucket": first_day,
+            "value": value,
+            "created": sum(row.created for row in rows),
+            "resolved": sum(row.resolved for row in rows),
+            "closed": sum(row.closed for row in rows),
+            # A breakdown value without a row on the last day had nothing open that day
+            "backlog": rows[-1].backlog if rows[-1].day == last_day else 0,
+            "resolution_p50_seconds": p50,
+            "resolution_p90_seconds": p90,
+        })
+    return series
+
+
+def _bucket_end(first_day, interval):
+    if interval == "week":
+        return first_day + timedelta(days=6)
+    if interval == "month":
+        next_month = (first_day.replace(day=28) + timedelta(days=4)).replace(day=1)
+        return next_month - timedelta(days=1)
+    return first_day
@@ -0,0 +1,88 @@
+import logging
+
+from django.contrib.postgres.aggregates import StringAgg
+from django.contrib.postgres.search import SearchHeadline, SearchQuery, SearchRank, SearchVector, SearchVectorField
+from django.db.models import F, OuterRef, Subquery, TextField, Value
+from django.db.models.expressions import CombinedExpression
+from django.db.models.functions import Coalesce
+
+from hirethon_template.tickets.models import Ticket, TicketComment
+
+logger = logging.getLogger(__name__)
+
+# Text search configuration used for both the stored vectors and the queries.
+SEARCH_CONFIG = "english"
+HEADLINE_OPTIONS = {"max_words": 35, "min_words": 15, "max_fragments": 2}
+
+
+def search_vector_expression():
+    """Weighted document: title (A), description (B), public comments (C)."""
+    public_comments = (
+        TicketComment.objects.filter(ticket=OuterRef("pk"), is_internal=False)
+        .order_by()
+        .values("ticket")
+        .annotate(text=StringAgg("content", delimiter=" "))
+        .values("text")
+    )
+    title = SearchVector("title", weight="A", config=SEARCH_CONFIG)
+    description = SearchVector("description", weight="B", config=SEARCH_CONFIG)
+    comments = SearchVector(
+        Coalesce(Subquery(public_comments), Value(""), output_field=TextField()),
+        weight="C",
+        config=SEARCH_CONFIG,
+    )
+    return title + description + comments
+
+
+def update_search_vectors(ticket_ids):
+    """Recompute the stored search vector for the given tickets with one UPDATE."""
+    # queryset.update() skips Ticket.save(), so neither updated_at nor the counters move.
+    return Ticket.objects.filter(pk__in=ticket_ids).update(search_vector=search_vector_expression())
+
+
+def append_comment_vector(comment):
+    """Add a new public comment's words to its ticket's stored vector without re-reading the other comments."""
+    vector = SearchVector(Value(comment.content, output_field=TextField()), weight="C", config=SEARCH_CONFIG)
+    appended = Ticket.objects.filter(pk=comment.ticket_id, search_vector__isnull=False).update(
+        search_vector=CombinedExpression(F("search_vector"), "||", vector, output_field=SearchVectorField())
+    )
+    # A ticket whose vector was never built (bulk inserts, a pending rebuild) gets the full one
+    if not appended:
+        update_search_vectors([comment.ticket_id])
+
+
+def rebuild_search_vectors(batch_size=1000):
+    """Backfill search vectors in primary key batches; returns the number of tickets updated."""
+    updated = 0
+    last_id = 0
+    while True:
+        ids = list(Ticket.objects.filter(pk__gt=last_id).order_by("pk").values_list("pk", flat=True)[:batch_size])
+        if not ids:
+            break
+        updated += update_search_vectors(ids)
+        last_id = ids[-1]
+        logger.info(f"Rebuilt ticket search vectors up to id {last_id}")
+    return updated
+
+
+def build_search_query(text):
+    return SearchQuery(text, search_type="websearch", config=SEARCH_CONFIG)
+
+
+def filter_by_search(queryset, text):
+    """Restrict a ticket queryset to full-text matches (served by the GIN index)."""
+    return queryset.filter(search_vector=build_search_query(text))
+
+
+def search_tickets(queryset, text):
+    """Return full-text matches ranked by relevance with highlighted title and description snippets."""
+    query = build_search_query(text)
+    return (
+        queryset.filter(search_vector=query)
+        .annotate(
+            rank=SearchRank(F("search_vector"), query),
+            title_highlight=SearchHeadline("title", query, config=SEARCH_CONFIG, highlight_all=True),
+            description_highlight=SearchHeadline("description", query, config=SEARCH_CONFIG, **HEADLINE_OPTIONS),
+        )
+        .order_by("-rank", "-id")
+    )
@@ -0,0 +1,92 @@
+from functools import partial
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Subquery
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from hirethon_template.tickets.activity import record_comment_removed
+from hirethon_template.tickets.counters import ASSIGNEE, apply_ticket_change
+from hirethon_template.tickets.events import publish_comment_event, publish_ticket_deleted
+from hirethon_template.tickets.history import current_actor_id, record_events
+from hirethon_template.tickets.models import (
+    SupportAgent,
+    Ticket,
+    TicketComment,
+    TicketCounter,
+    TicketEvent,
+    TicketTombstone,
+)
+from hirethon_template.tickets.search import update_search_vectors
+from hirethon_template.tickets.tasks import rebalance_agent_tickets
+
+User = get_user_model()
+
+
+@receiver(post_delete, sender=Ticket)
+def ticket_deleted(sender, instance, **kwargs):
+    """Remove a deleted ticket from the counters and leave a tombstone (runs inside the delete transaction)."""
+    apply_ticket_change(instance.counter_state(), None)
+    TicketTombstone.objects.create(
+        object_type=TicketTombstone.TICKET, object_id=instance.pk, ticket_id=instance.pk, owner_id=instance.user_id
+    )
+    # The event log has no foreign key on tickets, so the history outlives them
+    record_events([
+        TicketEvent(
+            ticket_id=instance.pk, kind=TicketEvent.DELETED, old_value=instance.status, actor_id=current_actor_id()
+        )
+    ])
+    publish_ticket_deleted(instance)
+
+
+@receiver(post_delete, sender=User)
+def assignee_deleted(sender, instance, **kwargs):
+    """Drop assignee counters; the tickets are unassigned with a bulk SET NULL that sends no signals."""
+    TicketCounter.objects.filter(scope=ASSIGNEE, scope_id=instance.id).delete()
+
+
+@receiver(post_delete, sender=TicketComment)
+def comment_deleted(sender, instance, origin=None, **kwargs):
+    """Drop a deleted comment from its ticket's search vector and activity columns and leave a tombstone."""
+    # Comments removed along with their ticket leave nothing to update but the tombstone
+    if not isinstance(origin, Ticket):
+        update_search_vectors([instance.ticket_id])
+        record_comment_removed(instance)
+        record_events([
+            TicketEvent(
+                ticket_id=instance.ticket_id, kind=TicketEvent.COMMENT_DELETED, old_value=str(instance.pk),
+                actor_id=current_actor_id(), is_internal=instance.is_internal,
+            )
+        ])
+    # The owner is read in the INSERT itself, so cascaded deletes cost no extra lookups
+    TicketTombstone.objects.create(
+        object_type=TicketTombstone.COMMENT, object_id=instance.pk, ticket_id=instance.ticket_id,
+        owner_id=Subquery(Ticket.objects.filter(pk=instance.ticket_id).values('user_id')),
+        is_internal=instance.is_internal,
+    )
+    # Comments removed along with their ticket are covered by its ticket.deleted event
+    if not isinstance(origin, Ticket):
+        publish_comment_event(instance, 'deleted')
+
+
+def schedule_rebalance(user_id):
+    """Queue a rebalance if the user still holds open tickets."""
+    if Ticket.objects.filter(assigned_to_id=user_id, status__in=Ticket.OPEN_STATUSES).exists():
+        transaction.on_commit(partial(rebalance_agent_tickets.delay, user_id), robust=True)
+
+
+@receiver(post_save, sender=User)
+def agent_user_saved(sender, instance, created, update_fields=None, **kwargs):
+    """Hand a deactivated or demoted admin's open tickets to the other agents."""
+    if created or (update_fields is not None and not {'is_active', 'is_staff'} & set(update_fields)):
+        return
+    if not (instance.is_active and instance.is_staff):
+        schedule_rebalance(instance.pk)
+
+
+@receiver(post_save, sender=SupportAgent)
+def support_agent_saved(sender, instance, created, **kwargs):
+    """Hand an agent's open tickets to the others when they become unavailable."""
+    if not instance.is_available:
+        schedule_rebalance(instance.user_id)
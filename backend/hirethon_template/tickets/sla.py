@@ -0,0 +1,200 @@
+import logging
+from datetime import datetime, time, timedelta
+from functools import lru_cache
+from zoneinfo import ZoneInfo
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from hirethon_template.tickets.events import publish_sla_breached
+from hirethon_template.tickets.history import record_events
+from hirethon_template.tickets.models import SLAPolicy, Ticket, TicketEvent
+
+logger = logging.getLogger(__name__)
+
+# Tickets flagged per UPDATE by the breach sweeper
+SWEEP_BATCH_SIZE = 500
+# Columns apply_sla() reads from the locked row rather than a possibly stale instance
+LOCKED_STATE_FIELDS = (
+    "sla_paused_at", "sla_paused_seconds", "first_responded_at", "first_response_breached", "resolution_breached"
+)
+
+
+class WallClock:
+    """SLA clock that runs around the clock."""
+
+    def add(self, moment, seconds):
+        return moment + timedelta(seconds=seconds)
+
+    def elapsed(self, since, until):
+        return max(0, int((until - since).total_seconds()))
+
+
+class BusinessHours:
+    """SLA clock that only runs between ``start_hour`` and ``end_hour`` on ``weekdays`` in ``tz``."""
+
+    def __init__(self, start_hour, end_hour, weekdays, tz):
+        if not weekdays or not 0 <= start_hour < end_hour <= 24:
+            raise ValueError("Business hours need at least one weekday and start_hour < end_hour")
+        self.start = time(start_hour)
+        self.end_hour = end_hour
+        self.weekdays = frozenset(weekdays)
+        self.tz = tz
+
+    def windows(self, moment):
+        """Yield the working periods from ``moment``'s local day onwards."""
+        day = moment.astimezone(self.tz).date()
+        while True:
+            if day.weekday() in self.weekdays:
+                start = datetime.combine(day, self.start, tzinfo=self.tz)
+                yield start, start + timedelta(hours=self.end_hour - self.start.hour)
+            day += timedelta(days=1)
+
+    def add(self, moment, seconds):
+        remaining = timedelta(seconds=seconds)
+        for start, end in self.windows(moment):
+            start = max(start, moment)
+            if start >= end:
+                continue
+            if start + remaining <= end:
+                return start + remaining
+            remaining -= end - start
+
+    def elapsed(self, since, until):
+        total = timedelta()
+        for start, end in self.windows(since):
+            if start >= until:
+                break
+            total += max(timedelta(), min(end, until) - max(start, since))
+        return int(total.total_seconds())
+
+
+@lru_cache(maxsize=None)
+def _business_hours(start_hour, end_hour, weekdays, time_zone):
+    return BusinessHours(start_hour, end_hour, weekdays, ZoneInfo(time_zone))
+
+
+def clock_for(policy):
+    if not policy.business_hours_only:
+        return WallClock()
+    start_hour, end_hour = settings.TICKET_SLA_BUSINESS_HOURS
+    return _business_hours(start_hour, end_hour, tuple(settings.TICKET_SLA_BUSINESS_DAYS), settings.TIME_ZONE)
+
+
+def policy_for(priority, category):
+    """The most specific policy for a priority and category; a priority match beats a category match."""
+    policies = SLAPolicy.objects.filter(priority__in=[priority, ""], category__in=[category, ""])
+    return max(policies, key=lambda policy: (policy.priority != "", policy.category != ""), default=None)
+
+
+def _policy(ticket, policies):
+    if policies is None:
+        return policy_for(ticket.priority, ticket.category)
+    key = (ticket.priority, ticket.category)
+    if key not in policies:
+        policies[key] = policy_for(*key)
+    return policies[key]
+
+
+def apply_sla(ticket, old_state, now, policies=None):
+    """
+    Update the SLA columns of ``ticket`` before it is saved; returns whether any changed.
+
+    ``old_state`` is the locked row as read by ``Ticket.save()`` (None on
+    creation). The clock only runs in ``SLA_RUNNING_STATUSES``; the time spent
+    paused is measured on the policy's clock and pushes both deadlines back, so
+    every deadline is ``created_at + target + paused`` on that clock.
+
+    Batch callers pass a ``policies`` dict to look each policy up only once.
+    """
+    running = ticket.status in Ticket.SLA_RUNNING_STATUSES
+    if old_state is None:
+        ticket.sla_policy = _policy(ticket, policies)
+        ticket.sla_paused_seconds = 0
+        ticket.sla_paused_at = None if running else now
+        return _set_deadlines(ticket, ticket.created_at or now, now)
+
+    # The instance may predate a comment or a sweep; the locked row is authoritative
+    for field in LOCKED_STATE_FIELDS:
+        setattr(ticket, field, old_state[field])
+    was_running = old_state["status"] in Ticket.SLA_RUNNING_STATUSES
+    changed = False
+
+    if (ticket.priority, ticket.category) != (old_state["priority"], old_state["category"]):
+        ticket.sla_policy = _policy(ticket, policies)
+        changed = True
+    if was_running and not running:
+        ticket.sla_paused_at = now
+        changed = True
+    elif running and not was_running:
+        if ticket.sla_paused_at is not None and ticket.sla_policy is not None:
+            ticket.sla_paused_seconds += clock_for(ticket.sla_policy).elapsed(ticket.sla_paused_at, now)
+        ticket.sla_paused_at = None
+        changed = True
+
+    if changed:
+        _set_deadlines(ticket, ticket.created_at, now)
+        if ticket.is_resolved and ticket.resolution_due_at and now > ticket.resolution_due_at:
+            # Resolved late, possibly before the sweeper caught it
+            ticket.resolution_breached = True
+    return changed
+
+
+def _set_deadlines(ticket, created_at, now):
+    policy = ticket.sla_policy
+    if policy is None:
+        ticket.first_response_due_at = ticket.resolution_due_at = None
+        ticket.first_response_breached = ticket.resolution_breached = False
+        return True
+
+    clock = clock_for(policy)
+    paused = ticket.sla_paused_seconds
+    ticket.first_response_due_at = clock.add(created_at, policy.first_response_minutes * 60 + paused)
+    ticket.resolution_due_at = clock.add(created_at, policy.resolution_minutes * 60 + paused)
+    # Deadlines pushed into the future are no longer breached; past ones are left to the sweeper
+    if ticket.first_response_due_at > now:
+        ticket.first_response_breached = False
+    if ticket.resolution_due_at > now:
+        ticket.resolution_breached = False
+    return True
+
+
+def _sweep(kind, due_field, breached_field, filters, now, batch_size):
+    running = Ticket.objects.filter(status__in=Ticket.SLA_RUNNING_STATUSES, **{breached_field: False}, **filters)
+    flagged = 0
+    while True:
+        with transaction.atomic():
+            # Reads the partial index in due order and stops at the first ticket that is not late;
+            # rows being saved right now are left for the next run
+            batch = list(
+                running.filter(**{f"{due_field}__lte": now})
+                .order_by(due_field)
+                .select_for_update(skip_locked=True)
+                .values("id", "assigned_to_id")[:batch_size]
+            )
+            if not batch:
+                return flagged
+            ids = [row["id"] for row in batch]
+            flagged += Ticket.objects.filter(pk__in=ids).update(**{breached_field: True}, updated_at=now)
+            record_events([
+                TicketEvent(
+                    ticket_id=pk, kind=TicketEvent.SLA_BREACHED, new_value=kind, is_internal=True, created_at=now
+                )
+                for pk in ids
+            ])
+            for row in batch:
+                publish_sla_breached(row["id"], row["assigned_to_id"], kind)
+
+
+def sweep_sla_breaches(now=None, batch_size=SWEEP_BATCH_SIZE):
+    """Flag running tickets past a deadline in batched UPDATEs; returns ``(response, resolution)`` counts."""
+    now = now or timezone.now()
+    response = _sweep(
+        "first_response", "first_response_due_at", "first_response_breached",
+        {"first_responded_at__isnull": True}, now, batch_size,
+    )
+    resolution = _sweep("resolution", "resolution_due_at", "resolution_breached", {}, now, batch_size)
+    if response or resolution:
+        logger.info(f"Flagged SLA breaches: {response} first response, {resolution} resolution")
+    return response, resolution
@@ -0,0 +1,124 @@
+import hashlib
+import json
+import logging
+import time
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from hirethon_template.tickets.models import Ticket
+
+logger = logging.getLogger(__name__)
+
+CACHE_KEY_PREFIX = "tickets:stats"
+# How long to wait for another worker that is already computing the same stats.
+LOCK_WAIT_SECONDS = 2.0
+LOCK_POLL_INTERVAL = 0.05
+
+
+def _choice_keys(choices):
+    return [value for value, _label in choices]
+
+
+def _build_aggregates():
+    """Return one Count(filter=...) per breakdown cell, keyed by a flat alias."""
+    aggregates = {"total": Count("id")}
+    for status in _choice_keys(Ticket.STATUS_CHOICES):
+        aggregates[f"status__{status}"] = Count("id", filter=Q(status=status))
+    for priority in _choice_keys(Ticket.PRIORITY_CHOICES):
+        aggregates[f"priority__{priority}"] = Count("id", filter=Q(priority=priority))
+    for category in _choice_keys(Ticket.CATEGORY_CHOICES):
+        aggregates[f"category__{category}"] = Count("id", filter=Q(category=category))
+    for status in _choice_keys(Ticket.STATUS_CHOICES):
+        for priority in _choice_keys(Ticket.PRIORITY_CHOICES):
+            aggregates[f"cross__{status}__{priority}"] = Count("id", filter=Q(status=status, priority=priority))
+    return aggregates
+
+
+def _day_start(day):
+    """Local midnight starting ``day``, the same day boundary ``__date`` lookups use."""
+    return timezone.make_aware(datetime.combine(day, datetime.min.time()))
+
+
+def filter_tickets(queryset, filters):
+    """Apply the stats filters (date range, assignee, category) to a ticket queryset."""
+    # Plain range bounds on created_at, unlike a cast to date, can use its index
+    if filters.get("created_after"):
+        queryset = queryset.filter(created_at__gte=_day_start(filters["created_after"]))
+    if filters.get("created_before"):
+        queryset = queryset.filter(created_at__lt=_day_start(filters["created_before"] + timedelta(days=1)))
+    if filters.get("unassigned"):
+        queryset = queryset.filter(assigned_to__isnull=True)
+    elif filters.get("assigned_to"):
+        queryset = queryset.filter(assigned_to_id=filters["assigned_to"])
+    if filters.get("category"):
+        queryset = queryset.filter(category=filters["category"])
+    return queryset
+
+
+def compute_ticket_stats(queryset):
+    """Compute every ticket breakdown with a single conditional-aggregation query."""
+    row = queryset.order_by().aggregate(**_build_aggregates())
+
+    statuses = _choice_keys(Ticket.STATUS_CHOICES)
+    priorities = _choice_keys(Ticket.PRIORITY_CHOICES)
+
+    stats = {"total": row["total"]}
+    stats.update({status: row[f"status__{status}"] for status in statuses})
+    stats["by_priority"] = {priority: row[f"priority__{priority}"] for priority in priorities}
+    stats["by_category"] = {
+        category: row[f"category__{category}"] for category in _choice_keys(Ticket.CATEGORY_CHOICES)
+    }
+    stats["by_status_priority"] = {
+        status: {priority: row[f"cross__{status}__{priority}"] for priority in priorities} for status in statuses
+    }
+    return stats
+
+
+def _cache_key(filters):
+    normalized = json.dumps({key: str(value) for key, value in filters.items() if value}, sort_keys=True)
+    return f"{CACHE_KEY_PREFIX}:{hashlib.md5(normalized.encode()).hexdigest()}"
+
+
+def get_ticket_stats(filters=None):
+    """
+    Return cached ticket statistics for a filter set.
+
+    Entries are stored with a soft expiry inside the value and a longer hard
+    TTL. Once the soft expiry passes, the first caller to grab the lock
+    recomputes while everybody else keeps serving the stale copy, so a
+    popular dashboard never sends a burst of identical aggregates to the DB.
+    """
+    filters = filters or {}
+    timeout = settings.TICKET_STATS_CACHE_TIMEOUT
+    key = _cache_key(filters)
+    lock_key = f"{key}:lock"
+
+    cached = cache.get(key)
+    if cached and cached["expires_at"] > time.time():
+        return cached["stats"]
+
+    owns_lock = cache.add(lock_key, 1, timeout=int(LOCK_WAIT_SECONDS * 5))
+    if not owns_lock:
+        if cached:
+            return cached["stats"]
+        # Nothing to serve yet; give the lock holder a moment to finish.
+        deadline = time.monotonic() + LOCK_WAIT_SECONDS
+        while time.monotonic() < deadline:
+            time.sleep(LOCK_POLL_INTERVAL)
+            cached = cache.get(key)
+            if cached:
+                return cached["stats"]
+        logger.warning(f"Ticket stats lock wait timed out for {key}, computing directly")
+
+    try:
+        stats = compute_ticket_stats(filter_tickets(Ticket.objects.all(), filters))
+        cache.set(key, {"stats": stats, "expires_at": time.time() + timeout}, timeout=timeout * 10)
+    finally:
+        if owns_lock:
+            cache.delete(lock_key)
+
+    return stats
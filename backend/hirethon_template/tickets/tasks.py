@@ -0,0 +1,93 @@
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from config import celery_app
+from hirethon_template.tickets.archive import archive_closed_tickets
+from hirethon_template.tickets.assignment import auto_assign, rebalance_agent
+from hirethon_template.tickets.automation import close_abandoned_tickets, escalate_idle_tickets
+from hirethon_template.tickets.models import TicketTombstone
+from hirethon_template.tickets.partitions import maintain_comment_partitions
+from hirethon_template.tickets.related import add_tickets, rebuild_index
+from hirethon_template.tickets.rollups import refresh_rollups
+from hirethon_template.tickets.sla import sweep_sla_breaches
+
+logger = logging.getLogger(__name__)
+
+
+@celery_app.task()
+def prune_ticket_tombstones():
+    """Delete tombstones older than the changes feed retention window."""
+    cutoff = timezone.now() - timedelta(days=settings.TICKET_TOMBSTONE_RETENTION_DAYS)
+    deleted, _ = TicketTombstone.objects.filter(deleted_at__lt=cutoff).delete()
+    logger.info(f"Pruned {deleted} ticket tombstones older than {cutoff.isoformat()}")
+    return deleted
+
+
+@celery_app.task()
+def assign_ticket(ticket_id):
+    """Assign a newly created ticket to the least loaded available agent."""
+    return auto_assign([ticket_id])
+
+
+@celery_app.task()
+def assign_unassigned_tickets():
+    """Assign open tickets left unassigned, e.g. while no agent was available."""
+    return auto_assign()
+
+
+@celery_app.task()
+def rebalance_agent_tickets(user_id):
+    """Move the open tickets of a deactivated or unavailable agent to the other agents."""
+    return rebalance_agent(user_id)
+
+
+@celery_app.task()
+def flag_sla_breaches():
+    """Flag running tickets that passed their first-response or resolution deadline."""
+    return sweep_sla_breaches()
+
+
+@celery_app.task()
+def escalate_stale_tickets():
+    """Raise the priority of open tickets nobody has touched for a while."""
+    return escalate_idle_tickets()
+
+
+@celery_app.task()
+def auto_close_pending_tickets():
+    """Close tickets that have waited on the user for too long."""
+    return close_abandoned_tickets()
+
+
+@celery_app.task()
+def refresh_ticket_rollups():
+    """Recompute the daily analytics rollups of the days that changed since the last run."""
+    return refresh_rollups()
+
+
+@celery_app.task()
+def archive_old_tickets():
+    """Move tickets closed for longer than the retention window to the archive tables."""
+    return archive_closed_tickets()
+
+
+@celery_app.task()
+def rotate_comment_partitions():
+    """Create the upcoming monthly comment partitions and drop old ones left empty."""
+    created, dropped = maintain_comment_partitions()
+    return len(created), len(dropped)
+
+
+@celery_app.task()
+def index_related_ticket(ticket_id):
+    """Add a newly resolved or closed ticket to the related tickets index."""
+    return add_tickets([ticket_id])
+
+
+@celery_app.task()
+def rebuild_related_tickets_index():
+    """Rebuild the related tickets index from every resolved and closed ticket."""
+    return rebuild_index()
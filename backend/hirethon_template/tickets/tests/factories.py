@@ -0,0 +1,23 @@
+from factory import Faker, SubFactory
+from factory.django import DjangoModelFactory
+
+from hirethon_template.tickets.models import Ticket, TicketComment
+from hirethon_template.users.tests.factories import UserFactory
+
+
+class TicketFactory(DjangoModelFactory):
+    title = Faker("sentence", nb_words=5)
+    description = Faker("paragraph")
+    user = SubFactory(UserFactory)
+
+    class Meta:
+        model = Ticket
+
+
+class TicketCommentFactory(DjangoModelFactory):
+    ticket = SubFactory(TicketFactory)
+    author = SubFactory(UserFactory)
+    content = Faker("paragraph")
+
+    class Meta:
+        model = TicketComment
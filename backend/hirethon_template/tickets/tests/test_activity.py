@@ -0,0 +1,140 @@
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from hirethon_template.tickets.activity import refresh_comment_activity
+from hirethon_template.tickets.models import Ticket
+from hirethon_template.tickets.tests.factories import TicketCommentFactory, TicketFactory
+from hirethon_template.users.models import User
+from hirethon_template.users.tests.factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+ACTIVITY_COLUMNS = [
+    "public_comment_count", "total_comment_count", "last_comment_at", "last_comment_author_id",
+    "last_public_comment_at", "last_public_comment_author_id", "last_public_comment_excerpt",
+]
+
+
+def _activity(ticket):
+    return Ticket.objects.values(*ACTIVITY_COLUMNS).get(pk=ticket.pk)
+
+
+class TestActivityColumns:
+    def test_comment_create_and_delete(self):
+        ticket = TicketFactory()
+        public = TicketCommentFactory(ticket=ticket, content="x" * 150)
+        internal = TicketCommentFactory(ticket=ticket, is_internal=True)
+
+        activity = _activity(ticket)
+        assert (activity["public_comment_count"], activity["total_comment_count"]) == (1, 2)
+        assert activity["last_comment_at"] == internal.created_at
+        assert activity["last_comment_author_id"] == internal.author_id
+        assert activity["last_public_comment_at"] == public.created_at
+        assert activity["last_public_comment_excerpt"] == "x" * 100 + "..."
+
+        internal.delete()
+        activity = _activity(ticket)
+        assert (activity["public_comment_count"], activity["total_comment_count"]) == (1, 1)
+        assert activity["last_comment_at"] == public.created_at
+
+        public.delete()
+        assert _activity(ticket) == {
+            "public_comment_count": 0, "total_comment_count": 0, "last_comment_at": None,
+            "last_comment_author_id": None, "last_public_comment_at": None, "last_public_comment_author_id": None,
+            "last_public_comment_excerpt": "",
+        }
+
+    def test_comment_edits_are_reflected(self):
+        ticket = TicketFactory()
+        comment = TicketCommentFactory(ticket=ticket, content="before")
+
+        comment.content = "after"
+        comment.save()
+        assert _activity(ticket)["last_public_comment_excerpt"] == "after"
+
+        comment.is_internal = True
+        comment.save()
+        activity = _activity(ticket)
+        assert (activity["public_comment_count"], activity["total_comment_count"]) == (0, 1)
+        assert activity["last_public_comment_at"] is None
+
+    def test_stale_ticket_save_keeps_counts(self):
+        ticket = TicketFactory()
+        stale = Ticket.objects.get(pk=ticket.pk)
+        TicketCommentFactory(ticket=ticket)
+
+        stale.status = "in_progress"
+        stale.save()
+
+        assert _activity(ticket)["public_comment_count"] == 1
+        assert Ticket.objects.get(pk=ticket.pk).status == "in_progress"
+
+    def test_activity_moves_on_comments_and_saves(self):
+        ticket = TicketFactory()
+        before = Ticket.objects.get(pk=ticket.pk).last_activity_at
+
+        comment = TicketCommentFactory(ticket=ticket)
+
+        assert Ticket.objects.get(pk=ticket.pk).last_activity_at == max(before, comment.created_at)
+
+    def test_refresh_matches_incremental_updates(self):
+        ticket = TicketFactory()
+        TicketCommentFactory.create_batch(3, ticket=ticket)
+        TicketCommentFactory(ticket=ticket, is_internal=True)
+        expected = _activity(ticket)
+
+        Ticket.objects.filter(pk=ticket.pk).update(public_comment_count=0, total_comment_count=0, last_comment_at=None)
+        refresh_comment_activity([ticket.pk])
+
+        assert _activity(ticket) == expected
+
+    def test_list_does_not_read_comments(self, user: User):
+        client = APIClient()
+        client.force_authenticate(user)
+        TicketCommentFactory(ticket=TicketFactory(user=user))
+
+        with CaptureQueriesContext(connection) as queries:
+            data = client.get("/api/tickets/").json()
+
+        assert data[0]["comment_count"] == 1
+        assert not any("tickets_ticketcomment" in query["sql"] for query in queries.captured_queries)
+
+
+class TestQueue:
+    URL = "/api/tickets/queue/"
+
+    def test_open_tickets_least_recently_active_first(self):
+        admin = UserFactory(is_staff=True)
+        client = APIClient()
+        client.force_authenticate(admin)
+        quiet, busy = TicketFactory.create_batch(2)
+        TicketFactory(status="closed")
+        Ticket.objects.filter(pk=quiet.pk).update(last_activity_at=timezone.now() - timedelta(days=2))
+        TicketCommentFactory(ticket=busy)
+
+        data = client.get(self.URL).json()
+
+        assert [row["id"] for row in data] == [quiet.id, busy.id]
+
+    def test_pages_by_last_activity(self):
+        admin = UserFactory(is_staff=True)
+        client = APIClient()
+        client.force_authenticate(admin)
+        tickets = TicketFactory.create_batch(3)
+
+        first = client.get(self.URL, {"page_size": 2}).json()
+        second = client.get(first["next"]).json()
+
+        ids = [row["id"] for row in first["results"] + second["results"]]
+        assert ids == [ticket.id for ticket in tickets]
+
+    def test_admin_only(self, user: User):
+        client = APIClient()
+        client.force_authenticate(user)
+
+        assert client.get(self.URL).status_code == 403
@@ -0,0 +1,124 @@
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+
+import numpy as np
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+from rest_framework.test import APIClient
+
+from hirethon_template.tickets.analytics import (
+    TicketColumns,
+    agent_throughput,
+    load_columns,
+    resolution_histogram,
+    resolution_percentiles,
+    weekly_cohorts,
+)
+from hirethon_template.tickets.models import Ticket
+from hirethon_template.tickets.tests.factories import TicketFactory
+from hirethon_template.users.tests.factories import UserFactory
+
+HOUR = 3600
+# A Monday
+WEEK_START = datetime(2026, 10, 5, tzinfo=dt_timezone.utc)
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def _columns(rows):
+    return TicketColumns.from_rows(rows, chunk_size=2)
+
+
+class TestColumns:
+    def test_from_rows_grows_past_capacity(self):
+        rows = [(index, np.nan, 1, 2, index % 2) for index in range(5)]
+
+        columns = TicketColumns.from_rows(rows, capacity=1, chunk_size=2)
+
+        assert len(columns) == 5
+        assert columns.created.tolist() == [0, 1, 2, 3, 4]
+        assert columns.assignee.dtype == np.int64 and columns.priority.dtype == np.int8
+        assert not columns.is_resolved.any()
+
+    def test_percentiles_histogram_and_throughput(self):
+        start = WEEK_START.timestamp()
+        columns = _columns([
+            (start, start + 2 * HOUR, 0, 0, 7),
+            (start, start + 6 * HOUR, 3, 0, 7),
+            (start, start + 30 * HOUR, 3, 1, 7),
+            (start, start + 10 * HOUR, 3, 1, 9),
+            (start, np.nan, 3, 1, 9),
+        ])
+
+        percentiles = resolution_percentiles(columns)
+        histogram = {bucket["min_hours"]: bucket["tickets"] for bucket in resolution_histogram(columns)}
+        agents = agent_throughput(columns, days=2)
+
+        assert percentiles["all"]["p50"] == 8 * HOUR
+        assert percentiles["by_priority"]["low"]["p50"] == 2 * HOUR
+        assert percentiles["by_priority"]["medium"]["p50"] is None
+        assert (histogram[1], histogram[4], histogram[8], histogram[24]) == (1, 1, 1, 1)
+        assert agents == [
+            {"assignee_id": 7, "resolved": 3, "per_day": 1.5, "median_resolution_seconds": 6 * HOUR},
+            {"assignee_id": 9, "resolved": 1, "per_day": 0.5, "median_resolution_seconds": 10 * HOUR},
+        ]
+
+    def test_weekly_cohorts(self):
+        first, second = WEEK_START.timestamp(), (WEEK_START + timedelta(days=7)).timestamp()
+        columns = _columns([
+            (first, first + HOUR, 0, 0, 0),
+            (first, second + HOUR, 0, 0, 0),
+            (first, np.nan, 0, 0, 0),
+            (second, np.nan, 0, 0, 0),
+        ])
+
+        cohorts = weekly_cohorts(columns, weeks=2, now=WEEK_START + timedelta(days=9))
+
+        assert [(cohort["week"].isoformat(), cohort["tickets"]) for cohort in cohorts] == [
+            ("2026-10-05", 3), ("2026-10-12", 1)
+        ]
+        assert cohorts[0]["resolved_within_weeks"] == [0.3333, 0.6667]
+        assert cohorts[1]["resolved_within_weeks"] == [0.0]
+
+
+@pytest.mark.django_db
+class TestReport:
+    def test_load_columns_from_database(self):
+        assignee = UserFactory(is_staff=True)
+        resolved = TicketFactory(priority="high", category="billing", assigned_to=assignee)
+        TicketFactory()
+        Ticket.objects.filter(pk=resolved.pk).update(resolved_at=resolved.created_at + timedelta(hours=3))
+
+        columns = load_columns()
+        done = columns.select(columns.is_resolved)
+
+        assert len(columns) == 2 and len(done) == 1
+        assert done.resolved[0] - done.created[0] == pytest.approx(3 * HOUR)
+        assert (done.priority[0], done.category[0], done.assignee[0]) == (2, 3, assignee.pk)
+        assert sorted(columns.assignee.tolist()) == [0, assignee.pk]
+
+    def test_endpoint_is_admin_only(self, user):
+        client = APIClient()
+        client.force_authenticate(user)
+        assert client.get("/api/tickets/analytics/resolution/").status_code == 403
+
+        client.force_authenticate(UserFactory(is_staff=True))
+        TicketFactory()
+        response = client.get("/api/tickets/analytics/resolution/", {"days": 7, "weeks": 4})
+
+        assert response.status_code == 200
+        assert len(response.json()["cohorts"]) == 4
+        assert response.json()["cohorts"][-1]["tickets"] == 1
+
+    def test_command_prints_report(self, capsys):
+        TicketFactory()
+
+        call_command("ticket_resolution_report", "--weeks", "2")
+
+        assert "Weekly cohorts" in capsys.readouterr().out
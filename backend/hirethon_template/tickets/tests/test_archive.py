@@ -0,0 +1,105 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from hirethon_template.tickets.archive import archive_closed_tickets, restore_tickets
+from hirethon_template.tickets.counters import expected_counts, stored_counts
+from hirethon_template.tickets.models import ArchivedTicket, ArchivedTicketComment, Ticket, TicketComment, TicketEvent
+from hirethon_template.tickets.tests.factories import TicketCommentFactory, TicketFactory
+from hirethon_template.users.tests.factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def _closed_long_ago(**kwargs):
+    ticket = TicketFactory(status="closed", **kwargs)
+    Ticket.objects.filter(pk=ticket.pk).update(status_changed_at=timezone.now() - timedelta(days=400))
+    return ticket
+
+
+def _assert_in_sync():
+    assert +stored_counts() == +expected_counts()
+
+
+class TestArchiveClosedTickets:
+    def test_moves_old_closed_tickets_with_their_comments(self):
+        old = _closed_long_ago(title="Printer on fire", description="The office printer caught fire")
+        TicketCommentFactory(ticket=old, content="Extinguished it")
+        TicketCommentFactory(ticket=old, content="Agent note", is_internal=True)
+        recent = TicketFactory(status="closed")
+        still_open = TicketFactory(status="open")
+        Ticket.objects.filter(pk=still_open.pk).update(status_changed_at=timezone.now() - timedelta(days=400))
+
+        assert archive_closed_tickets() == 1
+
+        assert set(Ticket.objects.values_list("pk", flat=True)) == {recent.pk, still_open.pk}
+        archived = ArchivedTicket.objects.get()
+        assert (archived.pk, archived.title, archived.user_id) == (old.pk, old.title, old.user_id)
+        assert archived.public_comment_count == 1 and archived.total_comment_count == 2
+        assert ArchivedTicketComment.objects.filter(ticket=archived).count() == 2
+        assert not TicketComment.objects.filter(ticket_id=old.pk).exists()
+        assert TicketEvent.objects.filter(ticket_id=old.pk, kind=TicketEvent.ARCHIVED).exists()
+        _assert_in_sync()
+
+    def test_batches_and_reruns_are_harmless(self):
+        tickets = [_closed_long_ago() for _ in range(5)]
+
+        assert archive_closed_tickets(batch_size=2) == 5
+        assert archive_closed_tickets(batch_size=2) == 0
+        assert set(ArchivedTicket.objects.values_list("pk", flat=True)) == {ticket.pk for ticket in tickets}
+
+    def test_restore_brings_the_ticket_back(self):
+        ticket = _closed_long_ago(title="Printer on fire")
+        TicketCommentFactory(ticket=ticket, content="Extinguished it")
+        archive_closed_tickets()
+
+        assert restore_tickets([ticket.pk, 0]) == 1
+
+        restored = Ticket.objects.get(pk=ticket.pk)
+        assert (restored.title, restored.status, restored.public_comment_count) == ("Printer on fire", "closed", 1)
+        assert restored.comments.count() == 1
+        assert not ArchivedTicket.objects.exists() and not ArchivedTicketComment.objects.exists()
+        assert TicketEvent.objects.filter(ticket_id=ticket.pk, kind=TicketEvent.RESTORED).exists()
+        _assert_in_sync()
+
+
+class TestArchivedTicketsApi:
+    def test_detail_falls_through_to_the_archive(self, user):
+        ticket = _closed_long_ago(user=user)
+        TicketCommentFactory(ticket=ticket, author=user, content="Thanks, works now")
+        TicketCommentFactory(ticket=ticket, content="Agent note", is_internal=True)
+        archive_closed_tickets()
+        client = APIClient()
+
+        client.force_authenticate(user)
+        own = client.get(f"/api/tickets/{ticket.pk}/")
+        client.force_authenticate(UserFactory())
+        other = client.get(f"/api/tickets/{ticket.pk}/")
+        client.force_authenticate(UserFactory(is_staff=True))
+        admin = client.get(f"/api/tickets/{ticket.pk}/")
+
+        assert own.status_code == 200 and own.json()["is_archived"] is True
+        assert [comment["content"] for comment in own.json()["comments"]] == ["Thanks, works now"]
+        assert other.status_code == 404
+        assert len(admin.json()["comments"]) == 2
+
+    def test_search_tops_up_from_the_archive(self, user):
+        archived = _closed_long_ago(user=user, title="Printer jammed again", description="Paper stuck in tray")
+        archive_closed_tickets()
+        current = TicketFactory(user=user, title="Printer offline", description="Cannot reach the printer")
+        TicketFactory(title="Printer of someone else", description="Another printer issue")
+        client = APIClient()
+        client.force_authenticate(user)
+
+        results = client.get("/api/tickets/search/", {"q": "printer"}).json()
+        first_only = client.get("/api/tickets/search/", {"q": "printer", "limit": 1}).json()
+        open_only = client.get("/api/tickets/search/", {"q": "printer", "status": "open"}).json()
+
+        assert [(result["id"], result["is_archived"]) for result in results] == [
+            (current.pk, False),
+            (archived.pk, True),
+        ]
+        assert [result["id"] for result in first_only] == [current.pk]
+        assert [result["id"] for result in open_only] == [current.pk]
@@ -0,0 +1,101 @@
+from types import SimpleNamespace
+
+import pytest
+from rest_framework.test import APIClient
+
+from hirethon_template.tickets import tasks
+from hirethon_template.tickets.assignment import AgentHeap, auto_assign, rebalance_agent
+from hirethon_template.tickets.models import SupportAgent, Ticket
+from hirethon_template.tickets.tests.factories import TicketFactory
+from hirethon_template.users.models import User
+from hirethon_template.users.tests.factories import UserFactory
+
+
+def _agent(user_id, categories=(), max_open_tickets=None):
+    return SimpleNamespace(user_id=user_id, categories=list(categories), max_open_tickets=max_open_tickets)
+
+
+class TestAgentHeap:
+    def test_picks_least_loaded_agent(self):
+        heap = AgentHeap([_agent(1), _agent(2), _agent(3)], {1: 4, 2: 1, 3: 2})
+
+        picks = []
+        for _ in range(4):
+            user_id = heap.pick("bug")
+            heap.assign(user_id)
+            picks.append(user_id)
+
+        assert picks == [2, 2, 3, 2]
+
+    def test_respects_skills_and_capacity(self):
+        heap = AgentHeap([_agent(1, ["billing"]), _agent(2, max_open_tickets=1)], {})
+
+        assert heap.pick("bug") == 2
+        heap.assign(2)
+        assert heap.pick("bug") is None
+        assert heap.pick("billing") == 1
+
+
+@pytest.mark.django_db
+class TestAutoAssign:
+    def test_assigns_by_open_load(self):
+        busy, idle = UserFactory.create_batch(2, is_staff=True)
+        SupportAgent.objects.create(user=busy)
+        SupportAgent.objects.create(user=idle)
+        TicketFactory.create_batch(2, assigned_to=busy)
+        TicketFactory(assigned_to=idle, status="closed")
+        first, second, third = TicketFactory.create_batch(3)
+
+        assert auto_assign() == 3
+
+        tickets = Ticket.objects.filter(pk__in=[first.pk, second.pk, third.pk])
+        assignees = dict(tickets.values_list("pk", "assigned_to"))
+        assert assignees == {first.pk: idle.pk, second.pk: idle.pk, third.pk: busy.pk}
+
+    def test_unavailable_agents_are_skipped(self):
+        SupportAgent.objects.create(user=UserFactory(is_staff=True), is_available=False)
+        SupportAgent.objects.create(user=UserFactory(is_staff=False))
+        ticket = TicketFactory()
+
+        assert auto_assign([ticket.pk]) == 0
+        assert Ticket.objects.get(pk=ticket.pk).assigned_to is None
+
+    def test_create_schedules_assignment_after_commit(
+        self, user: User, monkeypatch, django_capture_on_commit_callbacks
+    ):
+        scheduled = []
+        monkeypatch.setattr(tasks.assign_ticket, "delay", scheduled.append)
+        client = APIClient()
+        client.force_authenticate(user)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            response = client.post(
+                "/api/tickets/", {"title": "Printer on fire", "description": "It is really on fire."}, format="json"
+            )
+
+        assert scheduled == [response.json()["id"]]
+
+    def test_rebalance_deactivated_agent(self, monkeypatch, django_capture_on_commit_callbacks):
+        scheduled = []
+        monkeypatch.setattr(tasks.rebalance_agent_tickets, "delay", scheduled.append)
+        leaving, staying = UserFactory.create_batch(2, is_staff=True)
+        SupportAgent.objects.create(user=leaving)
+        SupportAgent.objects.create(user=staying, categories=["bug"])
+        bug = TicketFactory(assigned_to=leaving, category="bug")
+        billing = TicketFactory(assigned_to=leaving, category="billing")
+
+        with django_capture_on_commit_callbacks(execute=True):
+            leaving.is_active = False
+            leaving.save()
+
+        assert scheduled == [leaving.pk]
+        assert rebalance_agent(leaving.pk) == (1, 1)
+        assert Ticket.objects.get(pk=bug.pk).assigned_to == staying
+        assert Ticket.objects.get(pk=billing.pk).assigned_to is None
+
+    def test_rebalance_ignores_active_agent(self):
+        agent = UserFactory(is_staff=True)
+        SupportAgent.objects.create(user=agent)
+        TicketFactory(assigned_to=agent)
+
+        assert rebalance_agent(agent.pk) == (0, 0)
@@ -0,0 +1,94 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from hirethon_template.tickets import automation
+from hirethon_template.tickets.automation import close_abandoned_tickets, escalate_idle_tickets
+from hirethon_template.tickets.counters import expected_counts, stored_counts
+from hirethon_template.tickets.models import SLAPolicy, Ticket
+from hirethon_template.tickets.tests.factories import TicketFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def _idle(tickets, hours):
+    Ticket.objects.filter(pk__in=[ticket.pk for ticket in tickets]).update(
+        last_activity_at=timezone.now() - timedelta(hours=hours)
+    )
+
+
+class TestEscalation:
+    def test_escalates_idle_running_tickets_one_step(self, settings):
+        settings.TICKET_ESCALATION_IDLE_HOURS = 24
+        low = TicketFactory(priority="low")
+        urgent = TicketFactory(priority="urgent")
+        waiting = TicketFactory(priority="low", status="pending_user")
+        fresh = TicketFactory(priority="low")
+        _idle([low, urgent, waiting], 48)
+
+        assert escalate_idle_tickets(batch_size=1) == 1
+        # The same idle period does not escalate twice
+        assert escalate_idle_tickets() == 0
+
+        priorities = dict(Ticket.objects.values_list("pk", "priority"))
+        assert priorities == {low.pk: "medium", urgent.pk: "urgent", waiting.pk: "low", fresh.pk: "low"}
+        assert stored_counts() == expected_counts()
+
+    def test_escalation_recomputes_sla(self, settings):
+        settings.TICKET_ESCALATION_IDLE_HOURS = 24
+        SLAPolicy.objects.create(first_response_minutes=600, resolution_minutes=6000)
+        high = SLAPolicy.objects.create(priority="high", first_response_minutes=60, resolution_minutes=600)
+        ticket = TicketFactory(priority="medium")
+        _idle([ticket], 48)
+
+        escalate_idle_tickets()
+
+        ticket = Ticket.objects.get(pk=ticket.pk)
+        assert ticket.sla_policy == high
+        assert ticket.first_response_due_at == ticket.created_at + timedelta(minutes=60)
+
+    def test_resumes_after_a_failed_batch(self, settings, monkeypatch):
+        settings.TICKET_ESCALATION_IDLE_HOURS = 24
+        tickets = TicketFactory.create_batch(3, priority="low")
+        _idle(tickets, 48)
+        apply_deltas = automation.apply_deltas
+        calls = []
+
+        def fail_second_batch(deltas):
+            calls.append(deltas)
+            if len(calls) == 2:
+                raise RuntimeError("worker died")
+            apply_deltas(deltas)
+
+        monkeypatch.setattr(automation, "apply_deltas", fail_second_batch)
+        with pytest.raises(RuntimeError):
+            escalate_idle_tickets(batch_size=2)
+        assert Ticket.objects.filter(priority="medium").count() == 2
+
+        assert escalate_idle_tickets(batch_size=2) == 1
+        assert Ticket.objects.filter(priority="medium").count() == 3
+        assert stored_counts() == expected_counts()
+
+
+class TestAutoClose:
+    def test_closes_tickets_pending_past_the_window(
+        self, settings, monkeypatch, django_capture_on_commit_callbacks
+    ):
+        settings.TICKET_AUTO_CLOSE_PENDING_DAYS = 7
+        stale, recent = TicketFactory.create_batch(2, status="pending_user")
+        running = TicketFactory(status="in_progress")
+        Ticket.objects.filter(pk__in=[stale.pk, running.pk]).update(
+            status_changed_at=timezone.now() - timedelta(days=8)
+        )
+
+        indexed = []
+        monkeypatch.setattr(automation, "add_tickets", indexed.append)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            assert close_abandoned_tickets() == 1
+
+        statuses = dict(Ticket.objects.values_list("pk", "status"))
+        assert statuses == {stale.pk: "closed", recent.pk: "pending_user", running.pk: "in_progress"}
+        assert indexed == [[stale.pk]]
+        assert stored_counts() == expected_counts()
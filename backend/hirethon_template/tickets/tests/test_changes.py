@@ -0,0 +1,122 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from hirethon_template.tickets.changes import SYNC_OVERLAP, encode_cursor
+from hirethon_template.tickets.models import Ticket, TicketTombstone
+from hirethon_template.tickets.tasks import prune_ticket_tombstones
+from hirethon_template.tickets.tests.factories import TicketCommentFactory, TicketFactory
+from hirethon_template.users.models import User
+from hirethon_template.users.tests.factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+URL = "/api/tickets/changes/"
+
+
+@pytest.fixture
+def api_client(user: User) -> APIClient:
+    client = APIClient()
+    client.force_authenticate(user)
+    return client
+
+
+def _age(queryset, delta):
+    """Move rows back in time past the sync overlap window."""
+    queryset.update(updated_at=timezone.now() - delta)
+
+
+class TestChangesFeed:
+    def test_full_sync_without_cursor(self, api_client: APIClient, user: User):
+        ticket = TicketFactory(user=user)
+        comment = TicketCommentFactory(ticket=ticket)
+        TicketCommentFactory(ticket=ticket, is_internal=True)
+        TicketFactory(user=UserFactory())
+
+        data = api_client.get(URL).json()
+
+        assert data["reset"] is False
+        assert data["cursor"]
+        assert [row["id"] for row in data["tickets"]] == [ticket.id]
+        assert [(row["id"], row["ticket"]) for row in data["comments"]] == [(comment.id, ticket.id)]
+
+    def test_only_changes_since_cursor(self, api_client: APIClient, user: User):
+        old, changed = TicketFactory.create_batch(2, user=user)
+        _age(Ticket.objects.all(), SYNC_OVERLAP * 2)
+        cursor = api_client.get(URL).json()["cursor"]
+
+        changed.status = "resolved"
+        changed.save()
+        comment = TicketCommentFactory(ticket=changed)
+
+        data = api_client.get(URL, {"since": cursor}).json()
+
+        assert [row["id"] for row in data["tickets"]] == [changed.id]
+        assert data["tickets"][0]["status"] == "resolved"
+        assert [row["id"] for row in data["comments"]] == [comment.id]
+        assert data["deleted"] == {"tickets": [], "comments": []}
+
+    def test_deletions_come_back_as_tombstones(self, api_client: APIClient, user: User):
+        ticket, other = TicketFactory.create_batch(2, user=user)
+        comment = TicketCommentFactory(ticket=other)
+        internal = TicketCommentFactory(ticket=other, is_internal=True)
+        expected = {"tickets": [ticket.id], "comments": [comment.id]}
+        cursor = api_client.get(URL).json()["cursor"]
+
+        ticket.delete()
+        comment.delete()
+        internal.delete()
+        TicketFactory(user=UserFactory()).delete()
+
+        data = api_client.get(URL, {"since": cursor}).json()
+
+        assert data["deleted"] == expected
+
+    def test_admin_sees_everything(self, user: User):
+        admin = UserFactory(is_staff=True)
+        client = APIClient()
+        client.force_authenticate(admin)
+        ticket = TicketFactory(user=user)
+        internal = TicketCommentFactory(ticket=ticket, is_internal=True)
+        internal_id = internal.id
+        cursor = client.get(URL).json()["cursor"]
+
+        internal.delete()
+
+        data = client.get(URL, {"since": cursor}).json()
+        assert data["deleted"]["comments"] == [internal_id]
+
+    def test_comment_made_internal_is_deleted_for_requester(self, api_client: APIClient, user: User):
+        comment = TicketCommentFactory(ticket=TicketFactory(user=user))
+        cursor = api_client.get(URL).json()["cursor"]
+
+        comment.is_internal = True
+        comment.save()
+
+        data = api_client.get(URL, {"since": cursor}).json()
+        assert data["comments"] == []
+        assert data["deleted"]["comments"] == [comment.id]
+
+    def test_expired_cursor_resets(self, api_client: APIClient, settings):
+        cursor = encode_cursor(timezone.now() - timedelta(days=settings.TICKET_TOMBSTONE_RETENTION_DAYS + 1))
+
+        data = api_client.get(URL, {"since": cursor}).json()
+
+        assert data["reset"] is True
+
+    def test_invalid_cursor(self, api_client: APIClient):
+        response = api_client.get(URL, {"since": "not-a-cursor"})
+
+        assert response.status_code == 400
+
+    def test_prune_tombstones(self, settings):
+        TicketFactory().delete()
+        TicketTombstone.objects.update(
+            deleted_at=timezone.now() - timedelta(days=settings.TICKET_TOMBSTONE_RETENTION_DAYS + 1)
+        )
+        TicketFactory().delete()
+
+        assert prune_ticket_tombstones() == 1
+        assert TicketTombstone.objects.count() == 1
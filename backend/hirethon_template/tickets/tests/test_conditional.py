@@ -0,0 +1,71 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from hirethon_template.tickets.tests.factories import TicketCommentFactory, TicketFactory
+from hirethon_template.users.models import User
+from hirethon_template.users.tests.factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def api_client(user: User) -> APIClient:
+    client = APIClient()
+    client.force_authenticate(user)
+    return client
+
+
+class TestTicketDetailConditionalGet:
+    def test_not_modified(self, api_client: APIClient, user: User):
+        ticket = TicketFactory(user=user)
+        response = api_client.get(f"/api/tickets/{ticket.id}/")
+        assert response.status_code == 200
+        assert response["Last-Modified"]
+
+        with CaptureQueriesContext(connection) as context:
+            cached = api_client.get(f"/api/tickets/{ticket.id}/", HTTP_IF_NONE_MATCH=response["ETag"])
+
+        assert cached.status_code == 304
+        # ATOMIC_REQUESTS wraps the view in a savepoint; only one real query runs
+        assert len([query for query in context.captured_queries if "SAVEPOINT" not in query["sql"]]) == 1
+
+    def test_comment_changes_etag(self, api_client: APIClient, user: User):
+        ticket = TicketFactory(user=user)
+        etag = api_client.get(f"/api/tickets/{ticket.id}/")["ETag"]
+
+        TicketCommentFactory(ticket=ticket)
+        response = api_client.get(f"/api/tickets/{ticket.id}/", HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == 200
+        assert response["ETag"] != etag
+
+    def test_other_users_ticket(self, api_client: APIClient):
+        ticket = TicketFactory(user=UserFactory())
+
+        response = api_client.get(f"/api/tickets/{ticket.id}/", HTTP_IF_NONE_MATCH="*")
+
+        assert response.status_code == 404
+
+
+class TestTicketListConditionalGet:
+    @pytest.mark.parametrize("url", ["/api/tickets/", "/api/tickets/my_tickets/", "/api/tickets/?page_size=1"])
+    def test_not_modified(self, api_client: APIClient, user: User, url: str):
+        TicketFactory.create_batch(2, user=user)
+        etag = api_client.get(url)["ETag"]
+
+        assert api_client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+    def test_changes_invalidate(self, api_client: APIClient, user: User):
+        ticket = TicketFactory(user=user)
+        etag = api_client.get("/api/tickets/")["ETag"]
+
+        TicketCommentFactory(ticket=ticket)
+
+        assert api_client.get("/api/tickets/", HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+    def test_etag_varies_per_query(self, api_client: APIClient, user: User):
+        TicketFactory(user=user)
+
+        assert api_client.get("/api/tickets/")["ETag"] != api_client.get("/api/tickets/?ordering=status")["ETag"]
@@ -0,0 +1,73 @@
+import pytest
+from django.core.management import call_command
+
+from hirethon_template.tickets.api.serializers import TicketStatusUpdateSerializer
+from hirethon_template.tickets.counters import expected_counts, get_global_stats, get_user_summary, stored_counts
+from hirethon_template.tickets.models import Ticket, TicketCounter
+from hirethon_template.tickets.tests.factories import TicketFactory
+from hirethon_template.users.tests.factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def _assert_in_sync():
+    assert +stored_counts() == +expected_counts()
+
+
+class TestTicketCounters:
+    def test_create_and_delete(self):
+        tickets = TicketFactory.create_batch(3, status="open", priority="high")
+        _assert_in_sync()
+        assert get_global_stats()["open"] == 3
+
+        tickets[0].delete()
+        _assert_in_sync()
+        assert get_global_stats()["by_priority"]["high"] == 2
+
+    def test_status_move_and_reassignment(self):
+        first_agent = UserFactory(is_staff=True)
+        second_agent = UserFactory(is_staff=True)
+        ticket = TicketFactory(assigned_to=first_agent)
+
+        serializer = TicketStatusUpdateSerializer(
+            ticket, data={"status": "in_progress", "assigned_to": second_agent.id}, partial=True
+        )
+        assert serializer.is_valid(), serializer.errors
+        serializer.save()
+
+        _assert_in_sync()
+        assert get_user_summary(first_agent)["assigned"]["total"] == 0
+        assert get_user_summary(second_agent)["assigned"]["in_progress"] == 1
+
+    def test_stale_instance_save(self):
+        ticket = TicketFactory(status="open")
+        stale = Ticket.objects.get(pk=ticket.pk)
+        ticket.status = "resolved"
+        ticket.save()
+
+        stale.priority = "urgent"
+        stale.save()
+
+        _assert_in_sync()
+
+    def test_user_summary(self):
+        user = UserFactory()
+        TicketFactory.create_batch(2, user=user, status="open")
+        TicketFactory(user=user, status="closed")
+
+        summary = get_user_summary(user)
+
+        assert summary == {
+            "requested": {"open": 2, "in_progress": 0, "pending_user": 0, "resolved": 0, "closed": 1, "total": 3}
+        }
+
+    def test_reconcile_command(self):
+        TicketFactory.create_batch(2)
+        Ticket.objects.update(status="closed")  # bypasses save(), so the counters drift
+
+        call_command("reconcile_ticket_counters", "--dry-run")
+        assert +stored_counts() != +expected_counts()
+
+        call_command("reconcile_ticket_counters")
+        _assert_in_sync()
+        assert TicketCounter.objects.get(scope="global", dimension="status", value="closed").count == 2
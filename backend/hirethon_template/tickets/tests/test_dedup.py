@@ -0,0 +1,85 @@
+import pytest
+from django.core.management import call_command
+from rest_framework.test import APIClient
+
+from hirethon_template.tickets.dedup import band_keys, find_duplicates, signature, similarity
+from hirethon_template.tickets.models import Ticket, TicketFingerprint
+from hirethon_template.tickets.tests.factories import TicketFactory
+from hirethon_template.users.models import User
+from hirethon_template.users.tests.factories import UserFactory
+
+REPORT = (
+    "Login page crashes on Safari",
+    "After entering my password and pressing the login button the page goes blank and the browser "
+    "console shows a TypeError in the session bundle. This started after yesterday's release.",
+)
+REWORDED = (
+    "Login page crashes in Safari",
+    "After entering my password and pressing the login button the page goes blank, and the browser "
+    "console shows a TypeError in the session bundle. It started after yesterday's release.",
+)
+UNRELATED = (
+    "Invoice shows the wrong VAT rate",
+    "The October invoice for our team plan applies 19% VAT although our billing address is in Austria.",
+)
+
+
+class TestSignatures:
+    def test_similarity_tracks_overlap(self):
+        report = signature("\n".join(REPORT))
+
+        assert similarity(report, signature("\n".join(REPORT).upper())) == 1.0
+        assert similarity(report, signature("\n".join(REWORDED))) > 0.7
+        assert similarity(report, signature("\n".join(UNRELATED))) < 0.1
+
+    def test_band_keys_are_stable_and_positional(self):
+        keys = band_keys(signature("\n".join(REPORT)))
+
+        assert keys == band_keys(signature("\n".join(REPORT)))
+        assert len(set(keys)) == len(keys) == 32
+
+
+@pytest.mark.django_db
+class TestLookup:
+    def test_finds_open_near_duplicates(self):
+        original = TicketFactory(title=REPORT[0], description=REPORT[1])
+        TicketFactory(title=REPORT[0], description=REPORT[1], status="closed")
+        TicketFactory(title=UNRELATED[0], description=UNRELATED[1])
+
+        matches = find_duplicates(*REWORDED)
+
+        assert [ticket_id for ticket_id, _score in matches] == [original.pk]
+
+    def test_candidates_sharing_most_bands_are_scored_first(self, monkeypatch):
+        weak = TicketFactory.create_batch(3, title=UNRELATED[0], description=UNRELATED[1])
+        original = TicketFactory(title=REPORT[0], description=REPORT[1])
+        keys = band_keys(signature("\n".join(REWORDED)))
+        # Each shares a single band with the lookup, too few to be a duplicate
+        TicketFingerprint.objects.filter(ticket__in=weak).update(bands=keys[:1] + [0] * (len(keys) - 1))
+        monkeypatch.setattr("hirethon_template.tickets.dedup.MAX_CANDIDATES", 1)
+
+        assert [ticket_id for ticket_id, _score in find_duplicates(*REWORDED)] == [original.pk]
+
+    def test_fingerprint_follows_edits_and_backfill(self):
+        ticket = TicketFactory(title=UNRELATED[0], description=UNRELATED[1])
+        ticket.title, ticket.description = REPORT
+        ticket.save()
+        assert find_duplicates(*REWORDED)[0][0] == ticket.pk
+
+        TicketFingerprint.objects.all().delete()
+        call_command("backfill_ticket_fingerprints")
+        assert TicketFingerprint.objects.filter(ticket=ticket).exists()
+
+    def test_create_reports_duplicates_of_own_tickets(self, user: User):
+        own = TicketFactory(user=user, title=REPORT[0], description=REPORT[1])
+        TicketFactory(user=UserFactory(), title=REPORT[0], description=REPORT[1])
+        client = APIClient()
+        client.force_authenticate(user)
+        payload = {"title": REWORDED[0], "description": REWORDED[1]}
+
+        check = client.post("/api/tickets/duplicates/", payload, format="json")
+        created = client.post("/api/tickets/", payload, format="json")
+
+        assert [match["id"] for match in check.json()] == [own.pk]
+        assert [match["id"] for match in created.json()["possible_duplicates"]] == [own.pk]
+        assert Ticket.objects.count() == 3
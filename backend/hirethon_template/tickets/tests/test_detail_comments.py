@@ -0,0 +1,90 @@
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from hirethon_template.tickets.managers import EMBEDDED_COMMENT_LIMIT
+from hirethon_template.tickets.models import TicketComment
+from hirethon_template.tickets.tests.factories import TicketCommentFactory, TicketFactory
+from hirethon_template.users.models import User
+from hirethon_template.users.tests.factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def api_client(user: User) -> APIClient:
+    client = APIClient()
+    client.force_authenticate(user)
+    return client
+
+
+def _comments(ticket, count, **kwargs):
+    comments = TicketCommentFactory.create_batch(count, ticket=ticket, **kwargs)
+    # Spread creation times so the ordering is unambiguous
+    start = timezone.now() - timedelta(days=1)
+    for index, comment in enumerate(comments):
+        TicketComment.objects.filter(pk=comment.pk).update(created_at=start + timedelta(minutes=index))
+    return [comment.id for comment in comments]
+
+
+class TestDetailComments:
+    def test_internal_comments_hidden_from_requester(self, api_client: APIClient, user: User):
+        ticket = TicketFactory(user=user)
+        public = TicketCommentFactory(ticket=ticket)
+        internal = TicketCommentFactory(ticket=ticket, is_internal=True)
+
+        data = api_client.get(f"/api/tickets/{ticket.id}/").json()
+        assert [comment["id"] for comment in data["comments"]] == [public.id]
+
+        admin = APIClient()
+        admin.force_authenticate(UserFactory(is_staff=True))
+        data = admin.get(f"/api/tickets/{ticket.id}/").json()
+        assert {comment["id"] for comment in data["comments"]} == {public.id, internal.id}
+
+    def test_embeds_newest_comments_with_cursor_to_older(self, api_client: APIClient, user: User):
+        ticket = TicketFactory(user=user)
+        ids = _comments(ticket, EMBEDDED_COMMENT_LIMIT + 3)
+
+        data = api_client.get(f"/api/tickets/{ticket.id}/").json()
+
+        assert [comment["id"] for comment in data["comments"]] == ids[3:]
+        older = api_client.get(data["older_comments"]).json()
+        assert [comment["id"] for comment in older["results"]] == ids[:3]
+        assert older["previous"] is None
+
+    def test_no_cursor_when_everything_is_embedded(self, api_client: APIClient, user: User):
+        ticket = TicketFactory(user=user)
+        _comments(ticket, EMBEDDED_COMMENT_LIMIT)
+
+        data = api_client.get(f"/api/tickets/{ticket.id}/").json()
+
+        assert len(data["comments"]) == EMBEDDED_COMMENT_LIMIT
+        assert data["older_comments"] is None
+
+    def test_detail_queries_do_not_grow_with_comments(self, api_client: APIClient, user: User):
+        small, large = TicketFactory.create_batch(2, user=user)
+        _comments(small, 2)
+        _comments(large, EMBEDDED_COMMENT_LIMIT * 3)
+
+        query_counts = []
+        for ticket in (small, large):
+            with CaptureQueriesContext(connection) as context:
+                api_client.get(f"/api/tickets/{ticket.id}/")
+            query_counts.append(len(context.captured_queries))
+
+        assert query_counts[0] == query_counts[1]
+
+    def test_internal_comment_keeps_requester_etag(self, api_client: APIClient, user: User):
+        ticket = TicketFactory(user=user)
+        etag = api_client.get(f"/api/tickets/{ticket.id}/")["ETag"]
+
+        TicketCommentFactory(ticket=ticket, is_internal=True)
+        # Comment writes touch the ticket; hold updated_at still to isolate the comment validators
+        type(ticket).objects.filter(pk=ticket.pk).update(updated_at=ticket.updated_at)
+
+        response = api_client.get(f"/api/tickets/{ticket.id}/", HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304
@@ -0,0 +1,82 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from hirethon_template.tickets.tests.factories import TicketCommentFactory, TicketFactory
+from hirethon_template.users.models import User
+from hirethon_template.users.tests.factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def api_client(user: User) -> APIClient:
+    client = APIClient()
+    client.force_authenticate(user)
+    return client
+
+
+@pytest.fixture
+def staff_user(db) -> User:
+    return UserFactory(is_staff=True)
+
+
+@pytest.fixture
+def staff_client(staff_user: User) -> APIClient:
+    client = APIClient()
+    client.force_authenticate(staff_user)
+    return client
+
+
+def _create_tickets(count: int, **kwargs):
+    for _ in range(count):
+        ticket = TicketFactory(**kwargs)
+        TicketCommentFactory.create_batch(2, ticket=ticket)
+        TicketCommentFactory(ticket=ticket, is_internal=True)
+
+
+def _count_queries(client: APIClient, url: str) -> int:
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+    assert response.status_code == 200
+    return len(context.captured_queries)
+
+
+class TestTicketListQueries:
+    @pytest.mark.parametrize("url", ["/api/tickets/", "/api/tickets/my_tickets/"])
+    def test_query_count_is_constant(self, api_client: APIClient, user: User, url: str):
+        _create_tickets(2, user=user)
+        baseline = _count_queries(api_client, url)
+
+        _create_tickets(10, user=user)
+        assert _count_queries(api_client, url) == baseline
+
+    def test_assigned_to_me_query_count_is_constant(self, staff_client: APIClient, staff_user: User):
+        _create_tickets(2, assigned_to=staff_user)
+        baseline = _count_queries(staff_client, "/api/tickets/assigned_to_me/")
+
+        _create_tickets(10, assigned_to=staff_user)
+        assert _count_queries(staff_client, "/api/tickets/assigned_to_me/") == baseline
+
+    def test_comment_summary(self, api_client: APIClient, user: User):
+        ticket = TicketFactory(user=user)
+        TicketCommentFactory(ticket=ticket, content="first public comment")
+        latest = TicketCommentFactory(ticket=ticket, content="x" * 150, author=UserFactory(name=""))
+        TicketCommentFactory(ticket=ticket, is_internal=True)
+
+        response = api_client.get("/api/tickets/")
+
+        data = response.json()[0]
+        assert data["comment_count"] == 2
+        assert data["latest_comment"]["content"] == "x" * 100 + "..."
+        assert data["latest_comment"]["author"] == latest.author.email
+
+    def test_no_public_comments(self, api_client: APIClient, user: User):
+        ticket = TicketFactory(user=user)
+        TicketCommentFactory(ticket=ticket, is_internal=True)
+
+        data = api_client.get("/api/tickets/").json()[0]
+
+        assert data["comment_count"] == 0
+        assert data["latest_comment"] is None
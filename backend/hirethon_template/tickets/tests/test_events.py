@@ -0,0 +1,148 @@
+import asyncio
+import json
+
+import pytest
+from django.test import AsyncRequestFactory
+from rest_framework.test import APIClient, force_authenticate
+from rest_framework_simplejwt.tokens import AccessToken
+
+from hirethon_template.tickets import events
+from hirethon_template.tickets.api.streams import TicketEventStreamView, UserEventStreamView, event_stream
+from hirethon_template.tickets.events import MemoryBroker, ticket_channel, user_channel
+from hirethon_template.tickets.tests.factories import TicketCommentFactory, TicketFactory
+from hirethon_template.users.models import User
+from hirethon_template.users.tests.factories import UserFactory
+
+
+class RecordingBroker:
+    def __init__(self):
+        self.published = []
+
+    def publish(self, channels, message):
+        self.published.append((channels, json.loads(message)))
+
+
+@pytest.fixture
+def broker(monkeypatch) -> RecordingBroker:
+    broker = RecordingBroker()
+    monkeypatch.setattr(events, "get_broker", lambda: broker)
+    return broker
+
+
+@pytest.mark.django_db
+class TestPublishing:
+    def test_ticket_events_after_commit(self, broker, user: User, django_capture_on_commit_callbacks):
+        staff = UserFactory(is_staff=True)
+        with django_capture_on_commit_callbacks(execute=True):
+            ticket = TicketFactory(user=user, assigned_to=staff)
+        assert broker.published[-1] == (
+            [ticket_channel(ticket.id), user_channel(min(user.id, staff.id)), user_channel(max(user.id, staff.id))],
+            {
+                "type": "ticket.created", "ticket": ticket.id, "status": "open", "priority": "medium",
+                "assigned_to": staff.id, "updated_at": broker.published[-1][1]["updated_at"],
+            },
+        )
+
+        with django_capture_on_commit_callbacks(execute=True):
+            ticket.assigned_to = None
+            ticket.status = "in_progress"
+            ticket.save()
+        channels, event = broker.published[-1]
+        # The previous assignee still hears about the ticket leaving their queue
+        assert user_channel(staff.id) in channels
+        assert (event["type"], event["status"], event["assigned_to"]) == ("ticket.updated", "in_progress", None)
+
+    def test_nothing_sent_before_commit(self, broker, django_capture_on_commit_callbacks):
+        with django_capture_on_commit_callbacks(execute=False) as callbacks:
+            TicketFactory()
+        assert callbacks
+        assert broker.published == []
+
+    def test_internal_comment_skips_requester(self, broker, user: User, django_capture_on_commit_callbacks):
+        staff = UserFactory(is_staff=True)
+        ticket = TicketFactory(user=user, assigned_to=staff)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            comment = TicketCommentFactory(ticket=ticket, author=staff, is_internal=True)
+
+        channels, event = broker.published[-1]
+        assert channels == [ticket_channel(ticket.id, internal=True), user_channel(staff.id)]
+        assert event == {
+            "type": "comment.created", "ticket": ticket.id, "comment": comment.id, "author": staff.id,
+            "is_internal": True,
+        }
+
+    def test_comment_deleted_with_ticket_sends_ticket_event_only(self, broker, django_capture_on_commit_callbacks):
+        ticket = TicketCommentFactory().ticket
+
+        with django_capture_on_commit_callbacks(execute=True):
+            ticket.delete()
+
+        assert [event["type"] for _channels, event in broker.published] == ["ticket.deleted"]
+
+
+class TestEventStream:
+    def test_relays_messages_and_heartbeats(self, monkeypatch):
+        broker = MemoryBroker()
+        monkeypatch.setattr("hirethon_template.tickets.api.streams.get_broker", lambda: broker)
+        monkeypatch.setattr("hirethon_template.tickets.api.streams.HEARTBEAT_SECONDS", 0.01)
+
+        async def run():
+            stream = event_stream([user_channel(1)])
+            chunks = [await stream.__anext__(), await stream.__anext__()]
+            broker.publish([user_channel(2)], '{"type":"other"}')
+            broker.publish([user_channel(1)], '{"type":"ticket.updated"}')
+            while not chunks[-1].startswith("data:"):
+                chunks.append(await stream.__anext__())
+            await stream.aclose()
+            return chunks
+
+        chunks = asyncio.run(run())
+
+        assert chunks[0].startswith("retry:")
+        assert chunks[1] == ": keep-alive\n\n"
+        assert chunks[-1] == 'data: {"type":"ticket.updated"}\n\n'
+        assert "other" not in "".join(chunks)
+        assert not broker._subscribers
+
+
+@pytest.mark.django_db
+class TestEventStreamViews:
+    def test_owner_can_stream_ticket(self, user: User):
+        ticket = TicketFactory(user=user)
+        request = AsyncRequestFactory().get(f"/api/tickets/{ticket.id}/events/", HTTP_ACCEPT="text/event-stream")
+        force_authenticate(request, user)
+
+        response = TicketEventStreamView.as_view()(request, pk=ticket.id)
+
+        assert response.status_code == 200
+        assert response["Content-Type"] == "text/event-stream"
+        assert response.streaming
+
+    def test_not_served_under_wsgi(self, user: User):
+        client = APIClient()
+        client.force_authenticate(user)
+        ticket = TicketFactory(user=user)
+
+        response = client.get(f"/api/tickets/{ticket.id}/events/", HTTP_ACCEPT="text/event-stream")
+
+        assert response.status_code == 501
+        assert not response.streaming
+
+    def test_other_users_ticket(self, user: User):
+        client = APIClient()
+        client.force_authenticate(user)
+        ticket = TicketFactory(user=UserFactory())
+
+        response = client.get(f"/api/tickets/{ticket.id}/events/", HTTP_ACCEPT="text/event-stream")
+
+        assert response.status_code == 404
+
+    def test_access_token_query_param(self, user: User):
+        client = APIClient()
+        view = UserEventStreamView.as_view()
+
+        assert client.get("/api/tickets/events/").status_code in (401, 403)
+        request = AsyncRequestFactory().get("/api/tickets/events/", {"access_token": str(AccessToken.for_user(user))})
+        response = view(request)
+        assert response.status_code == 200
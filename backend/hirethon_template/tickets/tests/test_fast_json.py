@@ -0,0 +1,87 @@
+import datetime
+import decimal
+import io
+import uuid
+
+import pytest
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from hirethon_template.tickets.api.serializers import TicketDetailSerializer
+from hirethon_template.tickets.tests.factories import TicketCommentFactory, TicketFactory
+from hirethon_template.utils.fast_json import ORJSONParser, ORJSONRenderer
+
+
+def _both(data, **kwargs):
+    return ORJSONRenderer().render(data, **kwargs), JSONRenderer().render(data, **kwargs)
+
+
+class TestORJSONRenderer:
+    def test_matches_json_renderer_for_special_types(self):
+        data = {
+            "aware": datetime.datetime(2024, 5, 1, 12, 30, 15, 123456, tzinfo=datetime.timezone.utc),
+            "offset": datetime.datetime(2024, 5, 1, 12, 30, tzinfo=datetime.timezone(datetime.timedelta(hours=5))),
+            "naive": datetime.datetime(2024, 5, 1, 12, 30),
+            "date": datetime.date(2024, 5, 1),
+            "time": datetime.time(9, 15, 0, 500),
+            "duration": datetime.timedelta(hours=1, seconds=3),
+            "decimal": decimal.Decimal("12.50"),
+            "uuid": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+            "lazy": gettext_lazy("Open"),
+            "text": "caf\u00e9 \u2028 \u2029 \U0001f600",
+            "numbers": [1, -2, 0.5, True, None],
+            1: "integer key",
+        }
+
+        fast, expected = _both(data)
+        assert fast == expected
+
+    def test_falls_back_for_indent_and_large_integers(self):
+        fast, expected = _both({"a": [1, 2]}, renderer_context={"indent": 4})
+        assert fast == expected
+
+        fast, expected = _both({"big": 2**70})
+        assert fast == expected
+
+    @pytest.mark.parametrize("value", [float("nan"), float("inf"), -float("inf")])
+    def test_non_finite_floats_behave_like_json_renderer(self, value):
+        data = {"nested": [{"score": value}], "other": None}
+
+        with pytest.raises(ValueError):
+            ORJSONRenderer().render(data)
+
+        class Lenient(ORJSONRenderer):
+            strict = False
+
+        assert Lenient().render(data) == JSONRenderer.render(Lenient(), data)
+
+    def test_none_renders_empty(self):
+        assert ORJSONRenderer().render(None) == b""
+
+    @pytest.mark.django_db
+    def test_matches_json_renderer_for_ticket_detail(self):
+        ticket = TicketFactory(resolved_at=timezone.now())
+        TicketCommentFactory.create_batch(3, ticket=ticket)
+
+        fast, expected = _both(TicketDetailSerializer(ticket).data)
+        assert fast == expected
+
+
+class TestORJSONParser:
+    @pytest.mark.parametrize(
+        "body", [b'{"title": "caf\\u00e9", "n": [1, 2.5, null]}', b'{"big": 100000000000000000000000}']
+    )
+    def test_matches_json_parser(self, body):
+        assert ORJSONParser().parse(io.BytesIO(body)) == JSONParser().parse(io.BytesIO(body))
+
+    @pytest.mark.parametrize("body", [b"{", b'{"value": NaN}'])
+    def test_errors_match_json_parser(self, body):
+        with pytest.raises(ParseError) as fast:
+            ORJSONParser().parse(io.BytesIO(body))
+        with pytest.raises(ParseError) as expected:
+            JSONParser().parse(io.BytesIO(body))
+
+        assert str(fast.value) == str(expected.value)
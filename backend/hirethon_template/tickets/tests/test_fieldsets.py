@@ -0,0 +1,79 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from hirethon_template.tickets.tests.factories import TicketCommentFactory, TicketFactory
+from hirethon_template.users.models import User
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def api_client(user: User) -> APIClient:
+    client = APIClient()
+    client.force_authenticate(user)
+    return client
+
+
+def _get(client: APIClient, url: str):
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+    assert response.status_code == 200
+    return response.json(), [query["sql"] for query in context.captured_queries]
+
+
+class TestSparseFieldsets:
+    def test_list_never_loads_large_text_columns(self, api_client: APIClient, user: User):
+        TicketFactory(user=user)
+
+        data, queries = _get(api_client, "/api/tickets/")
+
+        assert "description" not in data[0]
+        assert not any('"tickets_ticket"."description"' in sql for sql in queries)
+        assert not any('"tickets_ticket"."admin_feedback"' in sql for sql in queries)
+
+    def test_list_fields(self, api_client: APIClient, user: User):
+        ticket = TicketFactory(user=user)
+        TicketCommentFactory(ticket=ticket)
+
+        data, queries = _get(api_client, "/api/tickets/?fields=id,status,priority")
+
+        assert data == [{"id": ticket.id, "status": ticket.status, "priority": ticket.priority}]
+        assert not any("tickets_ticketcomment" in sql or '"title"' in sql for sql in queries)
+
+    def test_list_expand(self, api_client: APIClient, user: User):
+        TicketFactory(user=user)
+
+        collapsed, _ = _get(api_client, "/api/tickets/my_tickets/?fields=id,user")
+        expanded, _ = _get(api_client, "/api/tickets/my_tickets/?fields=id,user&expand=user")
+
+        assert collapsed[0]["user"] == user.id
+        assert expanded[0]["user"] == {"id": user.id, "email": user.email, "name": user.name}
+
+    def test_detail_skips_comments(self, api_client: APIClient, user: User):
+        ticket = TicketFactory(user=user)
+        TicketCommentFactory.create_batch(2, ticket=ticket)
+
+        data, queries = _get(api_client, f"/api/tickets/{ticket.id}/?fields=id,status,is_open")
+
+        assert data == {"id": ticket.id, "status": ticket.status, "is_open": True}
+        assert not any('FROM "tickets_ticketcomment"' in sql for sql in queries)
+
+    def test_detail_default_is_unchanged(self, api_client: APIClient, user: User):
+        ticket = TicketFactory(user=user)
+        TicketCommentFactory.create_batch(2, ticket=ticket)
+
+        data, _ = _get(api_client, f"/api/tickets/{ticket.id}/")
+
+        assert len(data["comments"]) == 2
+        assert data["description"] == ticket.description
+        assert data["user"]["email"] == user.email
+
+    def test_paginated_ordering_by_deferred_column(self, api_client: APIClient, user: User):
+        TicketFactory.create_batch(3, user=user)
+
+        data, _ = _get(api_client, "/api/tickets/?fields=id&ordering=status&page_size=2")
+
+        assert len(data["results"]) == 2
+        assert data["next"]
@@ -0,0 +1,112 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from hirethon_template.tickets.automation import close_abandoned_tickets
+from hirethon_template.tickets.history import acting_as
+from hirethon_template.tickets.models import Ticket, TicketEvent
+from hirethon_template.tickets.tests.factories import TicketCommentFactory, TicketFactory
+from hirethon_template.users.models import User
+from hirethon_template.users.tests.factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def _kinds(ticket):
+    return [
+        (event.get_kind_display(), event.old_value, event.new_value)
+        for event in TicketEvent.objects.filter(ticket_id=ticket.pk).order_by("created_at", "id")
+    ]
+
+
+class TestRecording:
+    def test_state_changes_are_recorded_with_actor(self):
+        admin = UserFactory(is_staff=True)
+        ticket = TicketFactory(priority="low")
+
+        with acting_as(admin):
+            ticket.status = "in_progress"
+            ticket.priority = "high"
+            ticket.save()
+        ticket.title = "Renamed"
+        ticket.save()
+
+        assert _kinds(ticket) == [
+            ("created", "", "open"),
+            ("status_changed", "open", "in_progress"),
+            ("priority_changed", "low", "high"),
+        ]
+        actors = list(TicketEvent.objects.filter(ticket_id=ticket.pk).order_by("id").values_list("actor", flat=True))
+        assert actors == [None, admin.pk, admin.pk]
+
+    def test_comments_and_deletion_are_kept(self):
+        ticket = TicketFactory()
+        comment = TicketCommentFactory(ticket=ticket)
+        comment_id = comment.pk
+        comment.delete()
+        ticket_id = ticket.pk
+        ticket.delete()
+
+        assert [kind for kind, _old, _new in _kinds(Ticket(pk=ticket_id))] == [
+            "created", "comment_added", "comment_deleted", "deleted"
+        ]
+        added = TicketEvent.objects.get(ticket_id=ticket_id, kind=TicketEvent.COMMENT_ADDED)
+        assert added.new_value == str(comment_id)
+
+    def test_bulk_jobs_record_their_changes(self):
+        ticket = TicketFactory(status="pending_user")
+        Ticket.objects.filter(pk=ticket.pk).update(status_changed_at=timezone.now() - timedelta(days=30))
+
+        assert close_abandoned_tickets() == 1
+        assert _kinds(ticket)[-1] == ("status_changed", "pending_user", "closed")
+
+
+class TestTimeline:
+    def test_pages_through_history(self, user: User):
+        client = APIClient()
+        client.force_authenticate(user)
+        ticket = TicketFactory(user=user)
+        TicketCommentFactory.create_batch(3, ticket=ticket, author=user)
+
+        url, seen = f"/api/tickets/{ticket.pk}/timeline/?page_size=2", []
+        while url:
+            data = client.get(url).json()
+            seen += [event["kind"] for event in data["results"]]
+            url = data["next"]
+
+        assert seen == ["created", "comment_added", "comment_added", "comment_added"]
+
+    def test_hides_internal_events_from_owner(self, user: User):
+        admin = UserFactory(is_staff=True)
+        ticket = TicketFactory(user=user)
+        TicketCommentFactory(ticket=ticket, author=admin, is_internal=True)
+        client = APIClient()
+
+        client.force_authenticate(user)
+        owner_view = client.get(f"/api/tickets/{ticket.pk}/timeline/").json()["results"]
+        client.force_authenticate(admin)
+        admin_view = client.get(f"/api/tickets/{ticket.pk}/timeline/").json()["results"]
+
+        assert [event["kind"] for event in owner_view] == ["created"]
+        assert [event["kind"] for event in admin_view] == ["created", "comment_added"]
+        assert admin_view[1]["actor"]["id"] == admin.pk
+
+    def test_status_update_is_attributed(self, user: User):
+        admin = UserFactory(is_staff=True)
+        ticket = TicketFactory(user=user)
+        client = APIClient()
+        client.force_authenticate(admin)
+
+        client.patch(f"/api/tickets/{ticket.pk}/update_status/", {"status": "resolved"}, format="json")
+
+        event = TicketEvent.objects.get(ticket_id=ticket.pk, kind=TicketEvent.STATUS_CHANGED)
+        assert (event.actor_id, event.new_value) == (admin.pk, "resolved")
+
+    def test_other_users_get_404(self, user: User):
+        ticket = TicketFactory()
+        client = APIClient()
+        client.force_authenticate(user)
+
+        assert client.get(f"/api/tickets/{ticket.pk}/timeline/").status_code == 404
@@ -0,0 +1,86 @@
+import pytest
+from rest_framework.test import APIClient
+
+from hirethon_template.tickets.api.pagination import TicketPagination
+from hirethon_template.tickets.models import Ticket
+from hirethon_template.tickets.tests.factories import TicketCommentFactory, TicketFactory
+from hirethon_template.users.models import User
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def api_client(user: User) -> APIClient:
+    client = APIClient()
+    client.force_authenticate(user)
+    return client
+
+
+def _walk(client: APIClient, url: str, key: str = "next") -> list[list[int]]:
+    pages = []
+    while url:
+        data = client.get(url).json()
+        pages.append([row["id"] for row in data["results"]])
+        url = data[key]
+    return pages
+
+
+class TestKeysetPagination:
+    def test_unpaginated_by_default(self, api_client: APIClient, user: User):
+        TicketFactory.create_batch(3, user=user)
+
+        response = api_client.get("/api/tickets/")
+
+        assert isinstance(response.json(), list)
+        assert len(response.json()) == 3
+
+    @pytest.mark.parametrize("ordering", ["-created_at", "created_at", "status", "-priority", "updated_at"])
+    def test_walks_every_ticket_once(self, api_client: APIClient, user: User, ordering: str):
+        statuses = ["open", "open", "closed", "open", "resolved", "open", "open"]
+        tickets = [TicketFactory(user=user, status=status) for status in statuses]
+
+        pages = _walk(api_client, f"/api/tickets/?page_size=2&ordering={ordering}")
+
+        seen = [ticket_id for page in pages for ticket_id in page]
+        assert sorted(seen) == sorted(ticket.id for ticket in tickets)
+        assert [len(page) for page in pages] == [2, 2, 2, 1]
+
+    def test_previous_link(self, api_client: APIClient, user: User):
+        TicketFactory.create_batch(5, user=user)
+        first = api_client.get("/api/tickets/my_tickets/?page_size=2").json()
+        second = api_client.get(first["next"]).json()
+
+        previous = api_client.get(second["previous"]).json()
+
+        assert [row["id"] for row in previous["results"]] == [row["id"] for row in first["results"]]
+        assert previous["previous"] is None
+
+    def test_seek_bounds_the_leading_field(self):
+        paginator = TicketPagination()
+        ordering = paginator.get_ordering(Ticket.objects.order_by("-created_at"))
+        ticket = TicketFactory()
+
+        seek = paginator.build_seek_filter(ordering, [ticket.created_at, ticket.id])
+        where = str(Ticket.objects.filter(seek).query).split("WHERE")[1]
+
+        # A plain range on created_at the (created_at, id) index can start from
+        assert where.startswith(' ("tickets_ticket"."created_at" <=')
+
+    def test_opt_in_count(self, api_client: APIClient, user: User):
+        TicketFactory.create_batch(3, user=user)
+
+        assert "count" not in api_client.get("/api/tickets/?page_size=2").json()
+        assert api_client.get("/api/tickets/?page_size=2&include_count=true").json()["count"] == 3
+
+    def test_invalid_cursor(self, api_client: APIClient):
+        response = api_client.get("/api/tickets/?cursor=not-a-cursor")
+
+        assert response.status_code == 404
+
+    def test_comments(self, api_client: APIClient, user: User):
+        ticket = TicketFactory(user=user)
+        comments = TicketCommentFactory.create_batch(5, ticket=ticket)
+
+        pages = _walk(api_client, f"/api/tickets/{ticket.id}/comments/?page_size=2")
+
+        assert [ticket_id for page in pages for ticket_id in page] == [comment.id for comment in comments]
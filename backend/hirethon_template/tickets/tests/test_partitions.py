@@ -0,0 +1,116 @@
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from hirethon_template.tickets import partitions
+from hirethon_template.tickets.archive import archive_closed_tickets, restore_tickets
+from hirethon_template.tickets.models import Ticket, TicketComment
+from hirethon_template.tickets.partitions import (
+    add_months,
+    drop_comment_partitions,
+    ensure_comment_partitions,
+    month_start,
+    partition_name,
+)
+from hirethon_template.tickets.tests.factories import TicketCommentFactory, TicketFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def _partition_of(comment):
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT tableoid::regclass::text FROM tickets_ticketcomment WHERE id = %s", [comment.pk])
+        return cursor.fetchone()[0]
+
+
+def _names():
+    return [name for name, _lower, _upper in partitions.partitions()]
+
+
+class TestCommentPartitions:
+    def test_comments_move_between_monthly_partitions(self):
+        comment = TicketCommentFactory()
+        later = timezone.now() + timedelta(days=62)
+
+        TicketComment.objects.filter(pk=comment.pk).update(created_at=later)
+
+        assert _partition_of(comment) == partition_name(month_start(later))
+        assert TicketComment.objects.get(pk=comment.pk).created_at == later
+
+    def test_ensure_creates_missing_months_once(self):
+        now = timezone.now() + timedelta(days=200)
+        newest = month_start(now)
+
+        created = ensure_comment_partitions(now, ahead=1)
+
+        assert created[-2:] == [partition_name(newest), partition_name(add_months(newest, 1))]
+        assert ensure_comment_partitions(now, ahead=1) == []
+        assert len(_names()) == len(set(_names()))
+
+    def test_drop_keeps_partitions_with_comments_unless_asked(self, monkeypatch):
+        ticket = TicketFactory()
+        TicketCommentFactory(ticket=ticket)
+        # Deferred foreign key checks pending on a table keep it from being dropped
+        with connection.cursor() as cursor:
+            cursor.execute("SET CONSTRAINTS ALL IMMEDIATE")
+        legacy_end = partitions.partitions()[0][2]
+        months = _names()
+        monkeypatch.setattr(partitions.timezone, "now", lambda: datetime(2099, 1, 15, tzinfo=dt_timezone.utc))
+        before = add_months(legacy_end, 2)
+
+        assert drop_comment_partitions(before, dry_run=True) == months[1:3]
+        assert drop_comment_partitions(before) == months[1:3]
+        assert _names()[0] == months[0]
+
+        assert drop_comment_partitions(before, include_comments=True) == [months[0]]
+        assert not TicketComment.objects.exists()
+        assert Ticket.objects.get(pk=ticket.pk).public_comment_count == 0
+
+    def test_restore_recreates_partitions_dropped_after_archiving(self, monkeypatch):
+        ticket = TicketFactory(status="closed")
+        Ticket.objects.filter(pk=ticket.pk).update(status_changed_at=timezone.now() - timedelta(days=400))
+        comment = TicketCommentFactory(ticket=ticket)
+        month = partitions.partitions()[1][1]
+        TicketComment.objects.filter(pk=comment.pk).update(created_at=month + timedelta(days=3))
+        archive_closed_tickets()
+        with connection.cursor() as cursor:
+            cursor.execute("SET CONSTRAINTS ALL IMMEDIATE")
+        monkeypatch.setattr(partitions.timezone, "now", lambda: datetime(2099, 1, 15, tzinfo=dt_timezone.utc))
+        assert partition_name(month) in drop_comment_partitions(add_months(month, 1))
+        monkeypatch.undo()
+
+        assert restore_tickets([ticket.pk]) == 1
+
+        assert _partition_of(comment) == partition_name(month)
+        assert Ticket.objects.get(pk=ticket.pk).comments.get().created_at == month + timedelta(days=3)
+
+    def test_drop_never_touches_the_current_month(self):
+        call_command("drop_comment_partitions", "--before", "2099-01-01")
+
+        current = month_start(timezone.now())
+        assert all(upper is None or upper > current for _name, _lower, upper in partitions.partitions()[1:])
+        assert partition_name(add_months(current, 1)) in _names()
+
+
+class TestCommentListBounds:
+    def test_created_bounds(self, user):
+        ticket = TicketFactory(user=user)
+        old, recent = TicketCommentFactory.create_batch(2, ticket=ticket)
+        TicketComment.objects.filter(pk=old.pk).update(created_at=timezone.now() - timedelta(days=90))
+        client = APIClient()
+        client.force_authenticate(user)
+        url = f"/api/tickets/{ticket.pk}/comments/"
+        cutoff = (timezone.now() - timedelta(days=30)).isoformat()
+
+        after = client.get(url, {"created_after": cutoff}).json()
+        before = client.get(url, {"created_before": cutoff}).json()
+        invalid = client.get(url, {"created_after": cutoff, "created_before": "2000-01-01T00:00:00Z"})
+
+        assert [comment["id"] for comment in after] == [recent.pk]
+        assert [comment["id"] for comment in before] == [old.pk]
+        assert invalid.status_code == 400
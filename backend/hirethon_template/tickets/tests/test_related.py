@@ -0,0 +1,134 @@
+import numpy as np
+import pytest
+from django.core.management import call_command
+from rest_framework.test import APIClient
+
+from hirethon_template.tickets import related, tasks
+from hirethon_template.tickets.models import Ticket, TicketComment
+from hirethon_template.tickets.related import RelatedIndex, Segment, build_segment
+from hirethon_template.tickets.tests.factories import TicketFactory
+from hirethon_template.users.tests.factories import UserFactory
+
+DOCUMENTS = [
+    (1, "Password reset email never arrives, the reset link is missing from the inbox"),
+    (2, "Invoice shows the wrong VAT rate for our billing address"),
+    (3, "Export to CSV times out for large reports"),
+    (4, "Reset email arrives late and the password link has expired"),
+]
+
+
+@pytest.fixture
+def index_dir(settings, tmp_path):
+    settings.TICKET_RELATED_INDEX_DIR = str(tmp_path / "related")
+    related._loaded.clear()
+    yield tmp_path / "related"
+    related._loaded.clear()
+
+
+def _resolved(**kwargs):
+    return TicketFactory(status="resolved", **kwargs)
+
+
+class TestIndex:
+    def _index(self, tmp_path, documents, delta=()):
+        base = build_segment(documents)
+        segments = [base] + ([build_segment(delta, base["df"], len(documents))] if delta else [])
+        names = [related._write_segment(tmp_path, arrays) for arrays in segments]
+        return RelatedIndex(*(Segment(tmp_path / name) for name in names))
+
+    def test_search_ranks_by_cosine_similarity(self, tmp_path):
+        index = self._index(tmp_path, DOCUMENTS)
+
+        matches = index.search("I never got the password reset email", limit=3)
+
+        assert [ticket_id for ticket_id, _score in matches] == [1, 4]
+        assert 1 >= matches[0][1] > matches[1][1] >= related.MIN_SIMILARITY
+        assert index.search("password reset email", exclude=[1])[0][0] == 4
+        assert index.search("") == []
+        assert index.search("password reset email", limit=1, among=np.array([3, 4]))[0][0] == 4
+
+    def test_delta_replaces_base_entries(self, tmp_path):
+        index = self._index(tmp_path, DOCUMENTS, delta=[(4, "Dashboard charts render blank in Safari")])
+
+        assert [ticket_id for ticket_id, _score in index.search("password reset email")] == [1]
+        assert index.search("charts blank in Safari")[0][0] == 4
+        assert index.documents == 5
+
+
+@pytest.mark.django_db
+class TestRelatedTickets:
+    def test_documents_include_feedback_and_public_comments(self, index_dir):
+        ticket = _resolved(title="Cannot log in", admin_feedback="Cleared the stale session cookie")
+        TicketComment.objects.create(ticket=ticket, author=ticket.user, content="Works after clearing cookies")
+        TicketComment.objects.create(ticket=ticket, author=ticket.user, content="secret note", is_internal=True)
+        TicketFactory(status="open")
+
+        [(ticket_id, text)] = related.ticket_documents()
+
+        assert ticket_id == ticket.pk
+        assert "stale session cookie" in text and "clearing cookies" in text
+        assert "secret" not in text
+
+    def test_detail_lists_related_resolved_tickets(self, index_dir, user):
+        assert related.get_index() is None
+        mine = _resolved(user=user, title="Password reset email missing", description="The reset email never came")
+        others = _resolved(title="Password reset email delayed", description="Reset email arrives hours late")
+        _resolved(title="Invoice total is wrong", description="VAT is applied twice on the invoice")
+        call_command("rebuild_related_index")
+        ticket = TicketFactory(user=user, title="No password reset email", description="I requested a reset email")
+        client = APIClient()
+
+        client.force_authenticate(user)
+        own = client.get(f"/api/tickets/{ticket.pk}/").json()["related_tickets"]
+        client.force_authenticate(UserFactory(is_staff=True))
+        every = client.get(f"/api/tickets/{ticket.pk}/").json()["related_tickets"]
+
+        assert [match["id"] for match in own] == [mine.pk]
+        assert {match["id"] for match in every} == {mine.pk, others.pk}
+        assert every[0]["status"] == "resolved" and every[0]["similarity"] > 0
+
+    def test_own_tickets_are_ranked_among_themselves(self, index_dir, user, monkeypatch):
+        mine = _resolved(user=user, title="Password email missing", description="Nothing arrived at all")
+        for _ in range(3):
+            _resolved(title="Password reset email missing", description="The password reset email never came")
+        call_command("rebuild_related_index")
+        ticket = TicketFactory(user=user, title="No password reset email", description="I requested a reset email")
+        monkeypatch.setattr(related, "OVERFETCH", 1)
+
+        matches = related.related_tickets(ticket, Ticket.objects.filter(user=user), limit=1)
+
+        assert [match["id"] for match in matches] == [mine.pk]
+
+    def test_resolving_indexes_incrementally(self, index_dir, monkeypatch, django_capture_on_commit_callbacks):
+        related.rebuild_index()
+        scheduled = []
+        monkeypatch.setattr(tasks.index_related_ticket, "delay", scheduled.append)
+        ticket = TicketFactory(title="Export to CSV times out", description="Large exports fail after a minute")
+
+        with django_capture_on_commit_callbacks(execute=True):
+            ticket.status = "resolved"
+            ticket.save()
+        tasks.index_related_ticket(*scheduled)
+        query = TicketFactory(title="CSV export timeout", description="Exports time out")
+
+        assert scheduled == [ticket.pk]
+        assert [match["id"] for match in related.related_tickets(query)] == [ticket.pk]
+
+        monkeypatch.setattr(related, "MAX_DELTA_DOCUMENTS", 1)
+        related.add_tickets([_resolved(title="CSV export broken").pk])
+        assert related.get_index().segments[1:] == []
+        assert len([path for path in index_dir.iterdir() if path.is_dir()]) == 1
+
+    def test_closing_directly_schedules_indexing(self, monkeypatch, django_capture_on_commit_callbacks):
+        scheduled = []
+        monkeypatch.setattr(tasks.index_related_ticket, "delay", scheduled.append)
+        ticket = TicketFactory(status="pending_user")
+
+        with django_capture_on_commit_callbacks(execute=True):
+            ticket.status = "closed"
+            ticket.save()
+            # Already indexed, so resolving it afterwards adds nothing
+            ticket.status = "resolved"
+            ticket.save()
+
+        assert scheduled == [ticket.pk]
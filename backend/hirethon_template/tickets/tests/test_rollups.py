@@ -0,0 +1,127 @@
+from datetime import date, datetime, timedelta
+from datetime import timezone as dt_timezone
+
+import pytest
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from hirethon_template.tickets.models import Ticket, TicketDailyRollup, TicketEvent
+from hirethon_template.tickets.rollups import histogram_percentile, merge_histograms, refresh_rollups
+from hirethon_template.tickets.tests.factories import TicketFactory
+from hirethon_template.users.tests.factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+MONDAY = date(2026, 10, 5)
+
+
+def _at(day, hour=12):
+    return datetime(day.year, day.month, day.day, hour, tzinfo=dt_timezone.utc)
+
+
+def _ticket(created, resolved=None, **kwargs):
+    ticket = TicketFactory(**kwargs)
+    Ticket.objects.filter(pk=ticket.pk).update(
+        created_at=_at(created),
+        resolved_at=resolved and _at(resolved, 18),
+        status="resolved" if resolved else ticket.status,
+        status_changed_at=_at(resolved or created, 18),
+    )
+    return ticket
+
+
+def _rollup(day, dimension=TicketDailyRollup.ALL, value=""):
+    return TicketDailyRollup.objects.get(day=day, dimension=dimension, value=value)
+
+
+class TestHistograms:
+    def test_percentile_of_merged_histograms(self):
+        histogram = merge_histograms([[0, 2], [0, 1, 0, 0, 1]])
+
+        assert histogram == [0, 3, 0, 0, 1]
+        assert histogram_percentile(histogram, 0.5) == 1
+        assert histogram_percentile(histogram, 0.9) == 2
+        assert histogram_percentile([], 0.5) is None
+
+
+class TestRefresh:
+    def test_daily_counts_backlog_and_percentiles(self):
+        _ticket(MONDAY, category="bug")
+        _ticket(MONDAY, resolved=MONDAY + timedelta(days=1), category="billing")
+        _ticket(MONDAY + timedelta(days=1), resolved=MONDAY + timedelta(days=1), category="bug")
+
+        refresh_rollups(now=_at(MONDAY + timedelta(days=2)))
+
+        monday, tuesday = _rollup(MONDAY), _rollup(MONDAY + timedelta(days=1))
+        assert (monday.created, monday.resolved, monday.backlog) == (2, 0, 2)
+        assert (tuesday.created, tuesday.resolved, tuesday.backlog) == (1, 2, 1)
+        assert (tuesday.resolution_p50_seconds, tuesday.resolution_p90_seconds) == (18 * 3600, 99360)
+        assert _rollup(MONDAY + timedelta(days=2)).backlog == 1
+        assert _rollup(MONDAY + timedelta(days=1), TicketDailyRollup.CATEGORY, "bug").backlog == 1
+        assert not TicketDailyRollup.objects.filter(dimension=TicketDailyRollup.CATEGORY, value="billing",
+                                                    day=MONDAY + timedelta(days=2)).exists()
+
+    def test_only_changed_days_are_recomputed(self):
+        today = timezone.localdate()
+        ticket = _ticket(today - timedelta(days=5))
+        refresh_rollups(now=_at(today - timedelta(days=2)))
+        untouched = _rollup(today - timedelta(days=4)).computed_at
+
+        ticket.refresh_from_db()
+        ticket.status = "closed"
+        ticket.save()
+
+        assert refresh_rollups() == 3
+        assert _rollup(today - timedelta(days=4)).computed_at == untouched
+        assert (_rollup(today).closed, _rollup(today).backlog) == (1, 0)
+        assert _rollup(today - timedelta(days=1)).backlog == 1
+
+    def test_recategorised_ticket_moves_its_backlog(self):
+        today = timezone.localdate()
+        ticket = _ticket(today - timedelta(days=10), category="bug")
+        refresh_rollups(now=_at(today - timedelta(days=3)))
+        refresh_rollups(now=_at(today - timedelta(days=1)))
+        category = TicketDailyRollup.objects.filter(dimension=TicketDailyRollup.CATEGORY, day=today)
+
+        # History on an older day splits the next refresh into two runs
+        TicketEvent.objects.filter(ticket_id=ticket.pk).update(created_at=_at(today - timedelta(days=8)))
+
+        ticket.refresh_from_db()
+        ticket.category = "billing"
+        ticket.save()
+        refresh_rollups()
+        assert dict(category.values_list("value", "backlog")) == {"billing": 1}
+        assert _rollup(today - timedelta(days=8), TicketDailyRollup.CATEGORY, "billing").backlog == 1
+
+        ticket.status = "resolved"
+        ticket.save()
+        refresh_rollups()
+        assert _rollup(today).backlog == 0
+        assert not category.filter(backlog__gt=0).exists()
+
+
+class TestAnalyticsEndpoint:
+    def test_weekly_buckets(self):
+        admin = UserFactory(is_staff=True)
+        client = APIClient()
+        client.force_authenticate(admin)
+        _ticket(MONDAY, resolved=MONDAY + timedelta(days=8))
+        _ticket(MONDAY + timedelta(days=6))
+        refresh_rollups(now=_at(MONDAY + timedelta(days=13)))
+
+        response = client.get(
+            "/api/tickets/analytics/",
+            {"interval": "week", "start": MONDAY.isoformat(), "end": (MONDAY + timedelta(days=13)).isoformat()},
+        )
+
+        assert response.status_code == 200
+        weeks = [
+            (row["bucket"], row["created"], row["resolved"], row["backlog"]) for row in response.json()["results"]
+        ]
+        assert weeks == [(MONDAY.isoformat(), 2, 0, 2), ((MONDAY + timedelta(days=7)).isoformat(), 0, 1, 1)]
+
+    def test_admin_only(self, user):
+        client = APIClient()
+        client.force_authenticate(user)
+
+        assert client.get("/api/tickets/analytics/").status_code == 403
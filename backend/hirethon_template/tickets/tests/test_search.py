@@ -0,0 +1,94 @@
+import pytest
+from rest_framework.test import APIClient
+
+from hirethon_template.tickets.models import Ticket
+from hirethon_template.tickets.search import rebuild_search_vectors, search_tickets
+from hirethon_template.tickets.tests.factories import TicketCommentFactory, TicketFactory
+from hirethon_template.users.models import User
+from hirethon_template.users.tests.factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def api_client(user: User) -> APIClient:
+    client = APIClient()
+    client.force_authenticate(user)
+    return client
+
+
+class TestTicketSearch:
+    def test_matches_title_description_and_public_comments(self):
+        in_title = TicketFactory(title="Invoice totals are wrong", description="Numbers do not add up here")
+        in_description = TicketFactory(title="Billing page", description="The invoice PDF shows the wrong VAT")
+        in_comment = TicketFactory(title="Something odd", description="Cannot describe it any better")
+        TicketCommentFactory(ticket=in_comment, content="It is related to the invoice export")
+        internal_only = TicketFactory(title="Unrelated", description="Nothing to see in this ticket")
+        TicketCommentFactory(ticket=internal_only, content="internal invoice note", is_internal=True)
+
+        results = list(search_tickets(Ticket.objects.all(), "invoice"))
+
+        assert results[0] == in_title
+        assert set(results) == {in_title, in_description, in_comment}
+        assert "<b>Invoice</b>" in results[0].title_highlight
+
+    def test_vector_follows_comment_delete(self):
+        ticket = TicketFactory(title="Something odd", description="Cannot describe it any better")
+        comment = TicketCommentFactory(ticket=ticket, content="mentions a kangaroo")
+        assert search_tickets(Ticket.objects.all(), "kangaroo").count() == 1
+
+        comment.delete()
+
+        assert search_tickets(Ticket.objects.all(), "kangaroo").count() == 0
+
+    def test_vector_follows_text_changes_only(self):
+        ticket = TicketFactory(title="Something odd", description="Cannot describe it any better")
+        comment = TicketCommentFactory(ticket=ticket, content="mentions a kangaroo")
+        TicketCommentFactory(ticket=ticket, content="internal wombat note", is_internal=True)
+        assert search_tickets(Ticket.objects.all(), "kangaroo").count() == 1
+        assert search_tickets(Ticket.objects.all(), "wombat").count() == 0
+
+        comment.content = "mentions a platypus"
+        comment.save()
+        assert search_tickets(Ticket.objects.all(), "kangaroo").count() == 0
+        assert search_tickets(Ticket.objects.all(), "platypus").count() == 1
+
+        # Saves that leave the text alone do not rebuild the vector
+        Ticket.objects.update(search_vector=None)
+        ticket.refresh_from_db()
+        ticket.status = "in_progress"
+        ticket.save()
+        assert Ticket.objects.get(pk=ticket.pk).search_vector is None
+        ticket.title = "Printer on fire"
+        ticket.save()
+        assert search_tickets(Ticket.objects.all(), "printer platypus").count() == 1
+
+    def test_rebuild(self):
+        ticket = TicketFactory(title="Printer on fire")
+        Ticket.objects.update(search_vector=None)
+
+        assert rebuild_search_vectors(batch_size=1) == 1
+        assert list(search_tickets(Ticket.objects.all(), "printer")) == [ticket]
+
+
+class TestTicketSearchEndpoints:
+    def test_search_respects_visibility(self, api_client: APIClient, user: User):
+        own = TicketFactory(user=user, title="Password reset broken")
+        TicketFactory(user=UserFactory(), title="Password reset broken too")
+
+        response = api_client.get("/api/tickets/search/", {"q": "password reset"})
+
+        assert response.status_code == 200
+        assert [row["id"] for row in response.json()] == [own.id]
+        assert response.json()[0]["rank"] > 0
+
+    def test_search_requires_query(self, api_client: APIClient):
+        assert api_client.get("/api/tickets/search/").status_code == 400
+
+    def test_list_search_param(self, api_client: APIClient, user: User):
+        match = TicketFactory(user=user, title="Dark mode request")
+        TicketFactory(user=user, title="Login fails on Safari")
+
+        response = api_client.get("/api/tickets/", {"search": "dark"})
+
+        assert [row["id"] for row in response.json()] == [match.id]
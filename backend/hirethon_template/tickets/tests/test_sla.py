@@ -0,0 +1,141 @@
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+from zoneinfo import ZoneInfo
+
+import pytest
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from hirethon_template.tickets.models import SLAPolicy, Ticket
+from hirethon_template.tickets.sla import BusinessHours, policy_for, sweep_sla_breaches
+from hirethon_template.tickets.tests.factories import TicketCommentFactory, TicketFactory
+from hirethon_template.users.tests.factories import UserFactory
+
+UTC = dt_timezone.utc
+
+
+class TestBusinessHours:
+    clock = BusinessHours(9, 17, [0, 1, 2, 3, 4], ZoneInfo("UTC"))
+
+    def test_add_skips_nights_and_weekends(self):
+        friday_afternoon = datetime(2026, 10, 16, 16, 0, tzinfo=UTC)
+
+        assert self.clock.add(friday_afternoon, 2 * 3600) == datetime(2026, 10, 19, 10, 0, tzinfo=UTC)
+        assert self.clock.add(datetime(2026, 10, 17, 12, 0, tzinfo=UTC), 0) == datetime(2026, 10, 19, 9, 0, tzinfo=UTC)
+
+    def test_elapsed_counts_working_time_only(self):
+        since = datetime(2026, 10, 16, 16, 0, tzinfo=UTC)
+
+        assert self.clock.elapsed(since, datetime(2026, 10, 19, 10, 0, tzinfo=UTC)) == 2 * 3600
+
+
+@pytest.mark.django_db
+class TestPolicies:
+    def test_most_specific_policy_wins(self):
+        fallback = SLAPolicy.objects.create(first_response_minutes=60, resolution_minutes=600)
+        billing = SLAPolicy.objects.create(category="billing", first_response_minutes=30, resolution_minutes=300)
+        urgent = SLAPolicy.objects.create(priority="urgent", first_response_minutes=10, resolution_minutes=100)
+
+        assert policy_for("low", "bug") == fallback
+        assert policy_for("low", "billing") == billing
+        assert policy_for("urgent", "billing") == urgent
+
+    def test_deadlines_set_at_creation(self):
+        SLAPolicy.objects.create(first_response_minutes=60, resolution_minutes=600)
+
+        ticket = Ticket.objects.get(pk=TicketFactory().pk)
+
+        assert abs(ticket.first_response_due_at - ticket.created_at - timedelta(hours=1)) < timedelta(seconds=1)
+        assert abs(ticket.resolution_due_at - ticket.created_at - timedelta(hours=10)) < timedelta(seconds=1)
+
+    def test_pending_user_pauses_the_clock(self):
+        SLAPolicy.objects.create(first_response_minutes=60, resolution_minutes=600)
+        ticket = TicketFactory()
+        due = Ticket.objects.get(pk=ticket.pk).resolution_due_at
+
+        ticket.status = "pending_user"
+        ticket.save()
+        Ticket.objects.filter(pk=ticket.pk).update(sla_paused_at=timezone.now() - timedelta(hours=2))
+        ticket.status = "in_progress"
+        ticket.save()
+
+        ticket = Ticket.objects.get(pk=ticket.pk)
+        assert ticket.sla_paused_at is None
+        assert timedelta(hours=2) <= ticket.resolution_due_at - due < timedelta(hours=2, seconds=5)
+
+    def test_priority_change_recomputes(self):
+        SLAPolicy.objects.create(first_response_minutes=60, resolution_minutes=600)
+        urgent = SLAPolicy.objects.create(priority="urgent", first_response_minutes=10, resolution_minutes=100)
+        ticket = TicketFactory(priority="low")
+
+        ticket.priority = "urgent"
+        ticket.save()
+
+        ticket = Ticket.objects.get(pk=ticket.pk)
+        assert ticket.sla_policy == urgent
+        assert ticket.first_response_due_at == ticket.created_at + timedelta(minutes=10)
+
+
+@pytest.mark.django_db
+class TestBreachSweep:
+    def test_flags_only_late_running_tickets(self):
+        SLAPolicy.objects.create(first_response_minutes=60, resolution_minutes=600)
+        late, answered, waiting, on_time = TicketFactory.create_batch(4)
+        TicketCommentFactory(ticket=answered, author=UserFactory(is_staff=True))
+        waiting.status = "pending_user"
+        waiting.save()
+        Ticket.objects.exclude(pk=on_time.pk).update(
+            first_response_due_at=timezone.now() - timedelta(minutes=1),
+            resolution_due_at=timezone.now() - timedelta(minutes=1),
+        )
+
+        assert sweep_sla_breaches(batch_size=1) == (1, 2)
+        assert sweep_sla_breaches() == (0, 0)
+
+        flags = dict(Ticket.objects.values_list("pk", "first_response_breached"))
+        assert flags == {late.pk: True, answered.pk: False, waiting.pk: False, on_time.pk: False}
+
+    def test_stale_save_keeps_breach_flag(self):
+        SLAPolicy.objects.create(first_response_minutes=60, resolution_minutes=600)
+        ticket = TicketFactory()
+        Ticket.objects.filter(pk=ticket.pk).update(first_response_due_at=timezone.now() - timedelta(minutes=1))
+        sweep_sla_breaches()
+
+        ticket.title = "Renamed"
+        ticket.save()
+
+        assert Ticket.objects.get(pk=ticket.pk).first_response_breached
+
+
+@pytest.mark.django_db
+class TestSLAListing:
+    def test_sort_and_filter_by_due_time(self):
+        admin = UserFactory(is_staff=True)
+        client = APIClient()
+        client.force_authenticate(admin)
+        SLAPolicy.objects.create(priority="urgent", first_response_minutes=10, resolution_minutes=100)
+        SLAPolicy.objects.create(priority="low", first_response_minutes=60, resolution_minutes=1000)
+        low, urgent, none = (TicketFactory(priority=priority) for priority in ("low", "urgent", "medium"))
+
+        ordered = client.get("/api/tickets/", {"ordering": "resolution_due_at"}).json()
+        due_soon = client.get(
+            "/api/tickets/", {"resolution_due_before": (timezone.now() + timedelta(hours=3)).isoformat()}
+        ).json()
+
+        assert [row["id"] for row in ordered] == [urgent.id, low.id, none.id]
+        assert [row["id"] for row in due_soon] == [urgent.id]
+
+    def test_keyset_pages_through_null_deadlines(self):
+        admin = UserFactory(is_staff=True)
+        client = APIClient()
+        client.force_authenticate(admin)
+        SLAPolicy.objects.create(priority="urgent", first_response_minutes=10, resolution_minutes=100)
+        tickets = [TicketFactory(priority=priority) for priority in ("urgent", "low", "urgent", "low")]
+
+        for ordering in ("resolution_due_at", "-resolution_due_at"):
+            url, seen = f"/api/tickets/?page_size=1&ordering={ordering}", []
+            while url:
+                data = client.get(url).json()
+                seen += [row["id"] for row in data["results"]]
+                url = data["next"]
+            assert sorted(seen) == sorted(ticket.id for ticket in tickets)
@@ -0,0 +1,113 @@
+from datetime import timedelta
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from hirethon_template.tickets.models import Ticket
+from hirethon_template.tickets.stats import _cache_key, compute_ticket_stats, filter_tickets, get_ticket_stats
+from hirethon_template.tickets.tests.factories import TicketFactory
+from hirethon_template.users.tests.factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def test_compute_ticket_stats_single_query():
+    TicketFactory(status="open", priority="high", category="bug")
+    TicketFactory(status="open", priority="low", category="billing")
+    TicketFactory(status="closed", priority="high", category="bug")
+
+    with CaptureQueriesContext(connection) as context:
+        stats = compute_ticket_stats(Ticket.objects.all())
+
+    assert len(context.captured_queries) == 1
+    assert stats["total"] == 3
+    assert stats["open"] == 2
+    assert stats["closed"] == 1
+    assert stats["by_priority"]["high"] == 2
+    assert stats["by_category"]["bug"] == 2
+    assert stats["by_status_priority"]["open"] == {"low": 1, "medium": 0, "high": 1, "urgent": 0}
+
+
+def test_filter_tickets():
+    agent = UserFactory(is_staff=True)
+    TicketFactory(assigned_to=agent, category="bug")
+    TicketFactory(assigned_to=agent, category="billing")
+    TicketFactory(category="bug")
+
+    queryset = Ticket.objects.all()
+
+    assert filter_tickets(queryset, {"assigned_to": agent.id}).count() == 2
+    assert filter_tickets(queryset, {"assigned_to": agent.id, "category": "bug"}).count() == 1
+    assert filter_tickets(queryset, {"unassigned": True}).count() == 1
+
+
+def test_filter_tickets_by_created_date():
+    today = timezone.localdate()
+    TicketFactory()
+    old = TicketFactory()
+    Ticket.objects.filter(pk=old.pk).update(created_at=timezone.now() - timedelta(days=3))
+    queryset = Ticket.objects.all()
+
+    assert filter_tickets(queryset, {"created_after": today}).count() == 1
+    assert filter_tickets(queryset, {"created_before": today - timedelta(days=1)}).get() == old
+    assert filter_tickets(queryset, {"created_after": today - timedelta(days=3), "created_before": today}).count() == 2
+    assert "::date" not in str(filter_tickets(queryset, {"created_after": today}).query)
+
+
+def test_get_ticket_stats_is_cached():
+    TicketFactory()
+    assert get_ticket_stats()["total"] == 1
+
+    TicketFactory()
+    with CaptureQueriesContext(connection) as context:
+        stats = get_ticket_stats()
+
+    assert len(context.captured_queries) == 0
+    assert stats["total"] == 1
+
+
+def test_get_ticket_stats_serves_stale_while_locked():
+    TicketFactory()
+    assert get_ticket_stats()["total"] == 1
+
+    TicketFactory()
+    entry = cache.get(_cache_key({}))
+    entry["expires_at"] = 0
+    cache.set(_cache_key({}), entry)
+    # Another worker is already refreshing this filter set
+    cache.add(f"{_cache_key({})}:lock", 1)
+
+    assert get_ticket_stats()["total"] == 1
+
+    cache.delete(f"{_cache_key({})}:lock")
+    assert get_ticket_stats()["total"] == 2
+
+
+def test_stats_endpoint(client):
+    admin = UserFactory(is_staff=True)
+    TicketFactory(category="bug")
+    TicketFactory(category="other")
+    client.force_login(admin)
+
+    response = client.get("/api/tickets/stats/", {"category": "bug"})
+
+    assert response.status_code == 200
+    assert response.json()["total"] == 1
+
+
+def test_stats_endpoint_invalid_filters(client):
+    client.force_login(UserFactory(is_staff=True))
+
+    response = client.get("/api/tickets/stats/", {"created_after": "2024-02-01", "created_before": "2024-01-01"})
+
+    assert response.status_code == 400
@@ -0,0 +1,117 @@
+import pytest
+from django.core.management import CommandError, call_command
+from rest_framework.test import APIClient
+
+from hirethon_template.tickets import triage
+from hirethon_template.tickets.models import Ticket
+from hirethon_template.tickets.tests.factories import TicketFactory
+from hirethon_template.tickets.triage import TriageModel
+
+EXAMPLES = [
+    ("Charged twice this month", "My card was charged twice for the invoice", "billing", "high"),
+    ("Refund for the annual plan", "Please refund the invoice, the card was charged by mistake", "billing", "high"),
+    ("Invoice has the wrong address", "The billing address on the invoice is outdated", "billing", "high"),
+    ("App crashes on startup", "The app crashes with a stack trace right after login", "bug", "urgent"),
+    ("Export throws an error", "Exporting a report crashes with an internal error", "bug", "urgent"),
+    ("Crash when saving drafts", "Saving a draft throws an error and the app crashes", "bug", "urgent"),
+    ("Dark mode please", "It would be nice to have a dark theme option", "feature", "low"),
+    ("Add a calendar view", "A calendar view for due dates would be a nice option", "feature", "low"),
+]
+
+
+@pytest.fixture
+def model_path(settings, tmp_path):
+    settings.TICKET_TRIAGE_MODEL_PATH = str(tmp_path / "triage.npz")
+    triage._loaded.clear()
+    yield tmp_path / "triage.npz"
+    triage._loaded.clear()
+
+
+def _train_on_examples():
+    for title, description, category, priority in EXAMPLES:
+        TicketFactory(title=title, description=description, category=category, priority=priority, status="resolved")
+    return call_command("train_triage_model", "--jobs", "1")
+
+
+class TestModel:
+    def test_predicts_in_batches_and_round_trips(self, tmp_path):
+        model = TriageModel.train(EXAMPLES)
+
+        predictions = model.predict(["I was charged twice on my card", "The app crashes after login", ""])
+        model.save(tmp_path / "model.npz")
+        loaded = TriageModel.load(tmp_path / "model.npz")
+
+        assert [prediction["category"][0] for prediction in predictions[:2]] == ["billing", "bug"]
+        assert predictions[1]["priority"][0] == "urgent"
+        assert 0.5 < predictions[0]["category"][1] <= 1
+        assert loaded.predict(["I was charged twice on my card"]) == predictions[:1]
+        assert loaded.trained_on == len(EXAMPLES)
+
+    def test_parallel_training_matches_serial(self):
+        serial = TriageModel.train(EXAMPLES)
+        parallel = TriageModel.train(EXAMPLES, jobs=2, batch_size=3)
+
+        for field in triage.FIELDS:
+            assert (serial.log_likelihood[field] == parallel.log_likelihood[field]).all()
+
+
+@pytest.mark.django_db
+class TestCreateTriage:
+    def test_command_requires_labelled_tickets(self, model_path):
+        TicketFactory(status="open")
+
+        with pytest.raises(CommandError):
+            call_command("train_triage_model", "--jobs", "1")
+        assert triage.get_model() is None
+
+    def test_create_fills_in_missing_fields(self, model_path, user, settings):
+        settings.TICKET_TRIAGE_MIN_CONFIDENCE = 0.5
+        _train_on_examples()
+        client = APIClient()
+        client.force_authenticate(user)
+
+        guessed = client.post(
+            "/api/tickets/", {"title": "Charged twice", "description": "The invoice charged my card twice"}
+        ).json()
+        chosen = client.post(
+            "/api/tickets/",
+            {"title": "Charged twice", "description": "The invoice charged my card twice", "priority": "low"},
+        ).json()
+
+        assert (guessed["category"], guessed["priority"]) == ("billing", "high")
+        assert guessed["triage"]["category"]["applied"] is True
+        assert chosen["priority"] == "low"
+        assert chosen["triage"]["priority"]["value"] == "high"
+        assert chosen["triage"]["priority"]["applied"] is False
+
+    def test_bulk_create_triages_in_one_batch(self, model_path, user, settings, monkeypatch):
+        settings.TICKET_TRIAGE_MIN_CONFIDENCE = 0.5
+        _train_on_examples()
+        batches = []
+        predict = TriageModel.predict
+        monkeypatch.setattr(TriageModel, "predict", lambda self, texts: batches.append(texts) or predict(self, texts))
+        client = APIClient()
+        client.force_authenticate(user)
+
+        response = client.post(
+            "/api/tickets/bulk/",
+            [
+                {"title": "Refund please", "description": "Refund the invoice charged to my card"},
+                {"title": "Crash on login", "description": "The app crashes with an error"},
+            ],
+            format="json",
+        )
+
+        assert response.status_code == 201
+        assert [ticket["category"] for ticket in response.json()] == ["billing", "bug"]
+        assert len(batches) == 1 and len(batches[0]) == 2
+        assert Ticket.objects.filter(user=user).count() == 2
+        assert client.post("/api/tickets/bulk/", [], format="json").status_code == 400
+
+    def test_create_without_model_keeps_defaults(self, model_path, user):
+        client = APIClient()
+        client.force_authenticate(user)
+
+        response = client.post("/api/tickets/", {"title": "Some problem", "description": "Something is off here"})
+
+        assert response.json()["category"] == "support" and response.json()["triage"] is None
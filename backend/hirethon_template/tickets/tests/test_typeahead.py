@@ -0,0 +1,54 @@
+import pytest
+from rest_framework.test import APIClient
+
+from hirethon_template.tickets.models import Ticket
+from hirethon_template.tickets.tests.factories import TicketFactory
+from hirethon_template.users.models import User
+from hirethon_template.users.tests.factories import UserFactory
+from hirethon_template.utils.typeahead import typeahead
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def api_client(user: User) -> APIClient:
+    client = APIClient()
+    client.force_authenticate(user)
+    return client
+
+
+class TestTicketTypeahead:
+    def test_prefix_before_fuzzy(self, api_client: APIClient, user: User):
+        fuzzy = TicketFactory(user=user, title="Cannot export reprot to CSV")
+        prefix = TicketFactory(user=user, title="Report builder crashes")
+        TicketFactory(user=user, title="Login page is slow")
+
+        response = api_client.get("/api/tickets/typeahead/", {"q": "report"})
+
+        assert [row["id"] for row in response.json()] == [prefix.id, fuzzy.id]
+        assert set(response.json()[0]) == {"id", "title", "status", "priority"}
+
+    def test_respects_visibility_and_limit(self, api_client: APIClient, user: User):
+        TicketFactory.create_batch(3, user=user, title="Payment declined")
+        TicketFactory(user=UserFactory(), title="Payment declined again")
+
+        response = api_client.get("/api/tickets/typeahead/", {"q": "pay", "limit": 2})
+
+        assert len(response.json()) == 2
+        assert all(row["title"] == "Payment declined" for row in response.json())
+
+    def test_short_query(self, api_client: APIClient, user: User):
+        TicketFactory(user=user, title="Payment declined")
+
+        assert api_client.get("/api/tickets/typeahead/", {"q": "p"}).json() == []
+
+    def test_prefix_is_a_plain_ilike(self):
+        TicketFactory(title="100% CPU on the worker")
+        TicketFactory(title="1000 emails queued")
+
+        sql = str(typeahead(Ticket.objects.all(), "100%", ["title"], 10).query)
+        matches = Ticket.objects.filter(title__iprefix="100%")
+
+        # The bare ILIKE is what lets the gin_trgm_ops index serve the prefix match
+        assert '"tickets_ticket"."title" ILIKE' in sql and "UPPER" not in sql
+        assert [ticket.title for ticket in matches] == ["100% CPU on the worker"]
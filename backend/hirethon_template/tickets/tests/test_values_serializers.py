@@ -0,0 +1,75 @@
+import pytest
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+
+from hirethon_template.tickets.api.serializers import (
+    TicketCommentSerializer,
+    TicketCommentValuesSerializer,
+    TicketListSerializer,
+    TicketListValuesSerializer,
+)
+from hirethon_template.tickets.models import Ticket, TicketComment
+from hirethon_template.tickets.tests.factories import TicketCommentFactory, TicketFactory
+from hirethon_template.users.api.serializers import UserSerializer, UserValuesSerializer
+from hirethon_template.users.models import User
+from hirethon_template.users.tests.factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def _context(query=""):
+    return {"request": Request(APIRequestFactory().get(f"/api/tickets/{query}"))}
+
+
+def _render(data):
+    return JSONRenderer().render(data)
+
+
+@pytest.fixture
+def tickets(user: User):
+    staff = UserFactory(is_staff=True, name="")
+    assigned = TicketFactory(user=user, assigned_to=staff, priority="high", status="in_progress")
+    TicketCommentFactory(ticket=assigned, author=staff, content="x" * 150)
+    TicketCommentFactory(ticket=assigned, author=user, is_internal=True)
+    TicketFactory(user=user)
+    return Ticket.objects.select_related("last_public_comment_author").order_by("id")
+
+
+class TestValuesSerializers:
+    @pytest.mark.parametrize(
+        "query", ["", "?fields=id,user,comment_count", "?fields=id,assigned_to&expand=assigned_to"]
+    )
+    def test_ticket_list_output_is_identical(self, tickets, query):
+        context = _context(query)
+        fast = TicketListValuesSerializer(context=context)
+
+        expected = _render(TicketListSerializer(tickets, many=True, context=context).data)
+        assert _render(fast.serialize(tickets.values(*fast.value_keys))) == expected
+
+    def test_comment_output_is_identical(self, tickets):
+        comments = TicketComment.objects.select_related("author").order_by("id")
+        fast = TicketCommentValuesSerializer(context=_context())
+
+        expected = _render(TicketCommentSerializer(comments, many=True).data)
+        assert _render(fast.serialize(comments.values(*fast.value_keys))) == expected
+
+    def test_user_output_is_identical(self, user: User):
+        users = User.objects.order_by("id")
+        fast = UserValuesSerializer()
+
+        assert _render(fast.serialize(users.values(*fast.value_keys))) == _render(
+            UserSerializer(users, many=True).data
+        )
+
+    def test_list_endpoint_pages_through_values_rows(self, user: User):
+        TicketFactory.create_batch(3, user=user)
+        client = APIClient()
+        client.force_authenticate(user)
+
+        first = client.get("/api/tickets/?page_size=2").json()
+        second = client.get(first["next"]).json()
+
+        assert len(first["results"]) == 2
+        assert len(second["results"]) == 1
+        assert second["next"] is None
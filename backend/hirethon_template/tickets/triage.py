@@ -0,0 +1,232 @@
+import logging
+import os
+import re
+import uuid
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from pathlib import Path
+
+import numpy as np
+from django.conf import settings
+from django.utils import timezone
+
+from hirethon_template.tickets.models import Ticket
+
+logger = logging.getLogger(__name__)
+
+# Fields the model predicts, with their classes in a fixed order
+FIELDS = {
+    'category': [value for value, _label in Ticket.CATEGORY_CHOICES],
+    'priority': [value for value, _label in Ticket.PRIORITY_CHOICES],
+}
+# Words and word pairs are hashed into this many features; 2**17 keeps the artifact at a few MiB
+FEATURE_BITS = 17
+FEATURES = 1 << FEATURE_BITS
+# Additive (Lidstone) smoothing of the per-class feature counts
+ALPHA = 0.1
+# Tickets whose labels an agent had the chance to correct
+TRAINING_STATUSES = ('resolved', 'closed')
+# Tickets counted per task handed to a training worker
+TRAINING_BATCH_SIZE = 20_000
+_TOKEN = re.compile(r"\w{2,}")
+# Model loaded by this process, with the file identity it was loaded from
+_loaded = {}
+
+
+def ticket_text(title, description):
+    return f"{title}\n{description}"
+
+
+def features(text):
+    """Sorted distinct hashed features of the words and adjacent word pairs of ``text``."""
+    tokens = _TOKEN.findall(text.lower())
+    grams = tokens + [f'{first} {second}' for first, second in zip(tokens, tokens[1:])]
+    hashes = np.fromiter((zlib.crc32(gram.encode()) for gram in grams), dtype=np.uint32, count=len(grams))
+    return np.unique(hashes & np.uint32(FEATURES - 1)).astype(np.int32)
+
+
+def _featurize(texts):
+    """Concatenated features of ``texts`` and the index of the text each one belongs to."""
+    per_text = [features(text) for text in texts]
+    lengths = np.fromiter((len(text_features) for text_features in per_text), dtype=np.int64, count=len(per_text))
+    flat = np.concatenate(per_text) if per_text else np.empty(0, dtype=np.int32)
+    return flat, np.repeat(np.arange(len(per_text)), lengths)
+
+
+def count_batch(batch):
+    """
+    Per-class feature and document counts of ``(text, category index, priority index)`` rows.
+
+    Runs in the training workers; it only needs NumPy, never the database.
+    """
+    texts, *labels = zip(*batch)
+    flat, owners = _featurize(texts)
+    counts = {}
+    for field, classes in zip(FIELDS, labels):
+        classes = np.array(classes, dtype=np.int64)
+        feature_counts = np.bincount(classes[owners] * FEATURES + flat, minlength=len(FIELDS[field]) * FEATURES)
+        counts[field] = (
+            feature_counts.reshape(len(FIELDS[field]), FEATURES),
+            np.bincount(classes, minlength=len(FIELDS[field])),
+        )
+    return counts
+
+
+def _batches(rows, size):
+    rows = iter(rows)
+    while batch := list(islice(rows, size)):
+        yield batch
+
+
+def _map_bounded(pool, function, batches, pending):
+    """``pool.map`` that reads ahead at most ``pending`` batches, so the rows stream instead of piling up."""
+    futures = []
+    for batch in batches:
+        futures.append(pool.submit(function, batch))
+        if len(futures) >= pending:
+            yield futures.pop(0).result()
+    for future in futures:
+        yield future.result()
+
+
+class TriageModel:
+    """Multinomial naive Bayes over hashed binary features, one classifier per field in ``FIELDS``."""
+
+    def __init__(self, log_prior, log_likelihood, trained_on, trained_at):
+        self.log_prior = log_prior
+        self.log_likelihood = log_likelihood
+        self.trained_on = trained_on
+        self.trained_at = trained_at
+
+    @classmethod
+    def train(cls, rows, jobs=1, batch_size=TRAINING_BATCH_SIZE):
+        """
+        Fit a model on ``(title, description, category, priority)`` rows.
+
+        With ``jobs`` above 1 the rows are counted in that many forked worker
+        processes; counting is what costs, summing the counts is cheap.
+        """
+        category_index = {value: index for index, value in enumerate(FIELDS['category'])}
+        priority_index = {value: index for index, value in enumerate(FIELDS['priority'])}
+        encoded = (
+            (ticket_text(title, description), category_index[category], priority_index[priority])
+            for title, description, category, priority in rows
+        )
+        batches = _batches(encoded, batch_size)
+
+        totals = {
+            field: (np.zeros((len(classes), FEATURES), dtype=np.int64), np.zeros(len(classes), dtype=np.int64))
+            for field, classes in FIELDS.items()
+        }
+        if jobs > 1:
+            # Workers are forked and never touch the inherited database connection
+            with ProcessPoolExecutor(jobs) as pool:
+                for counts in _map_bounded(pool, count_batch, batches, 2 * jobs):
+                    cls._add(totals, counts)
+        else:
+            for batch in batches:
+                cls._add(totals, count_batch(batch))
+
+        trained_on = int(totals['category'][1].sum())
+        if not trained_on:
+            raise ValueError("There are no labelled tickets to train on.")
+
+        log_prior, log_likelihood = {}, {}
+        for field, (feature_counts, class_counts) in totals.items():
+            # Classes never seen get a tiny prior instead of minus infinity
+            log_prior[field] = np.log((class_counts + ALPHA) / (class_counts.sum() + ALPHA * len(class_counts)))
+            smoothed = feature_counts + ALPHA
+            log_likelihood[field] = (np.log(smoothed) - np.log(smoothed.sum(axis=1, keepdims=True))).astype(np.float32)
+        return cls(log_prior, log_likelihood, trained_on, timezone.now().isoformat())
+
+    @staticmethod
+    def _add(totals, counts):
+        for field, batch_counts in counts.items():
+            for total, batch_total in zip(totals[field], batch_counts):
+                np.add(total, batch_total, out=total)
+
+    def predict(self, texts):
+        """
+        ``{field: (value, probability)}`` for each of ``texts``, scored in one batch.
+
+        Each classifier gathers the log likelihoods of every feature of the
+        batch at once and sums them per text, so the per-ticket cost is a
+        handful of array operations shared by the whole batch.
+        """
+        flat, owners = _featurize(texts)
+        predictions = [{} for _text in texts]
+        for field, classes in FIELDS.items():
+            gathered = self.log_likelihood[field][:, flat]
+            scores = np.stack([np.bincount(owners, weights=row, minlength=len(texts)) for row in gathered])
+            scores += self.log_prior[field][:, None]
+            scores -= scores.max(axis=0)
+            probabilities = np.exp(scores)
+            probabilities /= probabilities.sum(axis=0)
+            best = probabilities.argmax(axis=0)
+            for position, index in enumerate(best):
+                predictions[position][field] = (classes[index], float(probabilities[index, position]))
+        return predictions
+
+    def save(self, path):
+        """Write the model next to ``path`` and move it into place, so readers never see half a file."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        staging = path.with_name(f'.{path.name}.{uuid.uuid4().hex}.npz')
+        arrays = {}
+        for field in FIELDS:
+            arrays[f'{field}_log_prior'] = self.log_prior[field]
+            arrays[f'{field}_log_likelihood'] = self.log_likelihood[field]
+        np.savez(staging, trained_on=self.trained_on, trained_at=self.trained_at, **arrays)
+        os.replace(staging, path)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as arrays:
+            return cls(
+                {field: arrays[f'{field}_log_prior'] for field in FIELDS},
+                {field: arrays[f'{field}_log_likelihood'] for field in FIELDS},
+                int(arrays['trained_on']),
+                str(arrays['trained_at']),
+            )
+
+
+def model_path():
+    return Path(settings.TICKET_TRIAGE_MODEL_PATH)
+
+
+def get_model():
+    """The model this process has loaded, reloaded after a retrain replaced the file; None before the first one."""
+    path = model_path()
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+
+    identity = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+    loaded = _loaded.get(path)
+    if loaded is None or loaded[0] != identity:
+        loaded = _loaded[path] = (identity, TriageModel.load(path))
+        logger.info(f"Loaded triage model trained on {loaded[1].trained_on} tickets at {loaded[1].trained_at}")
+    return loaded[1]
+
+
+def train_model(jobs=None, batch_size=TRAINING_BATCH_SIZE):
+    """Train on the resolved and closed tickets and save the model where ``get_model()`` reads it."""
+    rows = (
+        Ticket.objects.filter(status__in=TRAINING_STATUSES)
+        .values_list('title', 'description', 'category', 'priority')
+        .iterator(chunk_size=batch_size)
+    )
+    model = TriageModel.train(rows, jobs=jobs or os.cpu_count(), batch_size=batch_size)
+    model.save(model_path())
+    logger.info(f"Trained triage model on {model.trained_on} tickets")
+    return model
+
+
+def suggest(texts):
+    """Predictions of the current model for ``texts``, or None for each when no model was trained yet."""
+    model = get_model()
+    if model is None:
+        return [None] * len(texts)
+    return model.predict(texts)
@@ -6,6 +6,7 @@ from rest_framework import serializers
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 
 from hirethon_template.users.models import User as UserType
+from hirethon_template.utils.values_serializer import ValuesSerializer
 
 logger = logging.getLogger(__name__)
 User = get_user_model()
@@ -22,6 +23,12 @@ class UserSerializer(serializers.ModelSerializer[UserType]):
         }
 
 
+class UserValuesSerializer(ValuesSerializer):
+    """Fast read path for UserSerializer over ``.values()`` rows."""
+
+    serializer_class = UserSerializer
+
+
 class UserRegistrationSerializer(serializers.ModelSerializer[UserType]):
     password = serializers.CharField(write_only=True, min_length=8)
     password_confirm = serializers.CharField(write_only=True)
@@ -3,18 +3,21 @@ from django.contrib.auth import get_user_model
 from rest_framework import status
 from rest_framework.decorators import action, api_view, permission_classes
 from rest_framework.mixins import ListModelMixin, RetrieveModelMixin, UpdateModelMixin
-from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.permissions import AllowAny, IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.viewsets import GenericViewSet
 from rest_framework_simplejwt.tokens import RefreshToken
 
-from .serializers import UserSerializer, UserRegistrationSerializer, UserLoginSerializer
+from hirethon_template.utils.typeahead import parse_typeahead_params, typeahead
+from hirethon_template.utils.values_serializer import ValuesListMixin
+
+from .serializers import UserSerializer, UserRegistrationSerializer, UserLoginSerializer, UserValuesSerializer
 
 logger = logging.getLogger(__name__)
 User = get_user_model()
 
 
-class UserViewSet(RetrieveModelMixin, ListModelMixin, UpdateModelMixin, GenericViewSet):
+class UserViewSet(ValuesListMixin, RetrieveModelMixin, ListModelMixin, UpdateModelMixin, GenericViewSet):
     serializer_class = UserSerializer
     queryset = User.objects.all()
     lookup_field = "pk"
@@ -24,11 +27,28 @@ class UserViewSet(RetrieveModelMixin, ListModelMixin, UpdateModelMixin, GenericV
         assert isinstance(self.request.user.id, int)
         return self.queryset.filter(id=self.request.user.id)
 
+    def list(self, request, *args, **kwargs):
+        return self.values_response(self.filter_queryset(self.get_queryset()), UserValuesSerializer)
+
     @action(detail=False)
     def me(self, request):
         serializer = UserSerializer(request.user, context={"request": request})
         return Response(status=status.HTTP_200_OK, data=serializer.data)
 
+    @action(detail=False, permission_classes=[IsAdminUser])
+    def typeahead(self, request):
+        """Match active users by email or name, e.g. when picking a ticket assignee."""
+        text, limit = parse_typeahead_params(request.query_params)
+        if text is None:
+            return Response(status=status.HTTP_200_OK, data=[])
+
+        queryset = User.objects.filter(is_active=True)
+        if request.query_params.get("staff", "").lower() in ("1", "true", "yes"):
+            queryset = queryset.filter(is_staff=True)
+
+        results = typeahead(queryset, text, ["email", "name"], limit).values("id", "email", "name")
+        return Response(status=status.HTTP_200_OK, data=list(results))
+
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
@@ -1,4 +1,5 @@
 from django.contrib.auth.models import AbstractUser
+from django.contrib.postgres.indexes import GinIndex
 from django.db.models import CharField, EmailField
 from django.urls import reverse
 from django.utils.translation import gettext_lazy as _
@@ -25,6 +26,13 @@ class User(AbstractUser):
 
     objects = UserManager()
 
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            # Trigram indexes back the assignee typeahead and admin autocomplete
+            GinIndex(name="users_user_email_trgm_idx", fields=["email"], opclasses=["gin_trgm_ops"]),
+            GinIndex(name="users_user_name_trgm_idx", fields=["name"], opclasses=["gin_trgm_ops"]),
+        ]
+
     def get_absolute_url(self) -> str:
         """Get URL for user's detail view.
 
@@ -1,8 +1,9 @@
 import pytest
-from rest_framework.test import APIRequestFactory
+from rest_framework.test import APIClient, APIRequestFactory
 
 from hirethon_template.users.api.views import UserViewSet
 from hirethon_template.users.models import User
+from hirethon_template.users.tests.factories import UserFactory
 
 
 class TestUserViewSet:
@@ -32,3 +33,22 @@ class TestUserViewSet:
             "url": f"http://testserver/api/users/{user.pk}/",
             "name": user.name,
         }
+
+    def test_typeahead(self, user: User):
+        staff = UserFactory(email="dana.agent@example.com", name="Dana Agent", is_staff=True)
+        UserFactory(email="dan.customer@example.com", name="Dan Customer")
+        UserFactory(email="someone@example.com", name="Someone Else")
+        client = APIClient()
+        client.force_authenticate(staff)
+
+        response = client.get("/api/users/typeahead/", {"q": "dan"})
+        staff_only = client.get("/api/users/typeahead/", {"q": "dan", "staff": "true"})
+
+        assert {row["email"] for row in response.json()} == {"dana.agent@example.com", "dan.customer@example.com"}
+        assert [row["id"] for row in staff_only.json()] == [staff.id]
+
+    def test_typeahead_admin_only(self, user: User):
+        client = APIClient()
+        client.force_authenticate(user)
+
+        assert client.get("/api/users/typeahead/", {"q": "dan"}).status_code == 403
@@ -0,0 +1,100 @@
+import codecs
+import io
+import math
+import re
+
+from django.conf import settings
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is an optional speedup
+    orjson = None
+
+# orjson's own date/time and dataclass formats differ from DRF's JSONEncoder,
+# so those types are handed to the encoder's default() like everything else
+# orjson has no native support for (lazy strings, Decimal, QuerySet, ...).
+RENDER_OPTIONS = (
+    orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+    if orjson is not None
+    else 0
+)
+# JSONRenderer escapes these separators so the output is also valid JavaScript
+LINE_SEPARATORS = ((b"\xe2\x80\xa8", b"\\u2028"), (b"\xe2\x80\xa9", b"\\u2029"))
+# orjson decodes integers beyond 64 bits as floats, the stdlib keeps them exact
+LONG_DIGIT_RUN = re.compile(rb"\d{20}")
+
+
+def _has_non_finite(data):
+    stack = [data]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, float):
+            if not math.isfinite(value):
+                return True
+        elif isinstance(value, dict):
+            stack.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            stack.extend(value)
+    return False
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer producing the same bytes through orjson.
+
+    Values orjson cannot encode natively go through ``encoder_class().default``,
+    exactly as with the stdlib encoder. Requests the fast path cannot reproduce
+    byte for byte (indented or ASCII-only output, non-compact separators) and
+    anything orjson refuses (e.g. integers beyond 64 bits) are rendered by
+    JSONRenderer itself, as is everything when orjson is not installed. So is
+    data holding NaN or infinity, which orjson silently turns into ``null``
+    where JSONRenderer raises under ``STRICT_JSON`` (or writes ``NaN``
+    otherwise); the data is only searched for them when the output has a
+    ``null`` in it.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None or self.ensure_ascii or not self.compact:
+            return super().render(data, accepted_media_type, renderer_context)
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data, default=self.encoder_class().default, option=RENDER_OPTIONS)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        if b"null" in ret and _has_non_finite(data):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        for separator, escaped in LINE_SEPARATORS:
+            if separator in ret:
+                ret = ret.replace(separator, escaped)
+        return ret
+
+
+class ORJSONParser(JSONParser):
+    """
+    JSONParser decoding UTF-8 bodies with orjson.
+
+    Bodies orjson rejects, or may decode differently (very long integers), are
+    parsed by the stdlib so that the accepted input, the resulting values and
+    the error messages stay those of JSONParser.
+    """
+
+    renderer_class = ORJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get("encoding", settings.DEFAULT_CHARSET)
+        if orjson is None or codecs.lookup(encoding).name != "utf-8":
+            return super().parse(stream, media_type, parser_context)
+
+        body = stream.read()
+        if LONG_DIGIT_RUN.search(body):
+            return super().parse(io.BytesIO(body), media_type, parser_context)
+        try:
+            return orjson.loads(body)
+        except orjson.JSONDecodeError:
+            return super().parse(io.BytesIO(body), media_type, parser_context)
@@ -0,0 +1,65 @@
+from django.contrib.postgres.search import TrigramWordSimilarity
+from django.db.models import BooleanField, CharField, ExpressionWrapper, Lookup, Q, TextField
+from django.db.models.functions import Greatest
+
+# Shorter queries produce no useful trigrams and would match almost everything.
+MIN_QUERY_LENGTH = 2
+
+
+@CharField.register_lookup
+@TextField.register_lookup
+class IPrefix(Lookup):
+    """
+    Case-insensitive prefix match compiled to a bare ``col ILIKE 'text%'``.
+
+    ``istartswith`` compiles to ``UPPER(col::text) LIKE UPPER('text%')`` on
+    PostgreSQL, which a ``gin_trgm_ops`` index on the column cannot serve.
+    """
+
+    lookup_name = "iprefix"
+
+    def get_db_prep_lookup(self, value, connection):
+        return "%s", [f"{connection.ops.prep_for_like_query(value)}%"]
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f"{lhs} ILIKE {rhs}", [*lhs_params, *rhs_params]
+
+
+def typeahead(queryset, text, fields, limit):
+    """
+    Prefix and fuzzy matching on ``fields`` using pg_trgm.
+
+    Both ``ILIKE 'text%'`` and the ``<%`` word-similarity operator are served by
+    ``gin_trgm_ops`` indexes on the fields. Prefix hits sort first, then the
+    rest by similarity.
+    """
+    prefix = Q()
+    fuzzy = Q()
+    for field in fields:
+        prefix |= Q(**{f"{field}__iprefix": text})
+        fuzzy |= Q(**{f"{field}__trigram_word_similar": text})
+
+    similarities = [TrigramWordSimilarity(text, field) for field in fields]
+    similarity = Greatest(*similarities) if len(similarities) > 1 else similarities[0]
+
+    return (
+        queryset.filter(prefix | fuzzy)
+        .annotate(
+            is_prefix=ExpressionWrapper(prefix, output_field=BooleanField()),
+            similarity=similarity,
+        )
+        .order_by("-is_prefix", "-similarity", "pk")[:limit]
+    )
+
+
+def parse_typeahead_params(query_params, default_limit=10, max_limit=25):
+    """Return ``(text, limit)`` from request params; ``text`` is None when too short."""
+    text = query_params.get("q", "").strip()
+    try:
+        limit = int(query_params.get("limit", default_limit))
+    except ValueError:
+        limit = default_limit
+    limit = max(1, min(limit, max_limit))
+    return (text if len(text) >= MIN_QUERY_LENGTH else None), limit
@@ -0,0 +1,128 @@
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework import ISO_8601, serializers
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+# Fields whose to_representation() returns DB values from .values() unchanged.
+PASSTHROUGH_FIELDS = (
+    serializers.BooleanField,
+    serializers.CharField,
+    serializers.ChoiceField,
+    serializers.IntegerField,
+    serializers.PrimaryKeyRelatedField,
+)
+
+
+def iso_datetime(value, field_timezone, field):
+    """Same output as ``DateTimeField.to_representation`` for ISO 8601 with a fixed timezone."""
+    if isinstance(value, str) or value.tzinfo is None:
+        return field.to_representation(value)
+    value = value.astimezone(field_timezone).isoformat()
+    if value.endswith("+00:00"):
+        value = value[:-6] + "Z"
+    return value
+
+
+class ValuesSerializer:
+    """
+    Read-only fast path producing the same output as ``serializer_class`` from ``.values()`` rows.
+
+    The DRF serializer is instantiated once with the request context, so field
+    selection (e.g. sparse fieldsets) is inherited, and its fields are compiled
+    into a flat list of ``(name, value_key, convert)`` mappers. Rendering a row
+    is then a dict lookup per field instead of DRF's per-field attribute
+    resolution and nested serializer instances.
+
+    Fields that cannot be read from a column (method fields, model properties)
+    are declared in ``computed_fields`` as ``name: (value_keys, function(row))``.
+    """
+
+    serializer_class = None
+    computed_fields = {}
+
+    def __init__(self, context=None):
+        if self.serializer_class is None:
+            raise ImproperlyConfigured(f"{type(self).__name__} must define serializer_class")
+        serializer = self.serializer_class(context=context or {})
+        self.value_keys = []
+        self.mappers = self.compile(serializer, prefix="")
+
+    def compile(self, serializer, prefix):
+        mappers = []
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+
+            if not prefix and name in self.computed_fields:
+                keys, function = self.computed_fields[name]
+                self.value_keys.extend(keys)
+                mappers.append((name, None, function))
+            elif isinstance(field, serializers.SerializerMethodField):
+                raise ImproperlyConfigured(f"{type(self).__name__} needs a computed field for '{name}'")
+            elif isinstance(field, serializers.BaseSerializer):
+                nested_prefix = f"{prefix}{field.source}__"
+                nested = self.compile(field, nested_prefix)
+                mappers.append((name, None, self.nested_mapper(f"{nested_prefix}id", nested)))
+            else:
+                key = f"{prefix}{field.source}"
+                self.value_keys.append(key)
+                mappers.append((name, key, self.converter(field)))
+        return mappers
+
+    @staticmethod
+    def converter(field):
+        """Return the per-value conversion for ``field``, or None when values pass through unchanged."""
+        if isinstance(field, PASSTHROUGH_FIELDS):
+            return None
+        if isinstance(field, serializers.DateTimeField):
+            output_format = getattr(field, "format", api_settings.DATETIME_FORMAT)
+            # DRF looks the current timezone up for every value; resolve it once instead
+            field_timezone = field.timezone if hasattr(field, "timezone") else field.default_timezone()
+            if output_format is not None and output_format.lower() == ISO_8601 and field_timezone is not None:
+                return lambda value: iso_datetime(value, field_timezone, field)
+        return field.to_representation
+
+    def nested_mapper(self, pk_key, mappers):
+        render = self.render
+
+        def convert(row):
+            if row[pk_key] is None:
+                return None
+            return render(row, mappers)
+
+        return convert
+
+    @staticmethod
+    def render(row, mappers):
+        data = {}
+        for name, key, convert in mappers:
+            if key is None:
+                data[name] = convert(row)
+                continue
+            value = row[key]
+            data[name] = value if convert is None or value is None else convert(value)
+        return data
+
+    def to_representation(self, row):
+        return self.render(row, self.mappers)
+
+    def serialize(self, rows):
+        mappers = self.mappers
+        render = self.render
+        return [render(row, mappers) for row in rows]
+
+
+class ValuesListMixin:
+    """Generic view mixin serving a collection through a ``ValuesSerializer``."""
+
+    def values_response(self, queryset, values_serializer_class):
+        serializer = values_serializer_class(context=self.get_serializer_context())
+        # Pagination reads the ordering values (and id tiebreak) of boundary rows
+        ordering = queryset.query.order_by or queryset.model._meta.ordering
+        keys = dict.fromkeys([*serializer.value_keys, "id", *(name.lstrip("-") for name in ordering)])
+        rows = queryset.values(*keys)
+
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(serializer.serialize(page))
+        return Response(serializer.serialize(rows))
@@ -4,7 +4,7 @@ import { useAuth } from '../../contexts/AuthContext';
 import logger from '../../utils/logger';
 
 const TicketDetail = ({ ticketId, onBack }) => {
-  const { currentTicket, isLoading, error, fetchTicket, updateTicketStatus, addComment } = useTickets();
+  const { currentTicket, isLoading, error, fetchTicket, loadOlderComments, updateTicketStatus, addComment } = useTickets();
   const { user } = useAuth();
   const [newComment, setNewComment] = useState('');
   const [statusUpdate, setStatusUpdate] = useState({
@@ -233,6 +233,15 @@ const TicketDetail = ({ ticketId, onBack }) => {
           <h3>Comments ({currentTicket.comments.length})</h3>
           
           <div className="comments-list">
+            {currentTicket.older_comments && (
+              <button
+                type="button"
+                className="load-older-comments-button"
+                onClick={() => loadOlderComments(ticketId, currentTicket.older_comments)}
+              >
+                Load older comments
+              </button>
+            )}
             {currentTicket.comments.map((comment) => (
               <div key={comment.id} className={`comment ${comment.is_admin_comment ? 'admin-comment' : 'user-comment'}`}>
                 <div className="comment-header">
@@ -13,6 +13,7 @@ const TICKET_ACTIONS = {
   UPDATE_TICKET: 'UPDATE_TICKET',
   SET_CURRENT_TICKET: 'SET_CURRENT_TICKET',
   ADD_COMMENT: 'ADD_COMMENT',
+  PREPEND_COMMENTS: 'PREPEND_COMMENTS',
   SET_ERROR: 'SET_ERROR',
   CLEAR_ERROR: 'CLEAR_ERROR',
 };
@@ -78,6 +79,19 @@ const ticketReducer = (state, action) => {
       }
       return state;
     
+    case TICKET_ACTIONS.PREPEND_COMMENTS:
+      if (state.currentTicket && state.currentTicket.id === action.payload.ticketId) {
+        return {
+          ...state,
+          currentTicket: {
+            ...state.currentTicket,
+            comments: [...action.payload.comments, ...state.currentTicket.comments],
+            older_comments: action.payload.olderComments,
+          },
+        };
+      }
+      return state;
+    
     case TICKET_ACTIONS.SET_ERROR:
       return {
         ...state,
@@ -149,6 +163,24 @@ export const TicketProvider = ({ children }) => {
     }
   };
 
+  // Load the comments older than the ones embedded in the ticket detail
+  const loadOlderComments = async (ticketId, olderCommentsUrl) => {
+    try {
+      const { search } = new URL(olderCommentsUrl);
+      const data = await makeRequest(`/tickets/${ticketId}/comments/${search}`);
+      dispatch({
+        type: TICKET_ACTIONS.PREPEND_COMMENTS,
+        payload: { ticketId, comments: data.results, olderComments: data.previous },
+      });
+      
+      logger.info('Older comments loaded', { ticketId, count: data.results.length });
+      return { success: true };
+    } catch (error) {
+      logger.error('Loading older comments failed', { error: error.message });
+      return { success: false, error: error.message };
+    }
+  };
+
   // Create new ticket
   const createTicket = async (ticketData) => {
     dispatch({ type: TICKET_ACTIONS.SET_LOADING, payload: true });
@@ -276,6 +308,7 @@ export const TicketProvider = ({ children }) => {
     ...state,
     fetchTickets,
     fetchTicket,
+    loadOlderComments,
     createTicket,
     updateTicket,
     updateTicketStatus,